@@ -0,0 +1,217 @@
+
+"""
+Monitoring dashboard: pipeline runs, data quality, drift and discount outcomes.
+
+    streamlit run app.py
+
+Every view is drawn from the small summaries and histories the stages write
+(see utils/dashboard_data.py), so a page load costs the same whatever the size
+of the data behind them.
+"""
+from datetime import timedelta
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from src.discounting.config_manager.config_settings import ConfigurationManager
+from src.discounting.utils.dashboard_data import ArtifactSnapshot
+
+st.set_page_config(page_title="Discounting monitor", layout="wide")
+
+
+@st.cache_resource
+def get_snapshot() -> ArtifactSnapshot:
+    " One snapshot per server process, shared by every session"
+    snapshot = ArtifactSnapshot(ConfigurationManager().get_dashboard_config())
+    snapshot.refresh()
+    return snapshot
+
+
+def _missing(what: str) -> None:
+    st.info(f"No {what} yet.")
+
+
+def pipeline_runs(snapshot: ArtifactSnapshot) -> None:
+    metrics = snapshot.stage_metrics()
+    if not metrics:
+        _missing("stage metrics")
+        return
+    latest = pd.DataFrame([
+        {'stage': stage, 'finished_at': value['finished_at'], 'wall_seconds': value['wall_seconds'],
+         'cpu_seconds': value['cpu_seconds'], 'peak_rss_mb': value['peak_rss_mb']}
+        for stage, value in metrics.items()
+    ]).sort_values('finished_at', ascending=False)
+    st.subheader("Latest run per stage")
+    st.dataframe(latest, hide_index=True, use_container_width=True)
+
+    runs = pd.DataFrame(snapshot.runs())
+    if not runs.empty:
+        runs['finished_at'] = pd.to_datetime(runs['finished_at'], format='ISO8601')
+        st.plotly_chart(px.line(runs, x='finished_at', y='wall_seconds', color='stage', markers=True,
+                                title="Wall time per run"), use_container_width=True)
+
+    stage = st.selectbox("Stage steps", sorted(metrics))
+    steps = pd.DataFrame([
+        {'step': name, **{key: step.get(key) for key in ('calls', 'wall_seconds', 'cpu_seconds', 'rows_in',
+                                                         'rows_out', 'bytes_read', 'bytes_written')}}
+        for name, step in metrics[stage]['steps'].items()
+    ])
+    st.plotly_chart(px.bar(steps, x='step', y=['wall_seconds', 'cpu_seconds'], barmode='group',
+                           title=f"{stage} steps"), use_container_width=True)
+    st.dataframe(steps, hide_index=True, use_container_width=True)
+
+
+def data_quality(snapshot: ArtifactSnapshot) -> None:
+    validations = snapshot.history('validation')
+    if validations:
+        last = validations[-1]
+        left, middle, right = st.columns(3)
+        left.metric("Validation", last['status'])
+        middle.metric("Rows", f"{last['rows']:,}")
+        right.metric("Failed columns", len(last['failed_columns']))
+        history = pd.DataFrame(validations)
+        history['validated_at'] = pd.to_datetime(history['validated_at'], format='ISO8601')
+        st.plotly_chart(px.scatter(history, x='validated_at', y='rows', color='status',
+                                   title="Validated rows per run"), use_container_width=True)
+    status = snapshot.artifact('validation')
+    if status:
+        st.dataframe(pd.Series(status, name='result').rename_axis('column').reset_index(),
+                     hide_index=True, use_container_width=True)
+    elif not validations:
+        _missing("validation results")
+
+    profile = snapshot.artifact('profile')
+    if not profile:
+        _missing("data profile")
+        return
+    dataset = profile['dataset']
+    st.subheader(f"Profile: {dataset['rows']:,} rows, {dataset['columns']} columns ({dataset['profiled_at']})")
+    columns = pd.DataFrame([
+        {'column': col, 'kind': p['kind'], 'nulls': p['nulls'],
+         'null_share': p['nulls'] / p['count'] if p['count'] else None,
+         'distinct': p.get('distinct'), 'mean': p.get('mean'), 'std': p.get('std'),
+         'min': p.get('min'), 'max': p.get('max')}
+        for col, p in profile['columns'].items()
+    ])
+    st.plotly_chart(px.bar(columns, x='column', y='null_share', title="Share of missing values"),
+                    use_container_width=True)
+    st.dataframe(columns, hide_index=True, use_container_width=True)
+
+
+def drift(snapshot: ArtifactSnapshot) -> None:
+    report = snapshot.artifact('drift')
+    if not report:
+        _missing("drift report")
+        return
+    left, middle, right = st.columns(3)
+    left.metric("Drifted columns", len(report['drifted_columns']))
+    middle.metric("Rows in window", f"{report['current_rows']:,}")
+    right.metric("Reference rows", f"{report['reference_rows']:,}")
+    columns = pd.DataFrame([{'column': col, **scores} for col, scores in report['columns'].items()])
+    st.plotly_chart(px.bar(columns, x='column', y='psi', color='status', title=f"PSI at {report['checked_at']}"),
+                    use_container_width=True)
+    st.dataframe(columns, hide_index=True, use_container_width=True)
+
+    checks = snapshot.history('drift')
+    if checks:
+        psi = pd.DataFrame([{'checked_at': check['checked_at'], **check['psi']} for check in checks])
+        psi['checked_at'] = pd.to_datetime(psi['checked_at'], format='ISO8601')
+        psi = psi.melt(id_vars='checked_at', var_name='column', value_name='psi')
+        st.plotly_chart(px.line(psi, x='checked_at', y='psi', color='column', markers=True, title="PSI per check"),
+                        use_container_width=True)
+
+
+def discounts(snapshot: ArtifactSnapshot) -> None:
+    summary = snapshot.artifact('discounts')
+    if not summary:
+        _missing("bulk scoring run")
+        return
+    st.caption(f"Model {summary['model_version']}, scored {summary['end_time']}")
+    cards = st.columns(4)
+    cards[0].metric("Reservations scored", f"{summary['rows']:,}")
+    cards[1].metric("Mean cancellation score", f"{summary['mean_score'] or 0:.3f}")
+    if 'discounts' in summary:
+        cards[2].metric("Offered a discount", f"{summary['discounted_share'] or 0:.1%}")
+        cards[3].metric("Expected revenue uplift", f"{summary['revenue_uplift']:,.0f}")
+
+    histogram = summary['score_histogram']
+    edges = histogram['edges']
+    scores = pd.DataFrame({'score': [(low + high) / 2 for low, high in zip(edges, edges[1:])],
+                           'reservations': histogram['counts']})
+    left, right = st.columns(2)
+    left.plotly_chart(px.bar(scores, x='score', y='reservations', title="Cancellation scores"),
+                      use_container_width=True)
+    if 'discounts' in summary:
+        offered = pd.DataFrame({'discount': summary['discounts']['values'],
+                                'reservations': summary['discounts']['counts']})
+        right.plotly_chart(px.bar(offered, x='discount', y='reservations', title="Recommended discounts"),
+                           use_container_width=True)
+
+    runs = pd.DataFrame(snapshot.history('discounts'))
+    if not runs.empty and 'revenue_uplift' in runs:
+        runs['end_time'] = pd.to_datetime(runs['end_time'], format='ISO8601')
+        st.plotly_chart(px.line(runs, x='end_time', y='revenue_uplift', markers=True,
+                                title="Expected revenue uplift per run"), use_container_width=True)
+        st.plotly_chart(px.line(runs, x='end_time', y=['mean_score', 'mean_discount', 'discounted_share'],
+                                markers=True, title="Scores and discounts per run"), use_container_width=True)
+
+
+def model(snapshot: ArtifactSnapshot) -> None:
+    state = snapshot.artifact('trainer_state')
+    if state and state.get('champion'):
+        champion = state['champion']
+        st.subheader(f"Champion: {champion['estimator']}, trained {champion['trained_at']}")
+        st.json(champion['scores'])
+        history = pd.DataFrame([
+            {'run_at': entry['run_at'], 'mode': entry['mode'], 'metric': metric, 'score': score}
+            for entry in state.get('history', []) for metric, score in entry['scores'].items()
+        ])
+        if not history.empty:
+            history['run_at'] = pd.to_datetime(history['run_at'], format='ISO8601')
+            st.plotly_chart(px.scatter(history, x='run_at', y='score', color='metric', symbol='mode',
+                                       title="Holdout scores per training run"), use_container_width=True)
+    else:
+        _missing("trained model")
+
+    cv = snapshot.artifact('cv_results')
+    if cv:
+        st.subheader(f"Cross-validation ({cv['metric']}, {cv['n_splits']} folds)")
+        st.dataframe(pd.DataFrame([{key: candidate[key] for key in ('name', 'estimator', 'mean', 'std',
+                                                                     'mean_fit_seconds')}
+                                   for candidate in cv['candidates']]),
+                     hide_index=True, use_container_width=True)
+
+    selection = snapshot.artifact('feature_selection')
+    if selection:
+        st.subheader(f"Feature selection: {selection['status']}, "
+                     f"{selection['full']['columns']} -> {selection['reduced']['columns']} columns")
+        importances = pd.DataFrame(list(selection['importances'].items()), columns=['column', 'importance'])
+        st.plotly_chart(px.bar(importances, x='column', y='importance', title="Column importance"),
+                        use_container_width=True)
+
+    optimization = snapshot.artifact('optimization')
+    if optimization and optimization.get('status') != 'unsupported':
+        st.subheader(f"Compact model: {optimization['status']}")
+        st.dataframe(pd.DataFrame({side: {key: optimization[side][key] for key in ('trees', 'nodes', 'bytes',
+                                                                                    'features')}
+                                   for side in ('original', 'compact')}), use_container_width=True)
+
+
+snapshot = get_snapshot()
+st.title("Discounting pipeline monitor")
+
+
+@st.fragment(run_every=timedelta(seconds=snapshot.config.refresh_seconds))
+def dashboard() -> None:
+    # Cheap when nothing changed: one stat per artifact
+    snapshot.refresh()
+    st.caption(f"Artifacts checked at {snapshot.refreshed_at:%Y-%m-%d %H:%M:%S}, "
+               f"every {snapshot.config.refresh_seconds:g}s")
+    tabs = st.tabs(["Pipeline runs", "Data quality", "Drift", "Discounts", "Model"])
+    for tab, render in zip(tabs, (pipeline_runs, data_quality, drift, discounts, model)):
+        with tab:
+            render(snapshot)
+
+
+dashboard()
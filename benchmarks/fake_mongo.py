@@ -0,0 +1,60 @@
+"""
+In-process stand-in for a pymongo collection, enough for the ingestion stage:
+`find(filter, projection).batch_size(n)` returning an iterator of documents.
+
+Documents are produced lazily from DataFrame chunks, so benchmarking 10M rows
+does not require holding 10M dicts at once.
+"""
+from typing import Callable, Iterable, Iterator, Optional
+
+import pandas as pd
+
+
+class FakeCursor:
+    def __init__(self, chunks: Callable[[], Iterable[pd.DataFrame]], projection: Optional[dict]):
+        self._chunks = chunks
+        self._projection = projection or {}
+        self._batch_size = None
+
+    def batch_size(self, batch_size: int) -> "FakeCursor":
+        self._batch_size = batch_size
+        return self
+
+    def __iter__(self) -> Iterator[dict]:
+        excluded = {field for field, include in self._projection.items() if not include}
+        included = {field for field, include in self._projection.items() if include}
+        offset = 0
+        for chunk in self._chunks():
+            if included:
+                chunk = chunk[[column for column in chunk.columns if column in included]]
+            records = chunk.to_dict("records")
+            if "_id" not in excluded:
+                for position, record in enumerate(records):
+                    record["_id"] = offset + position
+            offset += len(records)
+            yield from records
+
+
+class FakeCollection:
+    """Read-only collection backed by a factory of DataFrame chunks."""
+
+    def __init__(self, chunks: Callable[[], Iterable[pd.DataFrame]]):
+        self._chunks = chunks
+
+    def find(self, filter: Optional[dict] = None, projection: Optional[dict] = None) -> FakeCursor:
+        if filter:
+            raise NotImplementedError("FakeCollection only supports an empty filter")
+        return FakeCursor(self._chunks, projection)
+
+
+class FakeMongoConnection:
+    """Drop-in for MongoDBConnection: a context manager yielding the fake collection."""
+
+    def __init__(self, collection: FakeCollection):
+        self.collection = collection
+
+    def __enter__(self) -> FakeCollection:
+        return self.collection
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
@@ -0,0 +1,92 @@
+"""
+Import-time benchmark for the discounting package.
+
+Runs each module import in a fresh interpreter with `-X importtime`, so the
+numbers include everything a short-lived worker pays before doing any work,
+and writes a JSON report that can be compared across commits.
+
+Usage:
+    python benchmarks/import_time.py [--repeat 5] [--output benchmarks/results/import_time.json]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+MODULES = [
+    "src.discounting.logger",
+    "src.discounting.exception",
+    "src.discounting.utils.commons",
+    "src.discounting.config_manager.config_settings",
+    "src.discounting.pipelines.pip_07_prediction_pipeline",
+]
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module: str) -> dict:
+    """Import `module` once in a clean interpreter and parse the -X importtime output."""
+    # Run from an empty directory so a stray logs/ folder would be noticed
+    with tempfile.TemporaryDirectory() as work_dir:
+        env = dict(os.environ, PYTHONPATH=str(ROOT_DIR))
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=work_dir, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+        side_effects = sorted(os.listdir(work_dir))
+
+    imports = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append({"module": name, "self_us": int(self_us),
+                            "cumulative_us": int(cumulative_us), "depth": len(indent) // 2})
+
+    top_level = [entry for entry in imports if entry["depth"] == 0]
+    return {
+        "total_us": sum(entry["cumulative_us"] for entry in top_level),
+        "slowest": sorted(top_level, key=lambda entry: entry["cumulative_us"], reverse=True)[:10],
+        "files_created": side_effects,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=str(ROOT_DIR / "benchmarks" / "results" / "import_time.json"))
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    report = {"created_at": datetime.now().isoformat(), "python": sys.version, "modules": {}}
+    for module in args.modules:
+        runs = [measure(module) for _ in range(args.repeat)]
+        totals = [run["total_us"] for run in runs]
+        report["modules"][module] = {
+            "median_ms": statistics.median(totals) / 1000,
+            "min_ms": min(totals) / 1000,
+            "slowest_imports": runs[0]["slowest"],
+            "files_created": runs[0]["files_created"],
+        }
+        print(f"{module:<60} {statistics.median(totals) / 1000:8.1f} ms"
+              + (f"  (created: {runs[0]['files_created']})" if runs[0]["files_created"] else ""))
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=4)
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
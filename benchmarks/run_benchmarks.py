@@ -0,0 +1,232 @@
+"""
+Scaling benchmark for the discounting pipeline.
+
+For each dataset size the stages run end to end on synthetic reservations
+(see synthetic_data.py) fed through an in-process fake Mongo collection:
+
+    ingestion -> validation -> transformation -> training -> prediction
+
+Every size runs in its own interpreter, so peak RSS is per size, and the
+per-step numbers come from the StageMetrics each stage already records.
+
+Usage:
+    python benchmarks/run_benchmarks.py                      # 10k, 1M and 10M rows
+    python benchmarks/run_benchmarks.py --sizes 10000 100000
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<previous>.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "benchmarks"))
+
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+RESULTS_DIR = ROOT_DIR / "benchmarks" / "results"
+
+
+def _stage_result(n_rows: int, wall_seconds: float, cpu_seconds: float, metrics: dict = None) -> dict:
+    from src.discounting.utils.metrics import peak_rss_mb
+    return {
+        "wall_seconds": wall_seconds,
+        "cpu_seconds": cpu_seconds,
+        "rows_per_second": n_rows / wall_seconds if wall_seconds else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "steps": (metrics or {}).get("steps", {}),
+    }
+
+
+class _Timer:
+    def __enter__(self):
+        self.wall, self.cpu = time.perf_counter(), time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall_seconds = time.perf_counter() - self.wall
+        self.cpu_seconds = time.process_time() - self.cpu
+
+
+def run_size(n_rows: int, seed: int, work_dir: Path) -> dict:
+    """Run every stage once on `n_rows` synthetic reservations inside `work_dir`."""
+    import numpy as np
+    import pandas as pd
+
+    from fake_mongo import FakeCollection, FakeMongoConnection
+    from synthetic_data import iter_reservations, load_schema
+    from src.discounting.config_entity.config_models import DataTransformationFile, ModelParamsFile
+    from src.discounting.config_manager.config_loader import load_config
+    from src.discounting.config_entity.config_params import (
+        DataIngestionConfig, DataValidationConfig, DataTransformationConfig, ModelTrainerConfig, PredictionConfig,
+    )
+    from src.discounting.components.c_01_data_ingestion import DataIngestion
+    from src.discounting.components.c_02_data_validation import DataValidation
+    from src.discounting.components.c_03_data_transformation import DataTransformation
+    from src.discounting.components.c_04_model_trainer import ModelTrainer
+    from src.discounting.pipelines.pip_07_prediction_pipeline import PredictionPipeline
+
+    os.chdir(work_dir)
+    for directory in ("ingestion", "validation", "transformation", "trainer", "prediction"):
+        os.makedirs(directory, exist_ok=True)
+
+    schema = load_schema()
+    transformation = load_config(ROOT_DIR / "config" / "data-transformation.yaml", DataTransformationFile).data_transformation
+    model_params = load_config(ROOT_DIR / "config" / "model-params.yaml", ModelParamsFile)
+
+    results = {}
+
+    # Ingestion (fetch from the fake collection, clean, save)
+    ingestion = DataIngestion(DataIngestionConfig(
+        root_dir="ingestion", database_name="benchmark", collection_name="hotel_discounts",
+        batch_size=20_000, mongo_uri=None, all_schema=schema,
+    ))
+    ingestion.mongo_connection = FakeMongoConnection(FakeCollection(lambda: iter_reservations(n_rows, seed, schema=schema)))
+    with _Timer() as timer:
+        ingestion.import_data_from_mongodb()
+    results["ingestion"] = _stage_result(n_rows, timer.wall_seconds, timer.cpu_seconds, ingestion.metrics.to_dict())
+
+    # Validation
+    validation = DataValidation(DataValidationConfig(
+        root_dir="validation", data_dir="ingestion/hotel_reservations.parquet",
+        val_status="validation/validation_status.json", all_schema=schema,
+        validated_data="validation/hotel_val_data.parquet",
+    ))
+    with _Timer() as timer:
+        if not validation.validate_all_columns():
+            raise RuntimeError("Synthetic data failed validation, see validation/validation_status.json")
+    results["validation"] = _stage_result(n_rows, timer.wall_seconds, timer.cpu_seconds, validation.metrics.to_dict())
+
+    # Transformation
+    transformation_stage = DataTransformation(DataTransformationConfig(
+        root_dir="transformation", data_path="validation/hotel_val_data.parquet",
+        numerical_cols=list(transformation.numerical_cols),
+        categorical_cols=list(transformation.categorical_cols),
+        target_col=transformation.target_col, random_state=transformation.random_state,
+    ))
+    with _Timer() as timer:
+        transformation_stage.train_test_split_data()
+    results["transformation"] = _stage_result(n_rows, timer.wall_seconds, timer.cpu_seconds, transformation_stage.metrics.to_dict())
+
+    # Training: a full refit of the configured estimator (a fresh work_dir has no champion)
+    trainer = ModelTrainer(ModelTrainerConfig(
+        root_dir="trainer", x_train_path="transformation/X_train_transformed.npy",
+        y_train_path="transformation/y_train.parquet", x_test_path="transformation/X_test_transformed.npy",
+        y_test_path="transformation/y_test.parquet", train_keys_path="transformation/train_row_keys.npy",
+        preprocessor_path="transformation/preprocessor.joblib", model_path="trainer/model.joblib",
+        ledger_path="trainer/trained_row_keys.npy", state_path="trainer/trainer-state.json",
+        estimator=model_params.estimator, params=dict(model_params.params.get(model_params.estimator, {})),
+        metric="roc_auc", incremental=False, full_refit_every_days=7, full_refit_every_runs=14,
+        new_estimators_per_update=20, max_estimators=600,
+    ))
+    with _Timer() as timer:
+        trainer.train()
+    results["training"] = _stage_result(n_rows, timer.wall_seconds, timer.cpu_seconds, trainer.metrics.to_dict())
+
+    # Prediction: one large batch plus single-row latency
+    prediction = PredictionPipeline(PredictionConfig(
+        root_dir="prediction", preprocessor_path="transformation/preprocessor.joblib",
+        model_path="trainer/model.joblib", num_workers=1, shared_artifacts_dir="prediction/shared",
+        mmap_mode="r", cache_enabled=False,
+    ))
+    features = pd.read_parquet("validation/hotel_val_data.parquet").drop(columns=[transformation.target_col])
+    prediction.load_artifacts()
+    with _Timer() as timer:
+        prediction.predict(features)
+    results["prediction"] = _stage_result(len(features), timer.wall_seconds, timer.cpu_seconds, prediction.metrics.to_dict())
+
+    single_row = features.iloc[:1]
+    latencies = []
+    for _ in range(200):
+        start = time.perf_counter()
+        prediction.predict(single_row)
+        latencies.append(time.perf_counter() - start)
+    results["prediction"]["single_row_latency_ms"] = {
+        "p50": float(np.percentile(latencies, 50) * 1000),
+        "p99": float(np.percentile(latencies, 99) * 1000),
+    }
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """Return (size, stage, baseline, current) for stages whose wall time grew by more than `tolerance`."""
+    regressions = []
+    for size, stages in current["sizes"].items():
+        for stage, result in stages.items():
+            previous = baseline.get("sizes", {}).get(size, {}).get(stage)
+            if previous and previous["wall_seconds"] and result["wall_seconds"] > previous["wall_seconds"] * (1 + tolerance):
+                regressions.append((size, stage, previous["wall_seconds"], result["wall_seconds"]))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Result file, defaults to benchmarks/results/<timestamp>.json")
+    parser.add_argument("--compare", help="Previous result file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown when comparing")
+    parser.add_argument("--single-size", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single_size:
+        # Child process: run one size and print its results as JSON
+        with tempfile.TemporaryDirectory() as work_dir:
+            print(json.dumps(run_size(args.single_size, args.seed, Path(work_dir))))
+        return
+
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "git_commit": _git_commit(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": args.seed,
+        "sizes": {},
+    }
+    log_dir = tempfile.mkdtemp(prefix="discounting-bench-logs-")
+    env = dict(os.environ, LOG_LEVEL="WARNING", LOG_DIR=log_dir)
+    for size in args.sizes:
+        print(f"Benchmarking {size:,} rows...", flush=True)
+        completed = subprocess.run(
+            [sys.executable, __file__, "--single-size", str(size), "--seed", str(args.seed)],
+            capture_output=True, text=True, env=env,
+        )
+        if completed.returncode != 0:
+            print(completed.stderr[-4000:], file=sys.stderr)
+            raise SystemExit(f"Benchmark failed for {size} rows")
+        results = json.loads(completed.stdout.strip().splitlines()[-1])
+        report["sizes"][str(size)] = results
+        for stage, result in results.items():
+            print(f"  {stage:<15} {result['wall_seconds']:9.2f} s  {result['peak_rss_mb'] or 0:9.0f} MB peak")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{datetime.now():%Y-%m-%d_%H-%M-%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=4)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for size, stage, before, after in regressions:
+            print(f"REGRESSION {stage} @ {size} rows: {before:.2f}s -> {after:.2f}s")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
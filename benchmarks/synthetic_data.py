@@ -0,0 +1,84 @@
+"""
+Synthetic hotel-reservation generator matching `all_schema` in
+config/data-validation.yaml.
+
+Categorical columns use the cardinalities and rough frequencies of the hotel
+booking demand data the project is built on; numeric columns follow skewed
+distributions of a similar shape. `is_canceled` depends on lead time, deposit
+type and special requests so that models have something to learn.
+"""
+from pathlib import Path
+from typing import Dict, Iterator
+
+import numpy as np
+import pandas as pd
+import yaml
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SCHEMA_PATH = ROOT_DIR / "config" / "data-validation.yaml"
+
+CATEGORIES: Dict[str, Dict[str, float]] = {
+    "hotel": {"City Hotel": 0.66, "Resort Hotel": 0.34},
+    "meal": {"BB": 0.77, "HB": 0.12, "SC": 0.09, "Undefined": 0.01, "FB": 0.01},
+    "market_segment": {"Online TA": 0.47, "Offline TA/TO": 0.20, "Groups": 0.17, "Direct": 0.10,
+                       "Corporate": 0.04, "Complementary": 0.01, "Aviation": 0.005, "Undefined": 0.005},
+    "distribution_channel": {"TA/TO": 0.82, "Direct": 0.12, "Corporate": 0.055, "GDS": 0.004, "Undefined": 0.001},
+    "reserved_room_type": {"A": 0.72, "D": 0.16, "E": 0.055, "F": 0.024, "G": 0.018, "B": 0.009,
+                           "C": 0.008, "H": 0.005, "P": 0.0005, "L": 0.0005},
+    "assigned_room_type": {"A": 0.62, "D": 0.21, "E": 0.065, "F": 0.031, "G": 0.021, "C": 0.02,
+                           "B": 0.018, "H": 0.006, "I": 0.003, "K": 0.003, "P": 0.001, "L": 0.001},
+    "deposit_type": {"No Deposit": 0.876, "Non Refund": 0.122, "Refundable": 0.002},
+    "customer_type": {"Transient": 0.75, "Transient-Party": 0.21, "Contract": 0.034, "Group": 0.006},
+}
+
+
+def load_schema(schema_path: Path = SCHEMA_PATH) -> Dict[str, str]:
+    with open(schema_path) as f:
+        return yaml.safe_load(f)["data_validation"]["all_schema"]
+
+
+def _choice(rng: np.random.Generator, column: str, n_rows: int) -> np.ndarray:
+    labels = np.array(list(CATEGORIES[column]), dtype=object)
+    weights = np.array(list(CATEGORIES[column].values()))
+    return labels[rng.choice(len(labels), size=n_rows, p=weights / weights.sum())]
+
+
+def generate_chunk(n_rows: int, rng: np.random.Generator, schema: Dict[str, str]) -> pd.DataFrame:
+    """Generate `n_rows` reservations with the dtypes listed in `schema`."""
+    data = {column: _choice(rng, column, n_rows) for column in CATEGORIES}
+
+    data["lead_time"] = np.minimum(rng.exponential(100, n_rows), 737).astype(np.int64)
+    data["booking_changes"] = rng.poisson(0.22, n_rows).astype(np.int64)
+    data["adr"] = np.round(rng.lognormal(4.55, 0.45, n_rows), 2)
+    data["required_car_parking_spaces"] = (rng.random(n_rows) < 0.06).astype(np.int64)
+    data["total_of_special_requests"] = np.minimum(rng.poisson(0.57, n_rows), 5).astype(np.int64)
+    data["total_booking_days"] = 1 + rng.poisson(2.4, n_rows).astype(np.int64)
+    data["total_guests"] = (1 + rng.binomial(3, 0.3, n_rows)).astype(np.float64)
+
+    logit = (-1.2 + 0.004 * data["lead_time"]
+             + 2.5 * (data["deposit_type"] == "Non Refund")
+             - 0.6 * data["total_of_special_requests"]
+             - 1.5 * data["required_car_parking_spaces"])
+    is_canceled = (rng.random(n_rows) < 1 / (1 + np.exp(-logit))).astype(np.int64)
+    data["is_canceled"] = is_canceled
+
+    no_show = rng.random(n_rows) < 0.03
+    data["reservation_status"] = np.where(
+        is_canceled == 1, np.where(no_show, "No-Show", "Canceled"), "Check-Out"
+    ).astype(object)
+
+    frame = pd.DataFrame(data)
+    return frame[list(schema)].astype({column: dtype for column, dtype in schema.items() if dtype != "object"})
+
+
+def iter_reservations(n_rows: int, seed: int = 42, chunk_size: int = 500_000,
+                      schema: Dict[str, str] = None) -> Iterator[pd.DataFrame]:
+    """Yield `n_rows` synthetic reservations in chunks, reproducibly for a given seed."""
+    schema = schema or load_schema()
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_rows, chunk_size):
+        yield generate_chunk(min(chunk_size, n_rows - start), rng, schema)
+
+
+def generate_reservations(n_rows: int, seed: int = 42, schema: Dict[str, str] = None) -> pd.DataFrame:
+    return pd.concat(list(iter_reservations(n_rows, seed, schema=schema)), ignore_index=True)
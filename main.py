@@ -0,0 +1,92 @@
+
+import os
+import sys
+import argparse
+import importlib
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_manager.config_settings import ConfigurationManager
+from src.discounting.utils.artifact_store import ArtifactStore
+
+# Stage name -> (module, pipeline class), in run order. Pipelines are imported
+# only when selected, so validating the configuration stays fast.
+STAGES = {
+    'data_ingestion': ('src.discounting.pipelines.pip_01_data_ingestion', 'DataIngestionPipeline'),
+    'data_validation': ('src.discounting.pipelines.pip_02_data_validation', 'DataValidationPipeline'),
+    'data_profiling': ('src.discounting.pipelines.pip_11_data_profiling', 'DataProfilingPipeline'),
+    'feature_selection': ('src.discounting.pipelines.pip_14_feature_selection', 'FeatureSelectionPipeline'),
+    'data_transformation': ('src.discounting.pipelines.pip_03_data_transformation', 'DataTransformationPipeline'),
+    'model_trainer': ('src.discounting.pipelines.pip_04_model_trainer', 'ModelTrainerPipeline'),
+    'model_evaluation': ('src.discounting.pipelines.pip_05_model_evaluation', 'ModelEvaluationPipeline'),
+    'model_optimization': ('src.discounting.pipelines.pip_13_model_optimization', 'ModelOptimizationPipeline'),
+    'feature_store': ('src.discounting.pipelines.pip_12_feature_store', 'FeatureStorePipeline'),
+    'drift_monitor': ('src.discounting.pipelines.pip_10_drift_monitor', 'DriftMonitorPipeline'),
+    'discount_table': ('src.discounting.pipelines.pip_09_discount_table', 'DiscountTablePipeline'),
+    'bulk_scoring': ('src.discounting.pipelines.pip_08_bulk_scoring', 'BulkScoringPipeline'),
+}
+
+
+def refresh_discount_table(config_manager: ConfigurationManager) -> None:
+    " Rebuild the discount lookup table if the promoted model (or the engine settings) changed"
+    from src.discounting.components.c_08_discount_engine import DiscountEngine
+    from src.discounting.components.c_09_discount_table import DiscountLookup, DiscountTableBuilder
+
+    table_config = config_manager.get_discount_table_config()
+    builder = DiscountTableBuilder(table_config, DiscountEngine(config_manager.get_discount_engine_config()))
+    DiscountLookup(table_config, builder).load()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the discounting pipeline stages")
+    parser.add_argument('stages', nargs='*', metavar='stage',
+                        help=f"Stages to run, in order, from {list(STAGES)} (default: data ingestion to model training)")
+    parser.add_argument('--check-config', action='store_true',
+                        help="Only validate the configuration and exit")
+    parser.add_argument('--run', action='store_true',
+                        help="Run the batch stages in an isolated run directory and record "
+                             "their outputs in the content-addressed artifact store")
+    parser.add_argument('--promote', action='store_true',
+                        help="With --run: link the recorded outputs to the shared artifacts/ paths")
+    args = parser.parse_args(argv)
+    unknown = [stage for stage in args.stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {unknown}")
+    if args.promote and not args.run:
+        parser.error("--promote requires --run")
+
+    try:
+        # Loads and cross-checks every config file before any stage starts
+        config_manager = ConfigurationManager()
+        logger.info("Configuration validated")
+        if args.check_config:
+            return 0
+
+        stages = args.stages or ['data_ingestion', 'data_validation', 'data_transformation', 'model_trainer']
+        store = run_id = None
+        if args.run:
+            store_config = config_manager.get_artifact_store_config()
+            store = ArtifactStore(store_config.root_dir, store_config.runs_dir)
+            run_id = store.new_run()
+            # Picked up by every ConfigurationManager the stages create
+            os.environ['DISCOUNTING_RUN_DIR'] = str(store.run_dir(run_id))
+
+        for stage in stages:
+            module_name, class_name = STAGES[stage]
+            pipeline = getattr(importlib.import_module(module_name), class_name)()
+            pipeline.run()
+
+        if store is not None:
+            store.record_run(run_id, metadata={'stages': stages})
+            if args.promote:
+                store.promote(run_id, config_manager.ingestion_config.artifacts_root)
+                refresh_discount_table(config_manager)
+        return 0
+
+    except CustomException as e:
+        logger.error(f"Pipeline run failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
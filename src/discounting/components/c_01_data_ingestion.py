@@ -4,7 +4,6 @@ from pathlib import Path
 import pandas as pd
 import numpy as np
 import os
-import json
 import time
 from datetime import datetime
 from dotenv import load_dotenv
@@ -13,7 +12,11 @@ from dotenv import load_dotenv
 from src.discounting.exception import CustomException
 from src.discounting.logger import logger
 from src.discounting.config_entity.config_params import DataIngestionConfig
-from src.discounting.data_source import MongoDBConnection
+from src.discounting.data_source.mongo import MongoDBConnection
+from src.discounting.utils.metrics import StageMetrics, file_size
+from src.discounting.utils.dtypes import apply_dtype_plan, build_dtype_plan
+from src.discounting.utils.artifact_io import save_artifact
+from src.discounting.utils.commons import save_json
 
 load_dotenv()
 
@@ -26,6 +29,7 @@ class DataIngestion:
             self.config.database_name,
             self.config.collection_name
         )
+        self.metrics = StageMetrics("data_ingestion")
 
     def import_data_from_mongodb(self):
         start_time = time.time()
@@ -33,13 +37,26 @@ class DataIngestion:
         try:
             logger.info("Starting data ingestion...")
             with self.mongo_connection as collection:
-                all_data = self._fetch_all_data(collection)
+                with self.metrics.track("fetch") as step:
+                    all_data = self._fetch_all_data(collection)
+                    step.rows_out = len(all_data)
                 if all_data.empty:
                     logger.warning("No data found in MongoDB.")
                     return
-                cleaned_data = self._clean_data(all_data)
-                output_path = self._save_data(cleaned_data)
+                with self.metrics.track("clean", rows_in=len(all_data)) as step:
+                    cleaned_data = self._clean_data(all_data)
+                    step.rows_out = len(cleaned_data)
+                if self.config.compact_dtypes and self.config.all_schema:
+                    with self.metrics.track("compact_dtypes", rows_in=len(cleaned_data)) as step:
+                        step.extra['memory_before_mb'] = cleaned_data.memory_usage(deep=True).sum() / 1024 ** 2
+                        cleaned_data = self._compact_dtypes(cleaned_data)
+                        step.extra['memory_after_mb'] = cleaned_data.memory_usage(deep=True).sum() / 1024 ** 2
+                        step.rows_out = len(cleaned_data)
+                with self.metrics.track("save", rows_in=len(cleaned_data)) as step:
+                    output_path = self._save_data(cleaned_data)
+                    step.bytes_written = file_size(output_path)
                 self._save_metadata(start_time, start_timestamp, len(cleaned_data), output_path)
+                self.metrics.save(self.config.root_dir)
                 logger.info("Data ingestion completed successfully.")
         except Exception as e:
             logger.error(f"Error during data ingestion: {e}")
@@ -52,7 +69,8 @@ class DataIngestion:
             data_list = []
             
             # Use cursor with batch_size for efficient memory usage
-            cursor = collection.find({}, {'_id': 0}).batch_size(batch_size)
+            projection = None if self.config.id_column else {'_id': 0}
+            cursor = collection.find({}, projection).batch_size(batch_size)
             for document in cursor:
                 data_list.append(document)
                 
@@ -73,7 +91,12 @@ class DataIngestion:
                 else:
                     combined_df = pd.concat([combined_df, df_batch], ignore_index=True)
             
-            return combined_df if 'combined_df' in locals() else pd.DataFrame()
+            if 'combined_df' not in locals():
+                return pd.DataFrame()
+            if self.config.id_column:
+                combined_df = combined_df.rename(columns={'_id': self.config.id_column})
+                combined_df[self.config.id_column] = combined_df[self.config.id_column].astype(str)
+            return combined_df
             
         except Exception as e:
             logger.error(f"Error fetching data: {e}")
@@ -85,15 +108,19 @@ class DataIngestion:
         Replicates the simpler notebook logic.
         """
         try:
+            # The reservation ID is unique by design and is kept
+            columns = [col for col in df.columns if col != self.config.id_column]
+
             # Identify columns with zero variance (nunique == 1)
-            zero_variance_columns = [col for col in df.columns if df[col].nunique() == 1]
+            zero_variance_columns = [col for col in columns if df[col].nunique() == 1]
 
             # Drop columns with zero variance
             df.drop(columns=zero_variance_columns, errors='ignore', inplace=True)
             logger.info(f"Removed columns with zero variance: {zero_variance_columns}")
 
             # Identify columns with unique values
-            unique_value_columns = [col for col in df.columns if df[col].nunique() == len(df)]
+            unique_value_columns = [col for col in columns
+                                    if col not in zero_variance_columns and df[col].nunique() == len(df)]
 
             # Drop columns with unique values
             df.drop(columns=unique_value_columns, errors='ignore', inplace=True)
@@ -112,11 +139,33 @@ class DataIngestion:
             logger.error(f"Error during data cleaning: {e}")
             raise CustomException(e, sys)
     
+    def _compact_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Narrows numerics and dictionary-encodes low-cardinality strings using a
+        plan derived from the validation schema, and records the plan next to
+        the data.
+        """
+        try:
+            plan = build_dtype_plan(
+                df,
+                self.config.all_schema,
+                categorical_max_unique=self.config.categorical_max_unique,
+                categorical_max_ratio=self.config.categorical_max_ratio
+            )
+            df = apply_dtype_plan(df, plan)
+            save_json(Path(self.config.root_dir) / "dtype-plan.json", plan)
+            logger.info(f"Applied dtype plan: {plan}")
+            return df
+        except Exception as e:
+            logger.error(f"Error compacting dtypes: {e}")
+            raise CustomException(e, sys)
+
     def _save_data(self, df: pd.DataFrame) -> Path:
         try:
             root_dir = self.config.root_dir
             output_path = Path(root_dir) / "hotel_reservations.parquet"
-            df.to_parquet(output_path, index=False)
+            # Written to a temp file and renamed, so readers never see a partial file
+            save_artifact(df, output_path)
             logger.info(f"Data saved to {output_path}")
             return output_path
         except Exception as e:
@@ -135,8 +184,7 @@ class DataIngestion:
                 "output_path": str(output_path)
             }
             metadata_path = Path(root_dir) / "data-ingestion-metadata.json"
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=4)
+            save_json(metadata_path, metadata)
             logger.info("Metadata saved successfully.")
         except Exception as e:
             logger.error(f"Error saving metadata: {e}")
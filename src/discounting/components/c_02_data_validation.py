@@ -4,14 +4,23 @@ from pathlib import Path
 import pandas as pd
 import sys
 import json
+from datetime import datetime
 from src.discounting.exception import CustomException  
 from src.discounting.logger import logger 
 from src.discounting.config_entity.config_params import DataValidationConfig 
+from src.discounting.utils.metrics import StageMetrics, file_size
+from src.discounting.utils.dtypes import dtype_matches
+from src.discounting.utils.commons import save_json
+from src.discounting.utils.artifact_io import append_record, history_path
+from src.discounting.utils.artifact_store import link_file
+
+VALID_RESULTS = {"Reservation ID column", "Column present in schema", "Data type valid"}
 
 
 class DataValidation:
     def __init__(self, config: DataValidationConfig):
         self.config = config
+        self.metrics = StageMetrics("data_validation")
 
     def validate_all_columns(self) -> bool:
         try:
@@ -19,7 +28,10 @@ class DataValidation:
             validation_results = {} #Collects all validation details
 
             try:
-                data = pd.read_parquet(self.config.data_dir)  # Read the Parquet file
+                with self.metrics.track("read") as step:
+                    data = pd.read_parquet(self.config.data_dir)  # Read the Parquet file
+                    step.rows_out = len(data)
+                    step.bytes_read = file_size(self.config.data_dir)
             except Exception as e:
                 logger.error(f"Error reading Parquet file: {e}")
                 raise CustomException(f"Error reading Parquet file: {e}", sys)
@@ -27,31 +39,45 @@ class DataValidation:
             all_cols = list(data.columns)
             all_schema = self.config.all_schema
 
-            for col in all_cols:
-                if col not in all_schema:
-                    logger.error(f"Column {col} not found in schema")
-                    validation_results[col] = "Column missing in schema"
-                    overall_status = False #No need to continue, validation failed
-                else:
-                    validation_results[col] = "Column present in schema"
-
-            #Additional check for column datatypes
-            if overall_status:
+            with self.metrics.track("validate", rows_in=len(data)):
                 for col in all_cols:
-                    expected_dtype = str(all_schema[col])
-                    actual_dtype = str(data[col].dtype)
-                    if expected_dtype != actual_dtype:
-                        logger.error(f"Column {col} has incorrect data type: expected {expected_dtype}, got {actual_dtype}")
-                        validation_results[col] = f"Incorrect data type: expected {expected_dtype}, got {actual_dtype}"
-                        overall_status = False
+                    if col == self.config.id_column:
+                        validation_results[col] = "Reservation ID column"
+                    elif col not in all_schema:
+                        logger.error(f"Column {col} not found in schema")
+                        validation_results[col] = "Column missing in schema"
+                        overall_status = False #No need to continue, validation failed
                     else:
-                        validation_results[col] = "Data type valid"
+                        validation_results[col] = "Column present in schema"
+
+                #Additional check for column datatypes
+                if overall_status:
+                    for col in all_cols:
+                        if col == self.config.id_column:
+                            continue
+                        expected_dtype = str(all_schema[col])
+                        actual_dtype = str(data[col].dtype)
+                        # Compact dtypes written at ingestion (int8, float32, category, ...) are equivalent
+                        if not dtype_matches(expected_dtype, actual_dtype):
+                            logger.error(f"Column {col} has incorrect data type: expected {expected_dtype}, got {actual_dtype}")
+                            validation_results[col] = f"Incorrect data type: expected {expected_dtype}, got {actual_dtype}"
+                            overall_status = False
+                        else:
+                            validation_results[col] = "Data type valid"
 
             # Save results to a file
             val_status_path = self.config.val_status
             try:
-                with open(val_status_path, 'w') as f:
-                    json.dump(validation_results, f, indent=4)
+                save_json(val_status_path, validation_results)
+                # One line per run, for the monitoring dashboard
+                append_record(history_path(val_status_path), {
+                    'validated_at': datetime.now().isoformat(),
+                    'status': 'passed' if overall_status else 'failed',
+                    'rows': len(data),
+                    'columns': len(all_cols),
+                    'failed_columns': [col for col, result in validation_results.items()
+                                       if result not in VALID_RESULTS],
+                })
                 logger.info(f"Validation results saved to {val_status_path}")
             except Exception as e:
                 logger.error(f"Failed to save validation results: {e}")
@@ -64,15 +90,20 @@ class DataValidation:
             if overall_status:
                 try:
                     output_path = self.config.validated_data
-                    data.to_parquet(output_path, index=False) #use to_parquet
+                    with self.metrics.track("save", rows_in=len(data)) as step:
+                        # Validation does not modify the data, so the validated file is
+                        # a hard link to the ingested one rather than a rewrite
+                        linked = link_file(self.config.data_dir, output_path)
+                        step.bytes_written = 0 if linked else file_size(output_path)
+                        step.extra['hard_linked'] = linked
                     logger.info(f"Validated data saved to {output_path}")
                 except Exception as e:
                     logger.error(f"Failed to save validated data: {e}")
                     raise CustomException(f"Failed to save validated data: {e}", sys)
             else:
                 logger.warning(f"Data validation failed. Check {val_status_path} for more details")
-                
 
+            self.metrics.save(root_dir_path)
             return overall_status
 
         except Exception as e:
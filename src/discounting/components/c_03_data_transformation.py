@@ -0,0 +1,218 @@
+
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler, OneHotEncoder, LabelEncoder
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.impute import SimpleImputer
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_entity.config_params import DataTransformationConfig
+from src.discounting.utils.commons import save_object, save_bin, load_object
+from src.discounting.utils.artifact_io import FORMAT_JSON, load_artifact, save_artifact
+from src.discounting.utils.artifact_store import link_file
+from src.discounting.utils.metrics import StageMetrics, file_size
+
+
+class DataTransformation:
+    def __init__(self, config: DataTransformationConfig):
+        self.config = config
+        self.metrics = StageMetrics("data_transformation")
+        self.select_columns(self._load_selection())
+
+    def select_columns(self, columns) -> None:
+        """Restrict the transformation to `columns` (None: all columns)."""
+        self.selected_columns = set(columns) if columns is not None else None
+        self.numerical_cols = self._selected(self.config.numerical_cols)
+        self.categorical_cols = self._selected(self.config.categorical_cols)
+
+    def _load_selection(self):
+        """Columns kept by an accepted feature selection (see c_13_feature_selection), or None for all."""
+        path = self.config.selected_features_path
+        if not path or not Path(path).exists():
+            return None
+        selection = load_artifact(path, fmt=FORMAT_JSON)
+        if selection.get('status') != 'accepted':
+            return None
+        return selection['selected_columns']
+
+    def _selected(self, columns: list) -> list:
+        if self.selected_columns is None:
+            return list(columns)
+        return [col for col in columns if col in self.selected_columns]
+
+    def get_transformer_object(self) -> ColumnTransformer:
+        logger.info("Creating transformer object")
+
+        try:
+            numerical_transformer = Pipeline(steps=[
+                ('imputer', SimpleImputer(strategy='mean')),
+                ('scaler', StandardScaler())
+            ])
+
+            categorical_transformer = Pipeline(steps=[
+                ('imputer', SimpleImputer(strategy='most_frequent')),
+                ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=False))
+            ])
+
+            preprocessor = ColumnTransformer(
+                transformers=[
+                    ('num', numerical_transformer, self.numerical_cols),
+                    ('cat', categorical_transformer, self.categorical_cols),
+                ], remainder='passthrough'
+            )
+
+            return preprocessor
+
+        except Exception as e:
+            logger.exception(f"Error creating transformer object: {str(e)}")
+            raise CustomException(e, sys)
+
+    def _reusable_preprocessor(self, path: Path, input_columns: list):
+        """
+        The fitted preprocessor at `path` if it may be reused: younger than
+        preprocessor_max_age_days and built for the configured (and selected)
+        columns, with `input_columns` as its input.
+        Keeping it fixed between refits keeps the feature space stable, which
+        incremental model updates rely on.
+        """
+        max_age_days = self.config.preprocessor_max_age_days
+        if max_age_days <= 0 or not path.exists():
+            return None
+        if time.time() - path.stat().st_mtime > max_age_days * 86400:
+            logger.info(f"Preprocessor older than {max_age_days} days, refitting")
+            return None
+        preprocessor = load_object(path)
+        columns = {name: list(cols) for name, _, cols in preprocessor.transformers}
+        if columns.get('num') != self.numerical_cols or columns.get('cat') != self.categorical_cols or \
+                list(getattr(preprocessor, 'feature_names_in_', [])) != list(input_columns):
+            logger.info("Preprocessor columns differ from the configuration, refitting")
+            return None
+        return preprocessor
+
+    def _split(self, X: pd.DataFrame, y: np.ndarray, row_keys):
+        """
+        With row keys (hashed reservation IDs) a reservation's side of the split
+        is fixed by its key, so it stays in the same set as data accumulates;
+        otherwise a stratified random split.
+        """
+        if row_keys is None:
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=self.config.test_size, stratify=y, random_state=self.config.random_state
+            )
+            return X_train, X_test, y_train, y_test, None
+        in_test = (row_keys % 10_000) < int(self.config.test_size * 10_000)
+        return X[~in_test], X[in_test], y[~in_test], y[in_test], row_keys[~in_test]
+
+    def load_split(self):
+        """
+        Read the validated data and split it into raw (untransformed) train and
+        test sets: X_train, X_test, y_train, y_test and the training row keys
+        (None without a reservation ID column).
+        """
+        try:
+            # Load data
+            data_path = self.config.data_path
+            try:
+                with self.metrics.track("read") as step:
+                    df = pd.read_parquet(data_path)
+                    step.rows_out = len(df)
+                    step.bytes_read = file_size(data_path)
+                logger.info(f"Data shape: {df.shape}")
+            except Exception as e:
+                logger.error(f"Error reading Parquet file: {e}")
+                raise CustomException(f"Error reading Parquet file: {e}", sys)
+
+            with self.metrics.track("split", rows_in=len(df)) as step:
+                # Split into features (X) and target (y)
+                X = df.drop(self.config.target_col, axis=1)
+                # The reservation ID identifies rows, it is not a feature
+                row_keys = None
+                if self.config.id_column in X.columns:
+                    row_keys = pd.util.hash_pandas_object(X[self.config.id_column], index=False).to_numpy()
+                    X = X.drop(columns=[self.config.id_column])
+                if self.selected_columns is not None:
+                    # Dropped columns must not reach the preprocessor's passthrough remainder
+                    X = X[[col for col in X.columns if col in self.selected_columns]]
+                    logger.info(f"Feature selection applied: {X.shape[1]} columns kept")
+                y = df[self.config.target_col]
+
+                # Encode target variable using LabelEncoder
+                le = LabelEncoder()
+                y = le.fit_transform(y)
+                logger.info(f"Target variable '{self.config.target_col}' label encoded.")
+
+                # Split data into training and test sets
+                split = self._split(X, y, row_keys)
+                step.rows_out = len(split[0]) + len(split[1])
+
+            logger.info("Data splitting completed.")
+            return split
+        except Exception as e:
+            logger.exception(f"Error splitting the data: {e}")
+            raise CustomException(e, sys)
+
+    def train_test_split_data(self) -> None:
+        try:
+            logger.info("Splitting data into train and test sets")
+            X_train, X_test, y_train, y_test, train_keys = self.load_split()
+
+            transformed_data_dir = Path(self.config.root_dir)
+
+            # Get preprocessor object; an isolated run reuses the promoted one
+            preprocessor_path = transformed_data_dir / 'preprocessor.joblib'
+            previous_path = Path(self.config.champion_preprocessor_path or preprocessor_path)
+            preprocessor = self._reusable_preprocessor(previous_path, list(X_train.columns))
+            refit = preprocessor is None
+            if refit:
+                preprocessor = self.get_transformer_object()
+
+            # Fit and transform training data
+            with self.metrics.track("fit_transform", rows_in=len(X_train)) as step:
+                X_train_transformed = preprocessor.fit_transform(X_train) if refit else preprocessor.transform(X_train)
+                step.extra['preprocessor_refit'] = refit
+                step.rows_out = X_train_transformed.shape[0]
+                step.extra['n_features_out'] = int(X_train_transformed.shape[1])
+            logger.info("Training data transformation completed.")
+
+            # Transform test data
+            with self.metrics.track("transform", rows_in=len(X_test)) as step:
+                X_test_transformed = preprocessor.transform(X_test)
+                step.rows_out = X_test_transformed.shape[0]
+            logger.info("Test data transformation completed.")
+
+            # Saving objects
+            with self.metrics.track("save") as step:
+                if refit:
+                    save_object(obj=preprocessor, file_path=preprocessor_path)
+                elif previous_path != preprocessor_path:
+                    link_file(previous_path, preprocessor_path)
+                if train_keys is not None:
+                    # Identifies training rows across runs, see the model trainer
+                    save_bin(train_keys, transformed_data_dir / 'train_row_keys.npy')
+
+                save_artifact(pd.DataFrame(y_train), transformed_data_dir / 'y_train.parquet')
+                save_artifact(pd.DataFrame(y_test), transformed_data_dir / 'y_test.parquet')
+
+                # .npy: raw arrays that later stages can memory-map
+                save_bin(X_train_transformed, transformed_data_dir / 'X_train_transformed.npy')
+                save_bin(X_test_transformed, transformed_data_dir / 'X_test_transformed.npy')
+
+                step.bytes_written = sum(
+                    file_size(transformed_data_dir / name) or 0
+                    for name in ('preprocessor.joblib', 'y_train.parquet', 'y_test.parquet',
+                                 'X_train_transformed.npy', 'X_test_transformed.npy')
+                )
+
+            self.metrics.save(transformed_data_dir)
+            logger.info("All transformed data and preprocessor saved successfully.")
+
+        except Exception as e:
+            logger.exception(f"Error during data transformation: {e}")
+            raise CustomException(e, sys)
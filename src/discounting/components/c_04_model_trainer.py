@@ -0,0 +1,255 @@
+
+import sys
+import importlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sklearn.metrics import accuracy_score, f1_score, log_loss, roc_auc_score
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_entity.config_params import ModelTrainerConfig
+from src.discounting.utils.commons import load_object, save_object, load_bin, save_bin
+from src.discounting.utils.artifact_io import FORMAT_JSON, load_artifact, save_artifact
+from src.discounting.utils.artifact_store import hash_file, link_file
+from src.discounting.utils.metrics import StageMetrics
+from src.discounting.serving.compiled_trees import artifact_stamp, compile_model, parity_error
+
+# Estimator name -> (module, class, how it can learn from new rows only):
+#   warm_start   tree ensembles grow extra estimators fitted on the new rows
+#   partial_fit  one more pass of online learning over the new rows
+#   None         full refits only
+ESTIMATORS = {
+    'random_forest': ('sklearn.ensemble', 'RandomForestClassifier', 'warm_start'),
+    'extra_trees': ('sklearn.ensemble', 'ExtraTreesClassifier', 'warm_start'),
+    'gradient_boosting': ('sklearn.ensemble', 'GradientBoostingClassifier', 'warm_start'),
+    'sgd': ('sklearn.linear_model', 'SGDClassifier', 'partial_fit'),
+    'logistic_regression': ('sklearn.linear_model', 'LogisticRegression', None),
+}
+
+# Metrics where lower is better
+LOWER_IS_BETTER = {'log_loss'}
+HISTORY_LIMIT = 100
+# Holdout rows the compiled model is checked against
+PARITY_ROWS = 2000
+
+
+def build_estimator(name: str, params: Optional[dict] = None):
+    """A new, unfitted estimator from its ESTIMATORS name and parameters."""
+    module_name, class_name, _ = ESTIMATORS[name]
+    return getattr(importlib.import_module(module_name), class_name)(**(params or {}))
+
+
+def evaluate_model(model, X: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+    """Holdout metrics of a fitted binary classifier."""
+    return evaluate_probabilities(y, model.predict_proba(X)[:, 1])
+
+
+def evaluate_probabilities(y: np.ndarray, probabilities: np.ndarray) -> Dict[str, float]:
+    """Metrics of class 1 probabilities against the true labels."""
+    predictions = (probabilities >= 0.5).astype(int)
+    return {
+        'roc_auc': float(roc_auc_score(y, probabilities)) if len(np.unique(y)) > 1 else float('nan'),
+        'log_loss': float(log_loss(y, probabilities, labels=[0, 1])),
+        'accuracy': float(accuracy_score(y, predictions)),
+        'f1': float(f1_score(y, predictions, zero_division=0)),
+    }
+
+
+class ModelTrainer:
+    """
+    Trains the cancellation model, incrementally where possible.
+
+    The trainer keeps the champion model, a ledger of the training rows it has
+    learned from (the hashed reservation IDs written by the transformation)
+    and a small state file. Each run either:
+
+    - updates the champion with the rows not in the ledger (warm-started tree
+      ensembles grow `new_estimators_per_update` estimators on them,
+      partial_fit estimators take one pass over them), or
+    - refits from scratch on all rows: on the first run, when the schedule
+      says so (`full_refit_every_days` / `full_refit_every_runs`), when the
+      preprocessor has been refitted (the feature space changed), or when the
+      estimator or its parameters changed.
+
+    At a full refit the outgoing champion is scored on the same holdout set,
+    so the history records how far the incremental updates drifted from a
+    full refit.
+
+    The champion, ledger and state are read from the `champion_*` paths and
+    written to `model_path`, `ledger_path` and `state_path`; they differ in an
+    isolated run, which starts from the promoted champion.
+    """
+    def __init__(self, config: ModelTrainerConfig):
+        self.config = config
+        self.metrics = StageMetrics("model_trainer")
+        self.champion_model_path = config.champion_model_path or config.model_path
+        self.champion_ledger_path = config.champion_ledger_path or config.ledger_path
+        self.champion_state_path = config.champion_state_path or config.state_path
+
+    def _load_state(self) -> dict:
+        if Path(self.champion_state_path).exists():
+            return load_artifact(self.champion_state_path, fmt=FORMAT_JSON)
+        return {'history': []}
+
+    def _full_refit_reason(self, state: dict, preprocessor_digest: str, row_keys: Optional[np.ndarray]) -> Optional[str]:
+        champion = state.get('champion')
+        if champion is None or not Path(self.champion_model_path).exists():
+            return 'no champion'
+        if not self.config.incremental or ESTIMATORS[self.config.estimator][2] is None:
+            return 'incremental updates disabled for this estimator'
+        if row_keys is None:
+            return 'no row keys (data_ingestion.id_column) to find new rows'
+        if not Path(self.champion_ledger_path).exists():
+            return 'no ledger of trained rows'
+        if champion['estimator'] != self.config.estimator or champion['params'] != self.config.params:
+            return 'estimator or parameters changed'
+        if champion['preprocessor_digest'] != preprocessor_digest:
+            return 'preprocessor refitted'
+        last_full = datetime.fromisoformat(state['last_full_refit_at'])
+        if datetime.now() - last_full >= timedelta(days=self.config.full_refit_every_days):
+            return f"scheduled: last full refit {last_full:%Y-%m-%d}"
+        if state.get('runs_since_full_refit', 0) >= self.config.full_refit_every_runs:
+            return f"scheduled: {state['runs_since_full_refit']} incremental updates since the last full refit"
+        if ESTIMATORS[self.config.estimator][2] == 'warm_start' and \
+                champion['n_estimators'] + self.config.new_estimators_per_update > self.config.max_estimators:
+            return f"ensemble reached max_estimators ({self.config.max_estimators})"
+        return None
+
+    def _load_training_data(self) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        # Memory-mapped: a row subset is all an incremental update reads
+        X_train = load_artifact(self.config.x_train_path, mmap_mode='r')
+        y_train = load_artifact(self.config.y_train_path).iloc[:, 0].to_numpy()
+        row_keys = None
+        if Path(self.config.train_keys_path).exists():
+            row_keys = load_bin(self.config.train_keys_path)
+            if len(row_keys) != len(y_train):
+                logger.warning(f"{self.config.train_keys_path} does not match the training data, ignoring it")
+                row_keys = None
+        return X_train, y_train, row_keys
+
+    def _full_refit(self, X_train, y_train):
+        model = build_estimator(self.config.estimator, self.config.params)
+        model.fit(np.asarray(X_train), y_train)
+        return model
+
+    def _update(self, model, X_new: np.ndarray, y_new: np.ndarray) -> bool:
+        """Apply an incremental update in place; False if the rows are kept for a later update."""
+        if ESTIMATORS[self.config.estimator][2] == 'partial_fit':
+            model.partial_fit(X_new, y_new, classes=model.classes_)
+            return True
+        # Estimators fitted on one class only would not match the ensemble
+        if len(np.unique(y_new)) < len(model.classes_):
+            logger.info(f"{len(y_new)} new rows hold a single class, deferring the update")
+            return False
+        model.set_params(warm_start=True, n_estimators=model.n_estimators + self.config.new_estimators_per_update)
+        model.fit(X_new, y_new)
+        model.set_params(warm_start=False)
+        return True
+
+    def _export_compiled(self, model, X_test) -> Optional[dict]:
+        """
+        Write the array form of a tree ensemble for low-latency scoring, if it
+        reproduces the model's probabilities on the holdout rows. Any stale
+        export is removed first, so serving never pairs it with another model.
+        """
+        compiled_path = Path(self.config.compiled_model_path)
+        compiled_path.unlink(missing_ok=True)
+        compiled = compile_model(model)
+        if compiled is None:
+            logger.info(f"{type(model).__name__} has no compiled form, serving will use sklearn")
+            return None
+        error = parity_error(compiled, model, X_test[:PARITY_ROWS])
+        info = {'nodes': compiled.n_nodes, 'depth': compiled.depth, 'parity_error': error}
+        if error > self.config.compiled_parity_tolerance:
+            logger.error(f"Compiled model differs from sklearn by {error:.3g} "
+                         f"(tolerance {self.config.compiled_parity_tolerance}), not exported")
+            return dict(info, exported=False)
+        compiled.source = artifact_stamp(self.config.model_path)
+        # Uncompressed, so serving processes can memory-map the arrays
+        save_artifact(compiled, compiled_path, compress=0)
+        return dict(info, exported=True)
+
+    def train(self) -> dict:
+        """Run a full refit or an incremental update, evaluate, and save the model and state."""
+        try:
+            state = self._load_state()
+            preprocessor_digest = hash_file(self.config.preprocessor_path)
+            with self.metrics.track("load") as step:
+                X_train, y_train, row_keys = self._load_training_data()
+                X_test = load_artifact(self.config.x_test_path, mmap_mode='r')
+                y_test = load_artifact(self.config.y_test_path).iloc[:, 0].to_numpy()
+                step.rows_out = len(y_train)
+
+            reason = self._full_refit_reason(state, preprocessor_digest, row_keys)
+            ledger = None
+            entry = {'run_at': datetime.now().isoformat(), 'rows_total': int(len(y_train))}
+            if reason is None:
+                ledger = load_bin(self.champion_ledger_path)
+                new_rows = np.flatnonzero(~np.isin(row_keys, ledger))
+                model = load_object(self.champion_model_path)
+                with self.metrics.track("incremental_update", rows_in=len(new_rows)) as step:
+                    updated = len(new_rows) > 0 and self._update(model, np.asarray(X_train[new_rows]), y_train[new_rows])
+                    step.extra['updated'] = updated
+                entry.update(mode='incremental' if updated else 'unchanged', rows_new=int(len(new_rows)))
+                if updated:
+                    ledger = np.union1d(ledger, row_keys[new_rows])
+                    state['runs_since_full_refit'] = state.get('runs_since_full_refit', 0) + 1
+
+            if reason is not None:
+                logger.info(f"Full refit: {reason}")
+                champion_scores = None
+                if state.get('champion') is not None and Path(self.champion_model_path).exists():
+                    previous = load_object(self.champion_model_path)
+                    if getattr(previous, 'n_features_in_', None) == X_test.shape[1]:
+                        champion_scores = evaluate_model(previous, X_test, y_test)
+                with self.metrics.track("full_refit", rows_in=len(y_train)):
+                    model = self._full_refit(X_train, y_train)
+                ledger = np.unique(row_keys) if row_keys is not None else None
+                entry.update(mode='full', reason=reason, rows_new=int(len(y_train)))
+                if champion_scores is not None:
+                    entry['previous_champion'] = champion_scores
+                state['last_full_refit_at'] = entry['run_at']
+                state['runs_since_full_refit'] = 0
+
+            with self.metrics.track("evaluate", rows_in=len(y_test)):
+                scores = evaluate_model(model, X_test, y_test)
+            entry['scores'] = scores
+            if 'previous_champion' in entry:
+                metric = self.config.metric
+                gap = scores[metric] - entry['previous_champion'][metric]
+                entry['full_refit_gain'] = -gap if metric in LOWER_IS_BETTER else gap
+                logger.info(f"Full refit vs incremental champion: {metric} "
+                            f"{scores[metric]:.4f} vs {entry['previous_champion'][metric]:.4f}")
+
+            with self.metrics.track("save") as step:
+                if entry['mode'] != 'unchanged':
+                    save_object(model, self.config.model_path)
+                elif not Path(self.config.model_path).exists():
+                    # Carried into the run's directory for the stages after this one
+                    link_file(self.champion_model_path, self.config.model_path)
+                if self.config.compiled_model_path and \
+                        (entry['mode'] != 'unchanged' or not Path(self.config.compiled_model_path).exists()):
+                    entry['compiled'] = self._export_compiled(model, X_test)
+                if ledger is not None:
+                    save_bin(ledger, self.config.ledger_path)
+                state['champion'] = {
+                    'trained_at': entry['run_at'] if entry['mode'] != 'unchanged' else state['champion']['trained_at'],
+                    'estimator': self.config.estimator,
+                    'params': self.config.params,
+                    'preprocessor_digest': preprocessor_digest,
+                    'n_estimators': getattr(model, 'n_estimators', None),
+                    'scores': scores,
+                }
+                state['history'] = (state.get('history', []) + [entry])[-HISTORY_LIMIT:]
+                save_artifact(state, self.config.state_path, fmt=FORMAT_JSON, indent=True)
+            self.metrics.save(self.config.root_dir)
+
+            logger.info(f"Model trainer ({entry['mode']}): {self.config.metric}={scores[self.config.metric]:.4f}, "
+                        f"{entry.get('rows_new', 0)} new of {len(y_train)} training rows")
+            return entry
+        except Exception as e:
+            logger.error(f"Error during model training: {e}")
+            raise CustomException(e, sys)
@@ -0,0 +1,199 @@
+
+import sys
+import time
+import shutil
+import hashlib
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.model_selection import StratifiedKFold
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_entity.config_params import DataTransformationConfig, ModelEvaluationConfig
+from src.discounting.components.c_03_data_transformation import DataTransformation
+from src.discounting.components.c_04_model_trainer import LOWER_IS_BETTER, build_estimator, evaluate_model
+from src.discounting.utils.artifact_io import FORMAT_JSON, load_artifact, save_artifact
+from src.discounting.utils.artifact_store import file_lock, hash_file
+from src.discounting.utils.commons import save_bin
+from src.discounting.utils.metrics import StageMetrics
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def _lock_path(fold_dir: Path) -> Path:
+    return fold_dir.with_name(f"{fold_dir.name}.lock")
+
+
+def _fold_path(fold_dir: Path, fold: int, name: str) -> Path:
+    return fold_dir / f"fold_{fold}_{name}.npy"
+
+
+def _transform_fold(transformation_config: DataTransformationConfig, X, y, train_index, valid_index,
+                    fold_dir: Path, fold: int) -> int:
+    """Fit a preprocessor on the fold's training rows and save both sides of the fold."""
+    preprocessor = DataTransformation(transformation_config).get_transformer_object()
+    X_train = preprocessor.fit_transform(X.iloc[train_index])
+    X_valid = preprocessor.transform(X.iloc[valid_index])
+    for name, array in (('X_train', X_train), ('X_valid', X_valid),
+                        ('y_train', y[train_index]), ('y_valid', y[valid_index])):
+        save_bin(np.ascontiguousarray(array), _fold_path(fold_dir, fold, name))
+    return int(X_train.shape[1])
+
+
+def _fit_and_score(fold_dir: Path, fold: int, candidate: dict) -> dict:
+    """Fit one candidate on one cached fold; runs in a worker process."""
+    # Memory-mapped: workers share the page cache instead of copies of the folds
+    X_train, y_train, X_valid, y_valid = (
+        np.load(_fold_path(fold_dir, fold, name), mmap_mode='r')
+        for name in ('X_train', 'y_train', 'X_valid', 'y_valid')
+    )
+    model = build_estimator(candidate['estimator'], candidate['params'])
+    # Parallelism is across fits, not inside them
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=1)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    return {'fold': fold, 'fit_seconds': fit_seconds, 'scores': evaluate_model(model, X_valid, y_valid)}
+
+
+class CrossValidator:
+    """
+    k-fold cross-validation of the candidate models on the training split.
+
+    The preprocessor is fitted once per fold (on that fold's training rows, so
+    nothing leaks from the validation rows) and the transformed folds are
+    cached on disk as .npy files, keyed by the validated data and the
+    transformation settings. Every (candidate, fold) fit then runs in its own
+    worker process, memory-mapping the fold it needs, so a run costs the
+    model fits only, and repeated runs over the same data skip the transforms.
+    """
+    def __init__(self, config: ModelEvaluationConfig, transformation_config: DataTransformationConfig):
+        self.config = config
+        self.transformation = DataTransformation(transformation_config)
+        self.metrics = StageMetrics("model_evaluation")
+
+    def _cache_key(self) -> str:
+        transformation = self.transformation.config
+        digest = hashlib.sha256(hash_file(transformation.data_path).encode())
+        for value in (transformation.numerical_cols, transformation.categorical_cols, transformation.target_col,
+                      transformation.id_column, transformation.test_size, transformation.random_state,
+                      self.config.n_splits, self.config.random_state,
+                      sorted(self.transformation.selected_columns or [])):
+            digest.update(repr(value).encode())
+        return digest.hexdigest()[:16]
+
+    @contextmanager
+    def cached_folds(self) -> Iterator[Path]:
+        """
+        The directory of the cached fold arrays, building them if needed. The
+        folds are held under a shared lock for the duration of the block, so
+        another run does not prune them while they are memory-mapped.
+        """
+        cache_root = Path(self.config.cache_dir)
+        fold_dir = cache_root / self._cache_key()
+        with ExitStack() as stack:
+            with file_lock(str(cache_root) + '.lock'):
+                if (fold_dir / MANIFEST_FILE).exists():
+                    logger.info(f"Reusing cached CV folds: {fold_dir}")
+                else:
+                    self._build_folds(fold_dir)
+                    logger.info(f"CV folds cached: {fold_dir}")
+                # Taken before the cache lock is released: a pruning run cannot slip in between
+                stack.enter_context(file_lock(_lock_path(fold_dir), shared=True))
+                self._prune_folds(cache_root, fold_dir)
+            yield fold_dir
+
+    def _build_folds(self, fold_dir: Path) -> None:
+        with self.metrics.track("fold_transforms") as step:
+            X_train, _, y_train, _, _ = self.transformation.load_split()
+            folds = StratifiedKFold(n_splits=self.config.n_splits, shuffle=True,
+                                    random_state=self.config.random_state).split(X_train, y_train)
+            if fold_dir.exists():
+                shutil.rmtree(fold_dir)
+            fold_dir.mkdir(parents=True)
+            n_features = Parallel(n_jobs=self.config.n_jobs)(
+                delayed(_transform_fold)(self.transformation.config, X_train, y_train, train_index, valid_index,
+                                         fold_dir, fold)
+                for fold, (train_index, valid_index) in enumerate(folds)
+            )
+            step.rows_in = len(y_train)
+            step.extra['n_features_out'] = n_features
+
+        # Written last: marks the folds complete
+        save_artifact({'created_at': datetime.now().isoformat(), 'rows': int(len(y_train)),
+                       'n_splits': self.config.n_splits, 'n_features_out': n_features},
+                      fold_dir / MANIFEST_FILE, fmt=FORMAT_JSON)
+
+    def _prune_folds(self, cache_root: Path, fold_dir: Path) -> None:
+        " Remove the folds of older data, unless another run is fitting on them"
+        for stale in cache_root.iterdir():
+            if stale == fold_dir or not stale.is_dir():
+                continue
+            try:
+                with file_lock(_lock_path(stale), blocking=False):
+                    shutil.rmtree(stale, ignore_errors=True)
+            except BlockingIOError:
+                logger.info(f"CV folds {stale} are in use, kept")
+                continue
+            # Fold locks are only taken under the cache lock, which is held here
+            _lock_path(stale).unlink(missing_ok=True)
+
+    def _summarise(self, candidate: dict, results: List[dict]) -> dict:
+        metric = self.config.metric
+        results = sorted(results, key=lambda result: result['fold'])
+        values = np.array([result['scores'][metric] for result in results])
+        return {
+            'name': candidate['name'],
+            'estimator': candidate['estimator'],
+            'params': candidate['params'],
+            'mean': float(values.mean()),
+            'std': float(values.std()),
+            'mean_fit_seconds': float(np.mean([result['fit_seconds'] for result in results])),
+            'folds': results,
+        }
+
+    def evaluate(self) -> Dict:
+        """Cross-validate every candidate and save the ranked results."""
+        try:
+            candidates = self.config.candidates
+            with self.cached_folds() as fold_dir:
+                n_splits = load_artifact(fold_dir / MANIFEST_FILE, fmt=FORMAT_JSON)['n_splits']
+                with self.metrics.track("fits") as step:
+                    tasks = [(candidate, fold) for candidate in candidates for fold in range(n_splits)]
+                    results = Parallel(n_jobs=self.config.n_jobs)(
+                        delayed(_fit_and_score)(fold_dir, fold, candidate) for candidate, fold in tasks
+                    )
+                    step.extra['fits'] = len(tasks)
+
+            by_candidate = {candidate['name']: [] for candidate in candidates}
+            for (candidate, _), result in zip(tasks, results):
+                by_candidate[candidate['name']].append(result)
+            ranking = sorted(
+                (self._summarise(candidate, by_candidate[candidate['name']]) for candidate in candidates),
+                key=lambda summary: summary['mean'], reverse=self.config.metric not in LOWER_IS_BETTER,
+            )
+
+            report = {
+                'evaluated_at': datetime.now().isoformat(),
+                'metric': self.config.metric,
+                'n_splits': n_splits,
+                'folds': str(fold_dir),
+                'best': {key: ranking[0][key] for key in ('name', 'estimator', 'params', 'mean', 'std')},
+                'candidates': ranking,
+            }
+            save_artifact(report, self.config.results_path, fmt=FORMAT_JSON, indent=True)
+            self.metrics.save(self.config.root_dir)
+
+            best = report['best']
+            logger.info(f"Best CV candidate: {best['name']} ({best['estimator']}), "
+                        f"{self.config.metric}={best['mean']:.4f} +/- {best['std']:.4f}")
+            return report
+        except Exception as e:
+            logger.error(f"Error during cross-validation: {e}")
+            raise CustomException(e, sys)
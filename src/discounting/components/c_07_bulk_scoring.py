@@ -0,0 +1,268 @@
+
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+import pandas as pd
+from pymongo import UpdateOne
+
+# Custom modules
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_entity.config_params import BulkScoringConfig
+from src.discounting.data_source.mongo import MongoDBConnection
+from src.discounting.pipelines.pip_07_prediction_pipeline import PredictionPipeline
+from src.discounting.components.c_08_discount_engine import DiscountEngine
+from src.discounting.utils.artifact_io import FORMAT_JSON, append_record, history_path, save_artifact
+
+
+class DiscountOutcomes:
+    """
+    Running totals of a bulk scoring run: the score distribution, how often
+    each discount on the grid is recommended, and the expected revenue against
+    offering no discount. Each scored batch is folded in with a couple of
+    bincounts, so the summary is a few hundred numbers whatever the
+    collection size; the monitoring dashboard reads it instead of the scores.
+    """
+    def __init__(self, score_bins: int, grid: Optional[np.ndarray] = None):
+        self.score_counts = np.zeros(score_bins, dtype=np.int64)
+        self.grid = grid
+        self.discount_counts = np.zeros(len(grid), dtype=np.int64) if grid is not None else None
+        self.totals = {'rows': 0, 'score_sum': 0.0, 'discounted_rows': 0, 'discount_sum': 0.0,
+                       'expected_revenue': 0.0, 'baseline_revenue': 0.0}
+        self._lock = threading.Lock()
+
+    def add(self, scores: np.ndarray, recommendations: Optional[pd.DataFrame] = None) -> None:
+        bins = len(self.score_counts)
+        score_counts = np.bincount(np.clip((scores * bins).astype(np.int64), 0, bins - 1), minlength=bins)
+        batch = {'rows': len(scores), 'score_sum': float(scores.sum())}
+        discount_counts = None
+        if recommendations is not None and self.discount_counts is not None:
+            discounts = recommendations['recommended_discount'].to_numpy()
+            discount_counts = np.bincount(recommendations['grid_index'].to_numpy(), minlength=len(self.grid))
+            batch.update({
+                'discounted_rows': int(np.count_nonzero(discounts > 0)),
+                'discount_sum': float(discounts.sum()),
+                'expected_revenue': float(recommendations['expected_revenue'].sum()),
+                'baseline_revenue': float(recommendations['baseline_revenue'].sum()),
+            })
+        # Partitions are scored in parallel threads
+        with self._lock:
+            self.score_counts += score_counts
+            if discount_counts is not None:
+                self.discount_counts += discount_counts
+            for key, value in batch.items():
+                self.totals[key] += value
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            totals = dict(self.totals)
+            rows = totals['rows']
+            summary = {
+                **totals,
+                'mean_score': totals['score_sum'] / rows if rows else None,
+                'score_histogram': {
+                    'edges': np.linspace(0.0, 1.0, len(self.score_counts) + 1).round(6).tolist(),
+                    'counts': self.score_counts.tolist(),
+                },
+            }
+            if self.discount_counts is not None:
+                summary.update({
+                    'mean_discount': totals['discount_sum'] / rows if rows else None,
+                    'discounted_share': totals['discounted_rows'] / rows if rows else None,
+                    'revenue_uplift': totals['expected_revenue'] - totals['baseline_revenue'],
+                    'discounts': {'values': self.grid.tolist(), 'counts': self.discount_counts.tolist()},
+                })
+            return summary
+
+
+class BulkScoring:
+    """
+    Scores every reservation matching the configured query and writes the
+    results back to the same collection.
+
+    Documents are streamed from the cursor `batch_size` at a time, so memory is
+    bounded by `batch_size * num_partitions` documents whatever the collection size.
+    The run's score and discount distributions are summarised as it goes (see
+    DiscountOutcomes) and saved to `summary_path`.
+    """
+    def __init__(
+            self,
+            config: BulkScoringConfig,
+            prediction_pipeline: PredictionPipeline,
+            discount_engine: Optional[DiscountEngine] = None,
+            ):
+        self.config = config
+        self.prediction_pipeline = prediction_pipeline
+        self.discount_engine = discount_engine
+        self.mongo_connection = MongoDBConnection(
+            self.config.mongo_uri,
+            self.config.database_name,
+            self.config.collection_name
+        )
+
+    def score_collection(self) -> Dict[str, int]:
+        start_time = time.time()
+        start_timestamp = datetime.now()
+        try:
+            logger.info("Starting bulk scoring...")
+            # The model version is fixed for the whole run, see _score_partition
+            self.prediction_pipeline.refresh_if_promoted()
+            self.outcomes = DiscountOutcomes(
+                self.config.score_bins,
+                self.discount_engine.grid if self.discount_engine is not None else None,
+            )
+            with self.mongo_connection as collection:
+                partitions = self._partition_filters(collection)
+                if len(partitions) == 1:
+                    results = [self._score_partition(collection, partitions[0], 0)]
+                else:
+                    with ThreadPoolExecutor(max_workers=len(partitions)) as executor:
+                        results = list(executor.map(
+                            lambda args: self._score_partition(collection, *args),
+                            [(query, index) for index, query in enumerate(partitions)]
+                        ))
+
+            totals = {key: sum(result[key] for result in results) for key in results[0]}
+            self._save_metadata(start_time, start_timestamp, totals, len(partitions))
+            self._save_summary(start_timestamp)
+            self.prediction_pipeline.save_metrics()
+            logger.info(f"Bulk scoring completed successfully: {totals}")
+            return totals
+        except Exception as e:
+            logger.error(f"Error during bulk scoring: {e}")
+            raise CustomException(e, sys)
+
+    def _partition_filters(self, collection) -> List[dict]:
+        """
+        Split the query into `num_partitions` contiguous `_id` ranges of roughly
+        equal size using `$bucketAuto`, so partitions can be scanned in parallel
+        without overlapping.
+        """
+        try:
+            query = self.config.query
+            num_partitions = self.config.num_partitions
+            if num_partitions <= 1:
+                return [query]
+
+            buckets = list(collection.aggregate([
+                {'$match': query},
+                {'$bucketAuto': {'groupBy': '$_id', 'buckets': num_partitions}},
+            ], allowDiskUse=True))
+            if len(buckets) <= 1:
+                return [query]
+
+            filters = []
+            for index, bucket in enumerate(buckets):
+                upper_op = '$lte' if index == len(buckets) - 1 else '$lt'
+                id_range = {'$gte': bucket['_id']['min'], upper_op: bucket['_id']['max']}
+                filters.append({'$and': [query, {'_id': id_range}]})
+            logger.info(f"Bulk scoring split into {len(filters)} partitions")
+            return filters
+        except Exception as e:
+            logger.error(f"Error partitioning collection: {e}")
+            raise CustomException(e, sys)
+
+    def _iter_batches(self, collection, query: dict) -> Iterator[pd.DataFrame]:
+        batch_size = self.config.batch_size
+        projection = {col: 1 for col in self.config.feature_columns}
+        cursor = collection.find(query, projection).batch_size(batch_size)
+
+        documents = []
+        for document in cursor:
+            documents.append(document)
+            if len(documents) >= batch_size:
+                yield pd.DataFrame(documents)
+                documents = []
+        if documents:
+            yield pd.DataFrame(documents)
+
+    def _score_partition(self, collection, query: dict, partition: int) -> Dict[str, int]:
+        try:
+            counts = {'scored': 0, 'matched': 0, 'modified': 0, 'upserted': 0}
+            for batch in self._iter_batches(collection, query):
+                features = batch.reindex(columns=self.config.feature_columns)
+                # Pinned at the start of the run: a promotion mid-run must not mix model versions
+                scores = self.prediction_pipeline.predict(features, use_cache=False, refresh=False)
+                recommendations = None
+                if self.discount_engine is not None:
+                    recommendations = self.discount_engine.recommend(scores, features)
+                operations = self._build_updates(batch, scores, recommendations)
+                self.outcomes.add(scores, recommendations)
+
+                result = collection.bulk_write(operations, ordered=False)
+                counts['scored'] += len(operations)
+                counts['matched'] += result.matched_count
+                counts['modified'] += result.modified_count
+                counts['upserted'] += result.upserted_count
+                logger.info(f"Partition {partition}: {counts['scored']} reservations scored")
+            return counts
+        except Exception as e:
+            logger.error(f"Error scoring partition {partition}: {e}")
+            raise CustomException(e, sys)
+
+    def _build_updates(self, batch: pd.DataFrame, scores: np.ndarray,
+                       recommendations: Optional[pd.DataFrame] = None) -> List[UpdateOne]:
+        scored_at = datetime.now()
+        model_version = self.prediction_pipeline.model_version
+        updates = [
+            {
+                self.config.score_field: float(score),
+                self.config.model_version_field: model_version,
+                'scored_at': scored_at,
+            }
+            for score in scores
+        ]
+        if recommendations is not None:
+            discounts = recommendations['recommended_discount'].to_numpy()
+            for update, discount in zip(updates, discounts):
+                update[self.config.discount_field] = float(discount)
+
+        return [
+            UpdateOne({'_id': document_id}, {'$set': update}, upsert=True)
+            for document_id, update in zip(batch['_id'], updates)
+        ]
+
+    def _save_metadata(self, start_time: float, start_timestamp: datetime, totals: Dict[str, int], num_partitions: int):
+        try:
+            metadata = {
+                'start_time': start_timestamp.isoformat(),
+                'end_time': datetime.now().isoformat(),
+                'duration_seconds': time.time() - start_time,
+                'data_source': self.config.collection_name,
+                'model_version': self.prediction_pipeline.model_version,
+                'num_partitions': num_partitions,
+                **totals,
+            }
+            metadata_path = Path(self.config.root_dir) / "bulk-scoring-metadata.json"
+            save_artifact(metadata, metadata_path, fmt=FORMAT_JSON, indent=True)
+            logger.info("Bulk scoring metadata saved successfully.")
+        except Exception as e:
+            logger.error(f"Error saving bulk scoring metadata: {e}")
+            raise CustomException(e, sys)
+
+    def _save_summary(self, start_timestamp: datetime):
+        """Save the run's DiscountOutcomes, and a line of headline figures to its history."""
+        if not self.config.summary_path:
+            return
+        try:
+            summary = {
+                'start_time': start_timestamp.isoformat(),
+                'end_time': datetime.now().isoformat(),
+                'model_version': self.prediction_pipeline.model_version,
+                **self.outcomes.to_dict(),
+            }
+            save_artifact(summary, self.config.summary_path, fmt=FORMAT_JSON, indent=True)
+            append_record(history_path(self.config.summary_path), {
+                key: summary.get(key) for key in ('end_time', 'model_version', 'rows', 'mean_score', 'mean_discount',
+                                                  'discounted_share', 'expected_revenue', 'baseline_revenue',
+                                                  'revenue_uplift')
+            })
+            logger.info(f"Discount outcome summary saved to {self.config.summary_path}")
+        except Exception as e:
+            logger.error(f"Error saving the discount outcome summary: {e}")
+            raise CustomException(e, sys)
@@ -0,0 +1,142 @@
+
+import sys
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+
+# Custom modules
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_entity.config_params import DiscountEngineConfig
+
+
+class DiscountEngine:
+    """
+    Turns cancellation scores into a recommended discount per reservation.
+
+    For every candidate discount `d` on the grid the expected revenue per night is
+
+        p(d) = score * exp(-elasticity * response * d)
+        revenue(d) = (1 - p(d)) * adr * (1 - d) + p(d) * rebook_probability * adr
+
+    where `response` scales the elasticity by deposit type, lead time and, when
+    configured, hotel and customer type. The objective is evaluated as one
+    (reservations x grid) matrix per chunk of `chunk_size` rows and the arg-max
+    is taken along the grid axis.
+    """
+    def __init__(self, config: DiscountEngineConfig):
+        self.config = config
+        self.grid = np.round(
+            np.arange(config.grid_min, config.grid_max + config.grid_step / 2, config.grid_step),
+            6
+        )
+
+    def response(
+            self,
+            lead_time: np.ndarray,
+            deposit_type: np.ndarray,
+            hotel: Optional[np.ndarray] = None,
+            customer_type: Optional[np.ndarray] = None,
+            ) -> np.ndarray:
+        " Per-reservation multiplier on the elasticity"
+        deposit_response = self._map_response(deposit_type, self.config.deposit_type_response,
+                                              self.config.default_deposit_response)
+        lead_factor = np.clip(np.asarray(lead_time, dtype=np.float64) / self.config.lead_time_scale, 0.0, 1.0)
+        response = deposit_response * (1.0 + self.config.lead_time_weight * lead_factor)
+
+        for column, values in (('hotel', hotel), ('customer_type', customer_type)):
+            mapping = self.config.segment_response.get(column)
+            if values is not None and mapping:
+                response = response * self._map_response(values, mapping, 1.0)
+        return response
+
+    @staticmethod
+    def _map_response(values: np.ndarray, mapping: dict, default: float) -> np.ndarray:
+        return (
+            pd.Series(values, dtype='object')
+            .map(mapping)
+            .fillna(default)
+            .to_numpy(dtype=np.float64)
+        )
+
+    def optimize(
+            self,
+            scores: np.ndarray,
+            adr: np.ndarray,
+            response: np.ndarray,
+            ) -> Dict[str, np.ndarray]:
+        """
+        Evaluate the revenue objective over the discount grid.
+
+        Args:
+            scores: Cancellation probability per reservation.
+            adr: Average daily rate per reservation.
+            response: Elasticity multiplier per reservation, see `response`.
+
+        Returns:
+            Dict of arrays: recommended discount and its position on the grid,
+            expected revenue at that discount, expected revenue without a discount
+            and the adjusted cancellation probability.
+        """
+        try:
+            scores = np.clip(np.asarray(scores, dtype=np.float64), 0.0, 1.0)
+            adr = np.asarray(adr, dtype=np.float64)
+            response = np.asarray(response, dtype=np.float64)
+            n_rows = len(scores)
+
+            grid = self.grid[np.newaxis, :]
+            kept_price = 1.0 - grid
+            rebook = self.config.rebook_probability
+
+            best_index = np.empty(n_rows, dtype=np.intp)
+            best_revenue = np.empty(n_rows, dtype=np.float64)
+            best_probability = np.empty(n_rows, dtype=np.float64)
+
+            for start in range(0, n_rows, self.config.chunk_size):
+                stop = min(start + self.config.chunk_size, n_rows)
+                p0 = scores[start:stop, np.newaxis]
+                rate = adr[start:stop, np.newaxis]
+                elasticity = self.config.elasticity * response[start:stop, np.newaxis]
+
+                probability = p0 * np.exp(-elasticity * grid)
+                revenue = rate * ((1.0 - probability) * kept_price + probability * rebook)
+
+                index = revenue.argmax(axis=1)
+                rows = np.arange(stop - start)
+                best_index[start:stop] = index
+                best_revenue[start:stop] = revenue[rows, index]
+                best_probability[start:stop] = probability[rows, index]
+
+            baseline_revenue = adr * ((1.0 - scores) + scores * rebook)
+            return {
+                'recommended_discount': self.grid[best_index],
+                'grid_index': best_index,
+                'expected_revenue': best_revenue,
+                'baseline_revenue': baseline_revenue,
+                'adjusted_cancellation_prob': best_probability,
+            }
+        except Exception as e:
+            logger.error(f"Error optimizing discounts: {e}")
+            raise CustomException(e, sys)
+
+    def recommend(self, scores: np.ndarray, reservations: pd.DataFrame) -> pd.DataFrame:
+        """
+        Recommend a discount for each reservation.
+
+        Args:
+            scores: Cancellation probabilities from the prediction pipeline.
+            reservations: Frame with at least `adr`, `lead_time` and `deposit_type`
+                (plus optional `hotel` and `customer_type`), aligned with `scores`.
+        """
+        try:
+            response = self.response(
+                reservations['lead_time'].to_numpy(),
+                reservations['deposit_type'].to_numpy(),
+                hotel=reservations['hotel'].to_numpy() if 'hotel' in reservations else None,
+                customer_type=reservations['customer_type'].to_numpy() if 'customer_type' in reservations else None,
+            )
+            result = self.optimize(scores, reservations['adr'].to_numpy(), response)
+            return pd.DataFrame(result, index=reservations.index)
+        except Exception as e:
+            logger.error(f"Error recommending discounts: {e}")
+            raise CustomException(e, sys)
@@ -0,0 +1,214 @@
+
+import os
+import sys
+import json
+import hashlib
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+# Custom modules
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_entity.config_params import DiscountTableConfig
+from src.discounting.components.c_08_discount_engine import DiscountEngine
+from src.discounting.serving.cache import model_version
+from src.discounting.utils.artifact_io import FORMAT_JSON, FORMAT_NPY, load_artifact, save_artifact
+from src.discounting.utils.artifact_store import file_lock
+
+# Order of the table axes
+CATEGORICAL_AXES = ['hotel', 'customer_type', 'deposit_type']
+
+
+def _bin_index(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    " Map values to bins of `edges`, clipping out-of-range values into the end bins"
+    index = np.searchsorted(edges, np.asarray(values, dtype=np.float64), side='right') - 1
+    return np.clip(index, 0, len(edges) - 2)
+
+
+def _category_index(values, categories: List[str]) -> np.ndarray:
+    " Map labels to their position; unknown labels go to the trailing 'other' slot"
+    lookup = {category: position for position, category in enumerate(categories)}
+    return (
+        pd.Series(np.atleast_1d(values), dtype='object')
+        .map(lookup)
+        .fillna(len(categories))
+        .to_numpy(dtype=np.intp)
+    )
+
+
+class DiscountTableBuilder:
+    """
+    Offline step that evaluates the discount engine once for every cell of
+    binned (score, adr, lead_time, hotel, customer_type, deposit_type) and
+    stores the winning grid position as a compact uint8/uint16 `.npy` array
+    plus a JSON index with the bin edges, categories and discount grid. Each
+    build writes a new `<table stem>.<version>.npy`, named by the index.
+    """
+    def __init__(self, config: DiscountTableConfig, discount_engine: DiscountEngine):
+        self.config = config
+        self.discount_engine = discount_engine
+
+    def config_digest(self) -> str:
+        " Hash of every setting the table's contents depend on: the engine's and the binning"
+        engine = {key: value for key, value in asdict(self.discount_engine.config).items()
+                  if key not in ('root_dir', 'chunk_size')}
+        table = {key: getattr(self.config, key)
+                 for key in ('score_bins', 'adr_edges', 'lead_time_edges', 'categories')}
+        payload = json.dumps({'engine': engine, 'table': table}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def build(self) -> Path:
+        try:
+            logger.info("Building discount lookup table...")
+            score_edges = np.linspace(0.0, 1.0, self.config.score_bins + 1)
+            adr_edges = np.asarray(self.config.adr_edges, dtype=np.float64)
+            lead_time_edges = np.asarray(self.config.lead_time_edges, dtype=np.float64)
+
+            # Representative value of each numeric bin is its midpoint
+            numeric_axes = [(edges[:-1] + edges[1:]) / 2 for edges in (score_edges, adr_edges, lead_time_edges)]
+            # Each categorical axis carries one extra 'other' slot (None -> default response)
+            categorical_axes = [
+                np.array(list(self.config.categories[column]) + [None], dtype=object)
+                for column in CATEGORICAL_AXES
+            ]
+            axes = numeric_axes + categorical_axes
+            shape = tuple(len(axis) for axis in axes)
+
+            mesh = np.meshgrid(*[np.arange(n) for n in shape], indexing='ij')
+            flat = [axis[index.ravel()] for axis, index in zip(axes, mesh)]
+            scores, adr, lead_time, hotel, customer_type, deposit_type = flat
+
+            response = self.discount_engine.response(lead_time, deposit_type, hotel=hotel, customer_type=customer_type)
+            grid_index = self.discount_engine.optimize(scores, adr, response)['grid_index']
+
+            dtype = np.uint8 if len(self.discount_engine.grid) <= np.iinfo(np.uint8).max else np.uint16
+            table = grid_index.astype(dtype).reshape(shape)
+
+            index = {
+                'score_edges': score_edges.tolist(),
+                'adr_edges': adr_edges.tolist(),
+                'lead_time_edges': lead_time_edges.tolist(),
+                'categories': {column: list(self.config.categories[column]) for column in CATEGORICAL_AXES},
+                'discount_grid': self.discount_engine.grid.tolist(),
+                'shape': list(shape),
+                'model_version': model_version(self.config.preprocessor_path, self.config.model_path)
+                if os.path.exists(self.config.model_path) else None,
+                'config_digest': self.config_digest(),
+                'built_at': datetime.now().isoformat(),
+            }
+            table_path = self._write(table, index)
+            logger.info(f"Discount lookup table built: shape={shape}, {table.nbytes} bytes")
+            return table_path
+        except Exception as e:
+            logger.error(f"Error building discount lookup table: {e}")
+            raise CustomException(e, sys)
+
+    def _write(self, table: np.ndarray, index: Dict) -> Path:
+        """
+        The table goes to a new versioned file named by the index, and the index
+        is then swapped in with a single rename: readers always load a table
+        together with the index it was built with.
+        """
+        table_path = Path(self.config.table_path)
+        index_path = Path(self.config.index_path)
+        with file_lock(index_path.with_name(f".{index_path.name}.lock")):
+            previous = load_artifact(index_path).get('table_file') if index_path.exists() else None
+            version = datetime.now().strftime('%Y%m%d%H%M%S%f')
+            versioned_path = table_path.with_name(f"{table_path.stem}.{version}{table_path.suffix}")
+            save_artifact(table, versioned_path, fmt=FORMAT_NPY)
+            save_artifact({**index, 'table_file': versioned_path.name}, index_path, fmt=FORMAT_JSON, indent=True)
+
+            # The previous table is kept for readers that loaded its index just before the swap;
+            # an unversioned table is left over from before tables were versioned
+            stale_paths = [*table_path.parent.glob(f"{table_path.stem}.*{table_path.suffix}"), table_path]
+            for stale_path in stale_paths:
+                if stale_path.exists() and stale_path.name not in (versioned_path.name, previous):
+                    stale_path.unlink()
+        return versioned_path
+
+
+class DiscountLookup:
+    """
+    Online side of the lookup table: the table is memory-mapped and each
+    decision is a handful of `searchsorted` calls plus one array read.
+    """
+    def __init__(self, config: DiscountTableConfig, builder: Optional[DiscountTableBuilder] = None):
+        self.config = config
+        self.builder = builder
+        self.table = None
+        self.index = None
+
+    def load(self) -> "DiscountLookup":
+        try:
+            if self.builder is not None and self._needs_build():
+                self.builder.build()
+            self.index = load_artifact(self.config.index_path)
+            self.table = load_artifact(self._table_path(self.index), mmap_mode='r')
+
+            self._score_edges = np.asarray(self.index['score_edges'])
+            self._adr_edges = np.asarray(self.index['adr_edges'])
+            self._lead_time_edges = np.asarray(self.index['lead_time_edges'])
+            self._grid = np.asarray(self.index['discount_grid'])
+            logger.info(f"Discount lookup table loaded from {self._table_path(self.index)}")
+            return self
+        except Exception as e:
+            logger.error(f"Error loading discount lookup table: {e}")
+            raise CustomException(e, sys)
+
+    def _table_path(self, index: Dict) -> Path:
+        " The versioned table file `index` was written with"
+        return Path(self.config.table_path).parent / index['table_file']
+
+    def _needs_build(self) -> bool:
+        """
+        True when the table is missing, or was built for another model version
+        or other discount engine / binning settings.
+        """
+        if not os.path.exists(self.config.index_path):
+            return True
+        index = load_artifact(self.config.index_path)
+        if 'table_file' not in index or not self._table_path(index).exists():
+            return True
+        if index.get('config_digest') != self.builder.config_digest():
+            return True
+        if not os.path.exists(self.config.model_path):
+            return False
+        return index.get('model_version') != model_version(self.config.preprocessor_path, self.config.model_path)
+
+    def rebuild(self, *_) -> None:
+        " Rebuild the table if it is stale, and reload it; registered as a model-promotion hook"
+        if self.builder is None:
+            raise CustomException("DiscountLookup has no builder to rebuild the table with", sys)
+        self.load()
+
+    def lookup_many(self, scores, adr, lead_time, hotel, customer_type, deposit_type) -> np.ndarray:
+        " Vectorized lookup of the recommended discount for aligned arrays"
+        if self.table is None:
+            self.load()
+        cell = (
+            _bin_index(scores, self._score_edges),
+            _bin_index(adr, self._adr_edges),
+            _bin_index(lead_time, self._lead_time_edges),
+            _category_index(hotel, self.index['categories']['hotel']),
+            _category_index(customer_type, self.index['categories']['customer_type']),
+            _category_index(deposit_type, self.index['categories']['deposit_type']),
+        )
+        return self._grid[self.table[cell]]
+
+    def lookup(self, score: float, adr: float, lead_time: float, hotel: str, customer_type: str, deposit_type: str) -> float:
+        " Recommended discount for a single quote"
+        return float(self.lookup_many([score], [adr], [lead_time], [hotel], [customer_type], [deposit_type])[0])
+
+    def recommend(self, scores: np.ndarray, reservations: pd.DataFrame) -> np.ndarray:
+        return self.lookup_many(
+            scores,
+            reservations['adr'].to_numpy(),
+            reservations['lead_time'].to_numpy(),
+            reservations['hotel'].to_numpy(),
+            reservations['customer_type'].to_numpy(),
+            reservations['deposit_type'].to_numpy(),
+        )
@@ -0,0 +1,358 @@
+
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_entity.config_params import DriftMonitorConfig
+from src.discounting.utils.artifact_io import FORMAT_JSON, append_record, history_path, load_artifact, save_artifact
+from src.discounting.utils.artifact_store import file_lock
+from src.discounting.utils.metrics import StageMetrics
+
+SMOOTHING = 1e-4
+
+
+class DriftSketch:
+    """
+    Mergeable summary of a stream of reservations: per numerical column a
+    fixed-bin histogram (bin edges taken from the reference data) plus a
+    missing count, and per categorical column a frequency table over the
+    reference categories with one slot for everything else.
+
+    Counts only ever add up, so sketches of separate batches can be merged and
+    a sketch never needs the raw rows again.
+    """
+    def __init__(self, numerical_cols: List[str], cuts: np.ndarray, categorical_cols: List[str],
+                 categories: Dict[str, List[str]]):
+        self.numerical_cols = list(numerical_cols)
+        self.cuts = np.asarray(cuts, dtype=np.float64).reshape(len(self.numerical_cols), -1)
+        self.categorical_cols = list(categorical_cols)
+        self.categories = {col: list(categories[col]) for col in self.categorical_cols}
+        self.rows = 0
+        self.numeric_counts = np.zeros((len(self.numerical_cols), self.cuts.shape[1] + 1), dtype=np.int64)
+        self.numeric_missing = np.zeros(len(self.numerical_cols), dtype=np.int64)
+        self.categorical_counts = {
+            col: np.zeros(len(self.categories[col]) + 1, dtype=np.int64) for col in self.categorical_cols
+        }
+
+    @classmethod
+    def from_sample(cls, sample: pd.DataFrame, numerical_cols: List[str], categorical_cols: List[str],
+                    bins: int, max_categories: int) -> "DriftSketch":
+        """Empty sketch whose bins are the quantiles, and categories the most frequent values, of `sample`."""
+        quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+        cuts = np.vstack([
+            np.nanquantile(sample[col].to_numpy(dtype=np.float64), quantiles) for col in numerical_cols
+        ]) if numerical_cols else np.zeros((0, bins - 1))
+        categories = {
+            col: [str(value) for value in sample[col].value_counts().index[:max_categories]]
+            for col in categorical_cols
+        }
+        return cls(numerical_cols, cuts, categorical_cols, categories)
+
+    def empty_like(self) -> "DriftSketch":
+        return DriftSketch(self.numerical_cols, self.cuts, self.categorical_cols, self.categories)
+
+    def update(self, df: pd.DataFrame) -> "DriftSketch":
+        """Add the rows of `df` to the counts."""
+        self.rows += len(df)
+        n_bins = self.cuts.shape[1] + 1
+        for position, col in enumerate(self.numerical_cols):
+            values = df[col].to_numpy(dtype=np.float64)
+            missing = np.isnan(values)
+            self.numeric_missing[position] += int(missing.sum())
+            bin_index = np.searchsorted(self.cuts[position], values[~missing], side='right')
+            self.numeric_counts[position] += np.bincount(bin_index, minlength=n_bins)
+        for col in self.categorical_cols:
+            categories = self.categories[col]
+            codes = pd.Categorical(df[col].astype(str), categories=categories).codes.astype(np.int64)
+            codes[codes < 0] = len(categories)
+            self.categorical_counts[col] += np.bincount(codes, minlength=len(categories) + 1)
+        return self
+
+    def merge(self, other: "DriftSketch") -> "DriftSketch":
+        self.rows += other.rows
+        self.numeric_counts += other.numeric_counts
+        self.numeric_missing += other.numeric_missing
+        for col in self.categorical_cols:
+            self.categorical_counts[col] += other.categorical_counts[col]
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            'rows': self.rows,
+            'numerical_cols': self.numerical_cols,
+            'cuts': self.cuts.tolist(),
+            'numeric_counts': self.numeric_counts.tolist(),
+            'numeric_missing': self.numeric_missing.tolist(),
+            'categorical_cols': self.categorical_cols,
+            'categories': self.categories,
+            'categorical_counts': {col: counts.tolist() for col, counts in self.categorical_counts.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DriftSketch":
+        sketch = cls(data['numerical_cols'], np.asarray(data['cuts']), data['categorical_cols'], data['categories'])
+        sketch.rows = data['rows']
+        sketch.numeric_counts = np.asarray(data['numeric_counts'], dtype=np.int64).reshape(sketch.numeric_counts.shape)
+        sketch.numeric_missing = np.asarray(data['numeric_missing'], dtype=np.int64)
+        sketch.categorical_counts = {
+            col: np.asarray(counts, dtype=np.int64) for col, counts in data['categorical_counts'].items()
+        }
+        return sketch
+
+
+def _distribution(counts: np.ndarray) -> np.ndarray:
+    counts = counts.astype(np.float64) + SMOOTHING
+    return counts / counts.sum(axis=-1, keepdims=True)
+
+
+def population_stability_index(reference: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """PSI between histograms along the last axis, for any number of columns at once."""
+    p, q = _distribution(reference), _distribution(current)
+    return np.sum((q - p) * np.log(q / p), axis=-1)
+
+
+def binned_ks(reference: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """Kolmogorov-Smirnov statistic on the binned CDFs along the last axis."""
+    p, q = _distribution(reference), _distribution(current)
+    return np.max(np.abs(np.cumsum(p, axis=-1) - np.cumsum(q, axis=-1)), axis=-1)
+
+
+class DriftMonitor:
+    """
+    Compares incoming reservations with the training data.
+
+    The reference sketch summarises the rows the champion model learned from
+    and is stored with it: the model trainer builds it at a full refit and
+    recounts it, on the same bins, after an incremental update. Ingestion and
+    prediction batches are added to a pending sketch in memory (`update`),
+    which `flush` merges into the shared current sketch on disk under a file
+    lock. Ingested rows are keyed by their hashed reservation ID, and a
+    ledger of the keys already sketched (plus the trainer's ledger of trained
+    rows) keeps each reservation out of every window but its first. `check`
+    scores the current sketch against the reference in O(columns x bins),
+    without touching raw data.
+    """
+    def __init__(self, config: DriftMonitorConfig):
+        self.config = config
+        self.reference: Optional[DriftSketch] = None
+        self.pending: Optional[DriftSketch] = None
+        self.pending_keys: List[np.ndarray] = []
+        self._lock = threading.Lock()
+        self.metrics = StageMetrics("drift_monitor")
+
+    def _reference_source(self) -> Optional[str]:
+        # An isolated run reads the promoted champion's reference until it writes its own
+        for path in (self.config.reference_path, self.config.champion_reference_path):
+            if path and Path(path).exists():
+                return path
+        return None
+
+    @property
+    def has_reference(self) -> bool:
+        return self.reference is not None or self._reference_source() is not None
+
+    def _iter_parquet(self, path: str) -> Iterator[pd.DataFrame]:
+        import pyarrow.parquet as pq
+        columns = self.config.numerical_cols + self.config.categorical_cols
+        parquet_file = pq.ParquetFile(path)
+        if self.config.id_column and self.config.id_column in parquet_file.schema_arrow.names:
+            columns = columns + [self.config.id_column]
+        for batch in parquet_file.iter_batches(batch_size=self.config.batch_size, columns=columns):
+            yield batch.to_pandas()
+
+    def _row_keys(self, df: pd.DataFrame) -> Optional[np.ndarray]:
+        # Same hashing as the transformation's training row keys
+        if not self.config.id_column or self.config.id_column not in df.columns:
+            return None
+        return pd.util.hash_pandas_object(df[self.config.id_column], index=False).to_numpy()
+
+    def _load_keys(self, path: Optional[str]) -> np.ndarray:
+        if path and Path(path).exists():
+            return load_artifact(path)
+        return np.empty(0, dtype=np.uint64)
+
+    def training_rows(self) -> Iterator[pd.DataFrame]:
+        """
+        The validated rows the champion has learned from: those whose key is
+        in the trainer's ledger. Without row keys every validated row is used.
+        """
+        trained = self._load_keys(self.config.trained_keys_path)
+        if len(trained) == 0:
+            logger.warning("No ledger of trained rows, the drift reference covers all validated rows")
+        for batch in self._iter_parquet(self.config.reference_data_path):
+            keys = self._row_keys(batch)
+            if keys is not None and len(trained):
+                batch = batch[np.isin(keys, trained)]
+            yield batch
+
+    def build_reference(self, batches: Optional[Callable[[], Iterable[pd.DataFrame]]] = None,
+                        keep_bins: bool = False) -> DriftSketch:
+        """
+        Build and save the reference sketch. `batches` returns an iterable of
+        DataFrames (by default `training_rows`) and is called twice: bin edges
+        come from the first `reference_sample_rows` rows, counts from a full
+        pass. With `keep_bins` an existing reference keeps its bins and
+        categories and only the counts are redone, so reports before and after
+        an incremental update stay comparable.
+        """
+        try:
+            batches = batches or self.training_rows
+            if keep_bins and self.has_reference:
+                sketch = self.load_reference().empty_like()
+            else:
+                with self.metrics.track("reference_bins") as step:
+                    sample, sampled = [], 0
+                    for batch in batches():
+                        sample.append(batch)
+                        sampled += len(batch)
+                        if sampled >= self.config.reference_sample_rows:
+                            break
+                    sample = pd.concat(sample, ignore_index=True).iloc[:self.config.reference_sample_rows]
+                    sketch = DriftSketch.from_sample(
+                        sample, self.config.numerical_cols, self.config.categorical_cols,
+                        self.config.bins, self.config.max_categories
+                    )
+                    step.rows_in = len(sample)
+            with self.metrics.track("reference_counts") as step:
+                for batch in batches():
+                    sketch.update(batch)
+                step.rows_in = sketch.rows
+
+            save_artifact(sketch.to_dict(), self.config.reference_path, fmt=FORMAT_JSON)
+            self.reference = sketch
+            logger.info(f"Drift reference built from {sketch.rows} rows: {self.config.reference_path}")
+            return sketch
+        except Exception as e:
+            logger.error(f"Error building drift reference: {e}")
+            raise CustomException(e, sys)
+
+    def load_reference(self) -> DriftSketch:
+        if self.reference is None:
+            path = self._reference_source()
+            if path is None:
+                raise FileNotFoundError(f"No drift reference at {self.config.reference_path}")
+            self.reference = DriftSketch.from_dict(load_artifact(path, fmt=FORMAT_JSON))
+        return self.reference
+
+    def update(self, df: pd.DataFrame, row_keys: Optional[np.ndarray] = None) -> None:
+        """
+        Add a batch of reservations (an ingestion or prediction batch) to the
+        pending sketch; `row_keys` go into the ledger on `flush`.
+        """
+        try:
+            with self._lock:
+                if self.pending is None:
+                    self.pending = self.load_reference().empty_like()
+                self.pending.update(df)
+                if row_keys is not None:
+                    self.pending_keys.append(row_keys)
+        except Exception as e:
+            logger.error(f"Error updating drift sketch: {e}")
+            raise CustomException(e, sys)
+
+    def update_from_parquet(self, path: str) -> None:
+        """
+        Add the rows of an ingested file not seen before, read one row group
+        slice at a time. Rows without a reservation ID cannot be told apart
+        and are all added.
+        """
+        with self.metrics.track("update", rows_in=0) as step:
+            with file_lock(f"{self.config.current_path}.lock"):
+                seen = np.union1d(self._load_keys(self.config.ledger_path),
+                                  self._load_keys(self.config.trained_keys_path))
+            added = 0
+            for batch in self._iter_parquet(path):
+                step.rows_in += len(batch)
+                keys = self._row_keys(batch)
+                if keys is not None:
+                    new = ~np.isin(keys, seen)
+                    batch, keys = batch[new], keys[new]
+                self.update(batch, keys)
+                added += len(batch)
+            step.rows_out = added
+        logger.info(f"{added} new of {step.rows_in} ingested rows added to the drift sketch")
+
+    def _load_current(self) -> DriftSketch:
+        if Path(self.config.current_path).exists():
+            return DriftSketch.from_dict(load_artifact(self.config.current_path, fmt=FORMAT_JSON))
+        return self.load_reference().empty_like()
+
+    def flush(self) -> None:
+        """Merge the pending sketch into the current sketch on disk."""
+        try:
+            with self._lock:
+                pending, self.pending = self.pending, None
+                pending_keys, self.pending_keys = self.pending_keys, []
+            if pending is None or pending.rows == 0:
+                return
+            with file_lock(f"{self.config.current_path}.lock"):
+                current = self._load_current().merge(pending)
+                save_artifact(current.to_dict(), self.config.current_path, fmt=FORMAT_JSON)
+                if pending_keys:
+                    ledger = np.union1d(self._load_keys(self.config.ledger_path), np.concatenate(pending_keys))
+                    save_artifact(ledger, self.config.ledger_path)
+        except Exception as e:
+            logger.error(f"Error flushing drift sketch: {e}")
+            raise CustomException(e, sys)
+
+    def check(self, reset: bool = False) -> dict:
+        """
+        Score the current sketch against the reference and save the report.
+        With `reset`, the current sketch starts empty afterwards, so the next
+        check covers a new window.
+        """
+        try:
+            self.flush()
+            reference = self.load_reference()
+            with file_lock(f"{self.config.current_path}.lock"):
+                current = self._load_current()
+                if reset and Path(self.config.current_path).exists():
+                    Path(self.config.current_path).unlink()
+
+            with self.metrics.track("check", rows_in=current.rows):
+                columns = {}
+                if reference.numerical_cols:
+                    psi = population_stability_index(reference.numeric_counts, current.numeric_counts)
+                    ks = binned_ks(reference.numeric_counts, current.numeric_counts)
+                    for position, col in enumerate(reference.numerical_cols):
+                        columns[col] = {'psi': float(psi[position]), 'ks': float(ks[position])}
+                for col in reference.categorical_cols:
+                    psi = population_stability_index(reference.categorical_counts[col], current.categorical_counts[col])
+                    columns[col] = {'psi': float(psi)}
+
+                for col, scores in columns.items():
+                    if current.rows == 0:
+                        scores['status'] = 'no_data'
+                    elif scores['psi'] >= self.config.psi_alert or scores.get('ks', 0) >= self.config.ks_alert:
+                        scores['status'] = 'drift'
+                    elif scores['psi'] >= self.config.psi_warning:
+                        scores['status'] = 'warning'
+                    else:
+                        scores['status'] = 'ok'
+
+            report = {
+                'checked_at': datetime.now().isoformat(),
+                'reference_rows': reference.rows,
+                'current_rows': current.rows,
+                'drifted_columns': [col for col, scores in columns.items() if scores['status'] == 'drift'],
+                'columns': columns,
+            }
+            save_artifact(report, self.config.report_path, fmt=FORMAT_JSON, indent=True)
+            append_record(history_path(self.config.report_path), {
+                key: report[key] for key in ('checked_at', 'current_rows', 'drifted_columns')
+            } | {'psi': {col: scores['psi'] for col, scores in columns.items()}})
+            if report['drifted_columns']:
+                logger.warning(f"Data drift detected in {report['drifted_columns']}, see {self.config.report_path}")
+            else:
+                logger.info(f"No data drift over {current.rows} rows")
+            return report
+        except Exception as e:
+            logger.error(f"Error checking data drift: {e}")
+            raise CustomException(e, sys)
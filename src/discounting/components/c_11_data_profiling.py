@@ -0,0 +1,252 @@
+
+import sys
+import html
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_entity.config_params import DataProfilingConfig
+from src.discounting.utils.artifact_io import FORMAT_JSON, FORMAT_TEXT, save_artifact
+from src.discounting.utils.metrics import StageMetrics, file_size
+
+NUMERIC_SCHEMA_DTYPES = {'int64', 'float64'}
+
+
+class QuantileSketch:
+    """
+    Bottom-k sample of a numeric stream: every value gets a uniform random key
+    and the `size` values with the smallest keys are kept, which is a uniform
+    sample of everything seen. Quantiles of the sample estimate those of the
+    stream with a rank error of about 1 / sqrt(size).
+    """
+    def __init__(self, size: int, seed: int = 0):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.values = np.empty(0, dtype=np.float64)
+        self.keys = np.empty(0, dtype=np.float64)
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.concatenate([self.values, values])
+        keys = np.concatenate([self.keys, self.rng.random(len(values) - len(self.values))])
+        if len(values) > self.size:
+            keep = np.argpartition(keys, self.size)[:self.size]
+            values, keys = values[keep], keys[keep]
+        self.values, self.keys = values, keys
+
+    def quantiles(self, probabilities: List[float]) -> Dict[str, Optional[float]]:
+        if not len(self.values):
+            return {str(p): None for p in probabilities}
+        return {str(p): float(q) for p, q in zip(probabilities, np.quantile(self.values, probabilities))}
+
+
+class DataProfiler:
+    """
+    Per-column profile of a Parquet dataset, replacing full ydata-profiling
+    runs on large extracts.
+
+    Each column is summarised by its own task, reading only that column one
+    row-group batch at a time, so the whole file is read once and memory stays
+    bounded by the batch size. Columns are profiled in parallel threads
+    (Parquet decoding and the NumPy reductions release the GIL). Pairwise
+    correlations are computed on a uniform row sample.
+    """
+    def __init__(self, config: DataProfilingConfig):
+        self.config = config
+        self.metrics = StageMetrics("data_profiling")
+
+    def _batches(self, columns: List[str]):
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(self.config.data_path)
+        for batch in parquet_file.iter_batches(batch_size=self.config.batch_size, columns=columns):
+            yield batch
+
+    def _profile_numeric(self, column: str, position: int) -> dict:
+        count = nulls = zeros = 0
+        total = total_sq = 0.0
+        minimum, maximum = np.inf, -np.inf
+        sketch = QuantileSketch(self.config.sketch_size, seed=self.config.random_state + position)
+        for batch in self._batches([column]):
+            values = batch.column(0).to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+            missing = np.isnan(values)
+            nulls += int(missing.sum())
+            values = values[~missing]
+            if not len(values):
+                continue
+            count += len(values)
+            zeros += int((values == 0).sum())
+            total += float(values.sum())
+            total_sq += float(np.dot(values, values))
+            minimum, maximum = min(minimum, float(values.min())), max(maximum, float(values.max()))
+            sketch.update(values)
+
+        mean = total / count if count else None
+        # Sample variance, as pandas reports it
+        variance = max(total_sq - count * mean * mean, 0.0) / max(count - 1, 1) if count else None
+        return {
+            'kind': 'numeric',
+            'count': count,
+            'nulls': nulls,
+            'zeros': zeros,
+            'min': minimum if count else None,
+            'max': maximum if count else None,
+            'mean': mean,
+            'std': float(np.sqrt(variance)) if count else None,
+            'quantiles': sketch.quantiles(self.config.quantiles),
+        }
+
+    def _profile_categorical(self, column: str) -> dict:
+        count = nulls = 0
+        counts = pd.Series(dtype=np.int64)
+        truncated = False
+        for batch in self._batches([column]):
+            values = batch.column(0).to_pandas()
+            nulls += int(values.isna().sum())
+            batch_counts = values.value_counts(dropna=True)
+            count += int(batch_counts.sum())
+            counts = counts.add(batch_counts, fill_value=0)
+            if len(counts) > self.config.max_tracked_categories:
+                # Long tail: keep the most frequent values so memory stays bounded
+                counts = counts.nlargest(self.config.max_tracked_categories)
+                truncated = True
+
+        counts = counts[counts > 0]  # categorical columns report unused categories
+        top = counts.nlargest(self.config.top_k)
+        return {
+            'kind': 'categorical',
+            'count': count,
+            'nulls': nulls,
+            'distinct': len(counts),
+            'distinct_is_lower_bound': truncated,
+            'top': {str(value): int(frequency) for value, frequency in top.items()},
+        }
+
+    def _correlations(self, columns: List[str], total_rows: int) -> Dict[str, Dict[str, float]]:
+        if len(columns) < 2 or not total_rows:
+            return {}
+        rng = np.random.default_rng(self.config.random_state)
+        rate = min(1.0, self.config.correlation_sample_rows / total_rows)
+        sample = []
+        for batch in self._batches(columns):
+            frame = batch.to_pandas()
+            sample.append(frame[rng.random(len(frame)) < rate])
+        sample = pd.concat(sample, ignore_index=True).astype(np.float64)
+        corr = sample.corr(method=self.config.correlation_method).round(4)
+        return {col: {other: (None if pd.isna(value) else float(value)) for other, value in row.items()}
+                for col, row in corr.to_dict(orient='index').items()}
+
+    def profile(self) -> dict:
+        """Profile every schema column present in the file and write the JSON and HTML reports."""
+        try:
+            import pyarrow.parquet as pq
+            start = datetime.now()
+            metadata = pq.ParquetFile(self.config.data_path).metadata
+            total_rows = metadata.num_rows
+            present = set(metadata.schema.to_arrow_schema().names)
+            schema = self.config.all_schema
+            columns = [col for col in schema if col in present]
+            numeric = [col for col in columns if schema[col] in NUMERIC_SCHEMA_DTYPES]
+
+            with self.metrics.track("profile", rows_in=total_rows) as step:
+                with ThreadPoolExecutor(max_workers=self.config.num_workers) as pool:
+                    futures = {
+                        col: pool.submit(self._profile_numeric, col, position) if col in numeric
+                        else pool.submit(self._profile_categorical, col)
+                        for position, col in enumerate(columns)
+                    }
+                    correlations = pool.submit(self._correlations, numeric, total_rows)
+                    column_profiles = {col: future.result() for col, future in futures.items()}
+                    for col, profile in column_profiles.items():
+                        profile['schema_dtype'] = schema[col]
+                    correlations = correlations.result()
+                step.bytes_read = file_size(self.config.data_path)
+                step.extra['columns'] = len(columns)
+
+            report = {
+                'dataset': {
+                    'path': str(self.config.data_path),
+                    'rows': total_rows,
+                    'row_groups': metadata.num_row_groups,
+                    'columns': len(columns),
+                    'missing_schema_columns': [col for col in schema if col not in present],
+                    'unexpected_columns': sorted(present - set(schema)),
+                    'profiled_at': start.isoformat(),
+                    'seconds': (datetime.now() - start).total_seconds(),
+                },
+                'columns': column_profiles,
+                'correlations': correlations,
+            }
+
+            with self.metrics.track("report") as step:
+                save_artifact(report, self.config.report_json, fmt=FORMAT_JSON, indent=True)
+                save_artifact(render_html(report), self.config.report_html, fmt=FORMAT_TEXT)
+                step.bytes_written = (file_size(self.config.report_json) or 0) + (file_size(self.config.report_html) or 0)
+            self.metrics.save(self.config.root_dir)
+
+            logger.info(f"Profiled {len(columns)} columns over {total_rows} rows "
+                        f"in {report['dataset']['seconds']:.2f}s: {self.config.report_html}")
+            return report
+        except Exception as e:
+            logger.error(f"Error profiling {self.config.data_path}: {e}")
+            raise CustomException(e, sys)
+
+
+def _cell(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    return html.escape(str(value))
+
+
+def render_html(report: dict) -> str:
+    """A single self-contained page: dataset summary, one table per column kind, correlations."""
+    dataset = report['dataset']
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Data profile</title>",
+        "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin-bottom:2em}"
+        "td,th{border:1px solid #ccc;padding:4px 8px;text-align:right}th{background:#f3f3f3}"
+        "td:first-child{text-align:left}</style></head><body>",
+        f"<h1>Data profile</h1><p>{_cell(dataset['path'])}: {dataset['rows']} rows, "
+        f"{dataset['columns']} columns, profiled in {dataset['seconds']:.2f}s</p>",
+    ]
+    if dataset['missing_schema_columns'] or dataset['unexpected_columns']:
+        parts.append(f"<p>Missing schema columns: {_cell(dataset['missing_schema_columns'])}; "
+                     f"unexpected columns: {_cell(dataset['unexpected_columns'])}</p>")
+
+    numeric = {col: p for col, p in report['columns'].items() if p['kind'] == 'numeric'}
+    if numeric:
+        quantiles = list(next(iter(numeric.values()))['quantiles'])
+        header = ['column', 'count', 'nulls', 'zeros', 'min', 'mean', 'std', 'max'] + [f"p{q}" for q in quantiles]
+        parts.append("<h2>Numerical columns</h2><table><tr>" + "".join(f"<th>{h}</th>" for h in header) + "</tr>")
+        for col, p in numeric.items():
+            row = [col, p['count'], p['nulls'], p['zeros'], p['min'], p['mean'], p['std'], p['max']]
+            row += [p['quantiles'][q] for q in quantiles]
+            parts.append("<tr>" + "".join(f"<td>{_cell(v)}</td>" for v in row) + "</tr>")
+        parts.append("</table>")
+
+    categorical = {col: p for col, p in report['columns'].items() if p['kind'] == 'categorical'}
+    if categorical:
+        parts.append("<h2>Categorical columns</h2><table><tr><th>column</th><th>count</th><th>nulls</th>"
+                     "<th>distinct</th><th>most frequent</th></tr>")
+        for col, p in categorical.items():
+            distinct = f"&ge;{p['distinct']}" if p['distinct_is_lower_bound'] else p['distinct']
+            top = ", ".join(f"{_cell(value)} ({frequency})" for value, frequency in p['top'].items())
+            parts.append(f"<tr><td>{_cell(col)}</td><td>{p['count']}</td><td>{p['nulls']}</td>"
+                         f"<td>{distinct}</td><td style='text-align:left'>{top}</td></tr>")
+        parts.append("</table>")
+
+    correlations = report['correlations']
+    if correlations:
+        columns = list(correlations)
+        parts.append("<h2>Correlations (sample)</h2><table><tr><th></th>"
+                     + "".join(f"<th>{_cell(col)}</th>" for col in columns) + "</tr>")
+        for col in columns:
+            parts.append(f"<tr><td>{_cell(col)}</td>"
+                         + "".join(f"<td>{_cell(correlations[col][other])}</td>" for other in columns) + "</tr>")
+        parts.append("</table>")
+
+    parts.append("</body></html>")
+    return "\n".join(parts)
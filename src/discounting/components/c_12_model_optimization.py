@@ -0,0 +1,155 @@
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_entity.config_params import ModelOptimizationConfig
+from src.discounting.components.c_04_model_trainer import LOWER_IS_BETTER, evaluate_probabilities
+from src.discounting.serving.compiled_trees import (
+    CompiledTrees, artifact_stamp, compile_model, ensemble_trees, prune, quantize,
+)
+from src.discounting.utils.artifact_io import FORMAT_JSON, load_artifact, save_artifact
+from src.discounting.utils.commons import load_object
+from src.discounting.utils.metrics import StageMetrics
+
+
+def _sklearn_tree_bytes(trees: list) -> int:
+    """Memory held by sklearn's node and value arrays."""
+    return sum(tree.__getstate__()['nodes'].nbytes + tree.value.nbytes for tree in trees)
+
+
+class ModelOptimizer:
+    """
+    Post-training compression of the tree ensemble served by prediction.
+
+    Starting from the compiled (array) form of the trained model:
+
+    - trees: a forest keeps the `keep_trees_fraction` trees that score best
+      on their own on `selection_rows` rows of the training split; boosting
+      keeps its first stages,
+    - features: splits on features below `min_feature_importance` (share of
+      the model's impurity-based importance) are replaced by their child that
+      saw more training samples, and the nodes this cuts off are dropped,
+    - precision: thresholds are stored as `threshold_dtype`, leaf values as
+      `leaf_bits` integer codes, node indices in the smallest integer types.
+
+    The compact model is written only if its holdout metric is within
+    `max_metric_drop` of the trained model's. The holdout is used for nothing
+    else, so that check is not biased by the choice of trees.
+    """
+    def __init__(self, config: ModelOptimizationConfig):
+        self.config = config
+        self.metrics = StageMetrics("model_optimization")
+
+    def _kept_trees(self, kind: str, compiled: CompiledTrees) -> np.ndarray:
+        n_keep = max(1, int(np.ceil(compiled.n_trees * self.config.keep_trees_fraction)))
+        if n_keep >= compiled.n_trees:
+            return np.arange(compiled.n_trees)
+        if kind == 'boosting':
+            # Later stages correct the earlier ones, so only a prefix stands on its own
+            return np.arange(n_keep)
+        X, y = self._selection_slice()
+        tree_scores = np.array([
+            evaluate_probabilities(y, probabilities)[self.config.metric]
+            for probabilities in compiled.leaf_values(X).T
+        ])
+        order = np.argsort(tree_scores if self.config.metric in LOWER_IS_BETTER else -tree_scores, kind='stable')
+        return np.sort(order[:n_keep])
+
+    def _selection_slice(self) -> Tuple[np.ndarray, np.ndarray]:
+        " A seeded sample of the training split to rank trees on"
+        X_train = load_artifact(self.config.x_train_path, mmap_mode='r')
+        y_train = load_artifact(self.config.y_train_path).iloc[:, 0].to_numpy()
+        n_rows = min(self.config.selection_rows, len(y_train))
+        rows = np.sort(np.random.RandomState(self.config.random_state).choice(len(y_train), n_rows, replace=False))
+        return np.asarray(X_train[rows]), y_train[rows]
+
+    def _collapsed_splits(self, model, trees: list, compiled: CompiledTrees) -> Tuple[np.ndarray, np.ndarray, list]:
+        pruned_features = []
+        if self.config.min_feature_importance > 0:
+            pruned_features = np.flatnonzero(model.feature_importances_ < self.config.min_feature_importance).tolist()
+        is_split = compiled.left != np.arange(compiled.n_nodes)
+        on_pruned = is_split & np.isin(compiled.feature, pruned_features)
+        # Follow the child that more training samples went to
+        weights = np.concatenate([tree.weighted_n_node_samples for tree in trees])
+        left_heavier = weights[compiled.left] >= weights[compiled.right]
+        return on_pruned & left_heavier, on_pruned & ~left_heavier, pruned_features
+
+    def _score(self, predictor, X: np.ndarray, y: np.ndarray) -> dict:
+        return evaluate_probabilities(y, predictor.predict_proba(X)[:, 1])
+
+    def optimize(self) -> dict:
+        """Build, validate and save the compact model; returns the report."""
+        try:
+            compact_path = Path(self.config.compact_model_path)
+            model = load_object(self.config.model_path)
+            X_test = load_artifact(self.config.x_test_path, mmap_mode='r')
+            y_test = load_artifact(self.config.y_test_path).iloc[:, 0].to_numpy()
+            report = {'optimized_at': datetime.now().isoformat(), 'model': type(model).__name__,
+                      'metric': self.config.metric}
+
+            ensemble = ensemble_trees(model)
+            if ensemble is None:
+                compact_path.unlink(missing_ok=True)
+                report['status'] = 'unsupported'
+                logger.info(f"{type(model).__name__} is not a tree ensemble, nothing to optimize")
+                save_artifact(report, self.config.report_path, fmt=FORMAT_JSON, indent=True)
+                return report
+            kind, trees = ensemble
+
+            with self.metrics.track("compress", rows_in=len(y_test)) as step:
+                compiled = compile_model(model)
+                kept_trees = self._kept_trees(kind, compiled)
+                go_left, go_right, pruned_features = self._collapsed_splits(model, trees, compiled)
+                compact = quantize(prune(compiled, kept_trees, go_left, go_right),
+                                   threshold_dtype=self.config.threshold_dtype, leaf_bits=self.config.leaf_bits)
+                compact.source = artifact_stamp(self.config.model_path)
+                step.extra['nodes'] = [compiled.n_nodes, compact.n_nodes]
+
+            with self.metrics.track("validate", rows_in=len(y_test)):
+                original_scores = self._score(model, X_test, y_test)
+                compact_scores = self._score(compact, X_test, y_test)
+                gap = original_scores[self.config.metric] - compact_scores[self.config.metric]
+                metric_drop = -gap if self.config.metric in LOWER_IS_BETTER else gap
+                used_features = np.unique(compact.feature[compact.left != np.arange(compact.n_nodes)])
+
+            accepted = metric_drop <= self.config.max_metric_drop
+            report.update({
+                'status': 'accepted' if accepted else 'rejected',
+                'metric_drop': float(metric_drop),
+                'max_metric_drop': self.config.max_metric_drop,
+                'settings': {'threshold_dtype': self.config.threshold_dtype, 'leaf_bits': self.config.leaf_bits,
+                             'keep_trees_fraction': self.config.keep_trees_fraction,
+                             'selection_rows': self.config.selection_rows,
+                             'min_feature_importance': self.config.min_feature_importance},
+                'original': {'scores': original_scores, 'trees': len(trees), 'nodes': compiled.n_nodes,
+                             'bytes': _sklearn_tree_bytes(trees), 'features': int(model.n_features_in_)},
+                'compact': {'scores': compact_scores, 'trees': compact.n_trees, 'nodes': compact.n_nodes,
+                            'bytes': compact.nbytes, 'features': int(len(used_features))},
+                'pruned_features': pruned_features,
+            })
+
+            with self.metrics.track("save") as step:
+                compact_path.unlink(missing_ok=True)
+                if accepted:
+                    # Uncompressed, so serving processes can memory-map the arrays
+                    save_artifact(compact, compact_path, compress=0)
+                save_artifact(report, self.config.report_path, fmt=FORMAT_JSON, indent=True)
+            self.metrics.save(self.config.root_dir)
+
+            message = (f"Compact model: {report['original']['bytes'] / 1e6:.2f} MB -> {compact.nbytes / 1e6:.2f} MB, "
+                       f"{self.config.metric} {original_scores[self.config.metric]:.4f} -> "
+                       f"{compact_scores[self.config.metric]:.4f}")
+            if accepted:
+                logger.info(f"{message}, saved to {compact_path}")
+            else:
+                logger.warning(f"{message}: drop above {self.config.max_metric_drop}, not saved")
+            return report
+        except Exception as e:
+            logger.error(f"Error optimizing the model: {e}")
+            raise CustomException(e, sys)
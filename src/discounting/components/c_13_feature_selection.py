@@ -0,0 +1,169 @@
+
+import sys
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.model_selection import train_test_split
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_entity.config_params import DataTransformationConfig, FeatureSelectionConfig
+from src.discounting.components.c_03_data_transformation import DataTransformation
+from src.discounting.components.c_04_model_trainer import LOWER_IS_BETTER, build_estimator, evaluate_model
+from src.discounting.utils.artifact_io import FORMAT_JSON, save_artifact
+from src.discounting.utils.metrics import StageMetrics
+
+
+def _gain(metric: str, before: float, after: float) -> float:
+    """How much better `before` is than `after` on `metric`."""
+    return after - before if metric in LOWER_IS_BETTER else before - after
+
+
+def _permutation_importance(preprocessor, model, X: pd.DataFrame, y: np.ndarray, column: str,
+                            n_repeats: int, metric: str, baseline: float, seed: int) -> float:
+    """Mean metric loss when `column` is shuffled, through the preprocessor and the model."""
+    rng = np.random.default_rng(seed)
+    values = X[column].array
+    losses = []
+    for _ in range(n_repeats):
+        shuffled = X.copy()
+        shuffled[column] = values.take(rng.permutation(len(values)))
+        score = evaluate_model(model, preprocessor.transform(shuffled), y)[metric]
+        losses.append(_gain(metric, baseline, score))
+    return float(np.mean(losses))
+
+
+def _output_columns(preprocessor) -> List[str]:
+    """The input column behind each output feature of a fitted transformer from get_transformer_object."""
+    sources = []
+    for name, transformer, columns in preprocessor.transformers_:
+        if name == 'remainder':
+            if transformer == 'passthrough':
+                sources.extend(preprocessor.feature_names_in_[columns])
+        elif name == 'cat':
+            categories = transformer.named_steps['onehot'].categories_
+            for column, values in zip(columns, categories):
+                sources.extend([column] * len(values))
+        else:
+            sources.extend(columns)
+    return sources
+
+
+class FeatureSelector:
+    """
+    Drops the input columns the model does not need.
+
+    A `validation_size` share of the training rows is set aside; the test
+    set is the trainer's holdout and is not used here. A model (the
+    configured estimator) is fitted on the remaining rows with all columns,
+    and every input column gets an importance: with `permutation`, the
+    validation metric lost when the column is shuffled (one parallel task per
+    column, through the preprocessor, so a one-hot encoded column is shuffled
+    as a whole); with `model`, the estimator's own importances summed over
+    the column's output features. Columns at or below `min_importance` are
+    dropped.
+
+    The model is then refitted on the kept columns. If its validation metric
+    is within `max_metric_drop` of the full model's, the selection is
+    accepted: the data transformation keeps only those columns from then on
+    (numerical, categorical and passthrough alike).
+    """
+    def __init__(self, config: FeatureSelectionConfig, transformation_config: DataTransformationConfig):
+        self.config = config
+        self.transformation = DataTransformation(transformation_config)
+        # Importances are measured over every column, whatever was selected before
+        self.transformation.select_columns(None)
+        self.metrics = StageMetrics("feature_selection")
+
+    def _fit(self, columns, X_train: pd.DataFrame, y_train: np.ndarray):
+        self.transformation.select_columns(columns)
+        preprocessor = self.transformation.get_transformer_object()
+        X_transformed = preprocessor.fit_transform(X_train if columns is None else X_train[columns])
+        model = build_estimator(self.config.estimator, self.config.params)
+        model.fit(X_transformed, y_train)
+        return preprocessor, model
+
+    def _importances(self, preprocessor, model, X_val: pd.DataFrame, y_val: np.ndarray) -> Dict[str, float]:
+        columns = list(X_val.columns)
+        if self.config.method == 'model':
+            weights = getattr(model, 'feature_importances_', None)
+            if weights is None:
+                weights = np.abs(np.ravel(model.coef_))
+            importances = pd.Series(weights, index=_output_columns(preprocessor)).groupby(level=0).sum()
+            importances = importances / importances.sum()
+            return {col: float(importances.get(col, 0.0)) for col in columns}
+
+        sample = X_val.sample(n=min(self.config.max_rows, len(X_val)), random_state=self.config.random_state)
+        y_sample = y_val[X_val.index.get_indexer(sample.index)]
+        baseline = evaluate_model(model, preprocessor.transform(sample), y_sample)[self.config.metric]
+        # Parallelism is across columns, not inside the model
+        if 'n_jobs' in model.get_params():
+            model.set_params(n_jobs=1)
+        losses = Parallel(n_jobs=self.config.n_jobs)(
+            delayed(_permutation_importance)(preprocessor, model, sample, y_sample, col, self.config.n_repeats,
+                                             self.config.metric, baseline, self.config.random_state + position)
+            for position, col in enumerate(columns)
+        )
+        return dict(zip(columns, losses))
+
+    def select(self) -> dict:
+        """Score the columns, validate the pruned set and save the selection."""
+        try:
+            metric = self.config.metric
+            X_train, _, y_train, _, _ = self.transformation.load_split()
+            X_fit, X_val, y_fit, y_val = train_test_split(
+                X_train, y_train, test_size=self.config.validation_size, stratify=y_train,
+                random_state=self.config.random_state
+            )
+
+            with self.metrics.track("full_model", rows_in=len(y_fit)):
+                preprocessor, model = self._fit(None, X_fit, y_fit)
+                full_scores = evaluate_model(model, preprocessor.transform(X_val), y_val)
+                n_features_full = len(preprocessor.get_feature_names_out())
+
+            with self.metrics.track("importance", rows_in=min(self.config.max_rows, len(y_val))) as step:
+                importances = self._importances(preprocessor, model, X_val, y_val)
+                step.extra['columns'] = len(importances)
+
+            ranked = sorted(importances, key=importances.get, reverse=True)
+            selected = [col for col in ranked if importances[col] > self.config.min_importance] or ranked[:1]
+            selected = [col for col in X_train.columns if col in selected]
+
+            with self.metrics.track("reduced_model", rows_in=len(y_fit)):
+                reduced_preprocessor, reduced_model = self._fit(selected, X_fit, y_fit)
+                reduced_scores = evaluate_model(reduced_model, reduced_preprocessor.transform(X_val[selected]), y_val)
+                n_features_reduced = len(reduced_preprocessor.get_feature_names_out())
+
+            metric_drop = _gain(metric, full_scores[metric], reduced_scores[metric])
+            accepted = metric_drop <= self.config.max_metric_drop
+            selection = {
+                'selected_at': datetime.now().isoformat(),
+                'status': 'accepted' if accepted else 'rejected',
+                'method': self.config.method,
+                'metric': metric,
+                'metric_drop': float(metric_drop),
+                'max_metric_drop': self.config.max_metric_drop,
+                'selected_columns': selected,
+                'dropped_columns': [col for col in X_train.columns if col not in selected],
+                'importances': {col: importances[col] for col in ranked},
+                'full': {'scores': full_scores, 'columns': X_train.shape[1], 'features': n_features_full},
+                'reduced': {'scores': reduced_scores, 'columns': len(selected), 'features': n_features_reduced},
+            }
+            with self.metrics.track("save"):
+                save_artifact(selection, self.config.selected_features_path, fmt=FORMAT_JSON, indent=True)
+            self.metrics.save(self.config.root_dir)
+
+            message = (f"Feature selection: {X_train.shape[1]} -> {len(selected)} columns "
+                       f"({n_features_full} -> {n_features_reduced} features), "
+                       f"{metric} {full_scores[metric]:.4f} -> {reduced_scores[metric]:.4f}")
+            if accepted:
+                logger.info(f"{message}, applied from the next data transformation")
+            else:
+                logger.warning(f"{message}: drop above {self.config.max_metric_drop}, all columns kept")
+            return selection
+        except Exception as e:
+            logger.error(f"Error during feature selection: {e}")
+            raise CustomException(e, sys)
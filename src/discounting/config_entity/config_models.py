@@ -0,0 +1,576 @@
+
+from pathlib import PurePosixPath
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+# Typed, frozen views of the YAML files in config/. They are validated once
+# when a file is loaded and shared between ConfigurationManager instances,
+# which turn them into the per-stage dataclasses in config_params.py.
+
+
+class FrozenModel(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+
+# -------Data Ingestion ------------
+class DtypePlanSection(FrozenModel):
+    enabled: bool = True
+    categorical_max_unique: int = Field(256, gt=0)
+    categorical_max_ratio: float = Field(0.5, gt=0, le=1)
+
+
+class DataIngestionSection(FrozenModel):
+    root_dir: str
+    database_name: str
+    collection_name: str
+    batch_size: int = Field(gt=0)
+    id_column: Optional[str] = None
+    dtype_plan: DtypePlanSection = DtypePlanSection()
+
+
+class DataIngestionFile(FrozenModel):
+    artifacts_root: str
+    data_ingestion: DataIngestionSection
+
+
+# -------Data Validation -----
+class DataValidationSection(FrozenModel):
+    root_dir: str
+    data_dir: str
+    val_status: str
+    validated_data: str
+    all_schema: Dict[str, str]
+
+    @field_validator('all_schema', mode='before')
+    @classmethod
+    def _strip_dtypes(cls, value):
+        return {str(column).strip(): str(dtype).strip() for column, dtype in dict(value).items()}
+
+
+class DataValidationFile(FrozenModel):
+    artifact_root: str
+    data_validation: DataValidationSection
+
+
+# -------Data Transformation -----
+class DataTransformationSection(FrozenModel):
+    root_dir: str
+    data_path: str
+    random_state: int
+    target_col: str
+    test_size: float = Field(0.2, gt=0, lt=1)
+    preprocessor_max_age_days: float = Field(0, ge=0)
+    selected_features_path: Optional[str] = None
+    numerical_cols: List[str]
+    categorical_cols: List[str]
+
+    @field_validator('numerical_cols', 'categorical_cols', mode='before')
+    @classmethod
+    def _column_names(cls, entries):
+        # Also accepts the older `name : dtype` entries; dtypes come from all_schema
+        return [next(iter(entry)) if isinstance(entry, dict) else entry for entry in entries]
+
+
+class DataTransformationFile(FrozenModel):
+    artifacts_root: str
+    data_transformation: DataTransformationSection
+
+
+# -------Prediction -----
+class ServingSection(FrozenModel):
+    num_workers: int = Field(gt=0)
+    shared_artifacts_dir: str
+    mmap_mode: Optional[str] = None
+    compiled_max_rows: int = Field(256, ge=0)
+    use_compact_model: bool = False
+
+
+class CacheSection(FrozenModel):
+    enabled: bool = True
+    max_entries: int = Field(100000, gt=0)
+    ttl_seconds: float = Field(900.0, gt=0)
+
+
+class PredictionSection(FrozenModel):
+    root_dir: str
+    preprocessor_path: str
+    model_path: str
+    serving: ServingSection
+    compiled_model_path: Optional[str] = None
+    compact_model_path: Optional[str] = None
+    cache: CacheSection = CacheSection()
+
+
+class PredictionFile(FrozenModel):
+    artifacts_root: str
+    prediction: PredictionSection
+
+
+# -------Bulk Scoring -----
+class BulkScoringSection(FrozenModel):
+    root_dir: str
+    database_name: str
+    collection_name: str
+    batch_size: int = Field(gt=0)
+    num_partitions: int = Field(gt=0)
+    query: Dict = Field(default_factory=dict)
+    exclude_columns: List[str] = Field(default_factory=list)
+    score_field: str
+    discount_field: str
+    model_version_field: str
+    summary_path: Optional[str] = None
+    score_bins: int = Field(20, gt=0)
+
+
+class BulkScoringFile(FrozenModel):
+    artifacts_root: str
+    bulk_scoring: BulkScoringSection
+
+
+# -------Discount Engine and Lookup Table -----
+class GridSection(FrozenModel):
+    min: float = Field(ge=0)
+    max: float = Field(le=1)
+    step: float = Field(gt=0)
+
+
+class DiscountEngineSection(FrozenModel):
+    root_dir: str
+    grid: GridSection
+    elasticity: float = Field(ge=0)
+    lead_time_scale: float = Field(gt=0)
+    lead_time_weight: float
+    deposit_type_response: Dict[str, float]
+    default_deposit_response: float
+    segment_response: Dict[str, Dict[str, float]] = Field(default_factory=dict)
+    rebook_probability: float = Field(ge=0, le=1)
+    chunk_size: int = Field(gt=0)
+
+
+class DiscountTableSection(FrozenModel):
+    root_dir: str
+    table_path: str
+    index_path: str
+    score_bins: int = Field(gt=0)
+    adr_edges: List[float]
+    lead_time_edges: List[float]
+    categories: Dict[str, List[str]]
+
+
+class DiscountEngineFile(FrozenModel):
+    artifacts_root: str
+    discount_engine: DiscountEngineSection
+    discount_table: DiscountTableSection
+
+
+# -------Drift Monitor -----
+class DriftMonitorSection(FrozenModel):
+    root_dir: str
+    reference_data_path: str
+    reference_path: str
+    trained_keys_path: Optional[str] = None
+    current_data_path: str
+    current_path: str
+    ledger_path: str
+    report_path: str
+    numerical_cols: List[str] = Field(default_factory=list)
+    categorical_cols: List[str] = Field(default_factory=list)
+    bins: int = Field(20, ge=2)
+    max_categories: int = Field(50, gt=0)
+    reference_sample_rows: int = Field(200000, gt=0)
+    batch_size: int = Field(100000, gt=0)
+    psi_warning: float = Field(0.1, gt=0)
+    psi_alert: float = Field(0.25, gt=0)
+    ks_alert: float = Field(0.1, gt=0, le=1)
+    reset_after_check: bool = True
+
+
+class DriftMonitorFile(FrozenModel):
+    artifacts_root: str
+    drift_monitor: DriftMonitorSection
+
+
+# -------Data Profiling -----
+class DataProfilingSection(FrozenModel):
+    root_dir: str
+    data_path: str
+    report_json: str
+    report_html: str
+    num_workers: int = Field(4, gt=0)
+    batch_size: int = Field(200000, gt=0)
+    sketch_size: int = Field(100000, gt=0)
+    quantiles: List[float] = Field(default_factory=lambda: [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99])
+    top_k: int = Field(10, gt=0)
+    max_tracked_categories: int = Field(10000, gt=0)
+    correlation_sample_rows: int = Field(100000, gt=0)
+    correlation_method: Literal['pearson', 'spearman', 'kendall'] = 'pearson'
+    random_state: int = 42
+
+    @field_validator('quantiles')
+    @classmethod
+    def _probabilities(cls, quantiles):
+        if any(not 0 <= q <= 1 for q in quantiles):
+            raise ValueError(f"quantiles must be between 0 and 1: {quantiles}")
+        return quantiles
+
+
+class DataProfilingFile(FrozenModel):
+    artifacts_root: str
+    data_profiling: DataProfilingSection
+
+
+# -------Feature Store -----
+class FeatureStoreSection(FrozenModel):
+    root_dir: str
+    data_path: str
+    offline_path: str
+    online_path: str
+    entity_key: str
+    feature_columns: List[str] = Field(default_factory=list)
+    batch_size: int = Field(50000, gt=0)
+    mmap_size: int = Field(268435456, ge=0)
+
+
+class FeatureStoreFile(FrozenModel):
+    artifacts_root: str
+    feature_store: FeatureStoreSection
+
+
+# -------Model Trainer -----
+class IncrementalSection(FrozenModel):
+    enabled: bool = True
+    full_refit_every_days: float = Field(7, gt=0)
+    full_refit_every_runs: int = Field(14, gt=0)
+    new_estimators_per_update: int = Field(20, gt=0)
+    max_estimators: int = Field(600, gt=0)
+
+
+class ModelTrainerSection(FrozenModel):
+    root_dir: str
+    x_train_path: str
+    y_train_path: str
+    x_test_path: str
+    y_test_path: str
+    train_keys_path: str
+    preprocessor_path: str
+    model_path: str
+    compiled_model_path: Optional[str] = None
+    compiled_parity_tolerance: float = Field(1e-6, gt=0)
+    ledger_path: str
+    state_path: str
+    metric: Literal['roc_auc', 'log_loss', 'accuracy', 'f1'] = 'roc_auc'
+    incremental: IncrementalSection = IncrementalSection()
+
+
+class ModelTrainerFile(FrozenModel):
+    artifacts_root: str
+    model_trainer: ModelTrainerSection
+
+
+# The names in c_04_model_trainer.ESTIMATORS
+EstimatorName = Literal['random_forest', 'extra_trees', 'gradient_boosting', 'sgd', 'logistic_regression']
+
+
+class ModelParamsFile(FrozenModel):
+    estimator: EstimatorName
+    params: Dict[str, Dict] = Field(default_factory=dict)
+
+
+# -------Model Evaluation -----
+class CandidateSection(FrozenModel):
+    name: str
+    estimator: EstimatorName
+    params: Dict = Field(default_factory=dict)
+
+
+class ModelEvaluationSection(FrozenModel):
+    root_dir: str
+    cache_dir: str
+    results_path: str
+    n_splits: int = Field(5, ge=2)
+    n_jobs: int = -1
+    metric: Literal['roc_auc', 'log_loss', 'accuracy', 'f1'] = 'roc_auc'
+    random_state: int = 42
+    candidates: List[CandidateSection] = Field(min_length=1)
+
+    @field_validator('candidates')
+    @classmethod
+    def _unique_names(cls, candidates: List[CandidateSection]) -> List[CandidateSection]:
+        names = [candidate.name for candidate in candidates]
+        duplicated = sorted({name for name in names if names.count(name) > 1})
+        if duplicated:
+            raise ValueError(f"Duplicate candidate names: {duplicated}")
+        return candidates
+
+
+class ModelEvaluationFile(FrozenModel):
+    artifacts_root: str
+    model_evaluation: ModelEvaluationSection
+
+
+# -------Model Optimization -----
+class ModelOptimizationSection(FrozenModel):
+    root_dir: str
+    model_path: str
+    x_train_path: str
+    y_train_path: str
+    x_test_path: str
+    y_test_path: str
+    compact_model_path: str
+    report_path: str
+    metric: Literal['roc_auc', 'log_loss', 'accuracy', 'f1'] = 'roc_auc'
+    max_metric_drop: float = Field(0.002, ge=0)
+    threshold_dtype: Literal['float64', 'float32', 'float16'] = 'float32'
+    leaf_bits: Literal[0, 8, 16] = 8
+    keep_trees_fraction: float = Field(1.0, gt=0, le=1)
+    selection_rows: int = Field(5000, gt=0)
+    random_state: int = 42
+    min_feature_importance: float = Field(0.0, ge=0, lt=1)
+
+
+class ModelOptimizationFile(FrozenModel):
+    artifacts_root: str
+    model_optimization: ModelOptimizationSection
+
+
+# -------Feature Selection -----
+class FeatureSelectionSection(FrozenModel):
+    root_dir: str
+    selected_features_path: str
+    validation_size: float = Field(0.2, gt=0, lt=1)
+    method: Literal['permutation', 'model'] = 'permutation'
+    n_repeats: int = Field(3, gt=0)
+    max_rows: int = Field(5000, gt=0)
+    n_jobs: int = -1
+    metric: Literal['roc_auc', 'log_loss', 'accuracy', 'f1'] = 'roc_auc'
+    min_importance: float = Field(0.0005, ge=0)
+    max_metric_drop: float = Field(0.002, ge=0)
+    random_state: int = 42
+
+
+class FeatureSelectionFile(FrozenModel):
+    artifacts_root: str
+    feature_selection: FeatureSelectionSection
+
+
+# -------Dashboard -----
+class DashboardSection(FrozenModel):
+    refresh_seconds: float = Field(30, gt=0)
+    max_history: int = Field(500, gt=0)
+
+
+class DashboardFile(FrozenModel):
+    artifacts_root: str
+    dashboard: DashboardSection = DashboardSection()
+
+
+# -------Environment -----
+class ProfilingSection(FrozenModel):
+    enabled: bool = False
+    modes: List[str] = Field(default_factory=lambda: ['cprofile', 'sampling', 'memory'])
+    sampling_interval_ms: float = Field(5, gt=0)
+    tracemalloc_frames: int = Field(25, gt=0)
+
+
+class ArtifactStoreSection(FrozenModel):
+    root_dir: str = 'artifacts/store'
+    runs_dir: str = 'artifacts/runs'
+
+
+class EnvironmentFile(FrozenModel):
+    profiling: ProfilingSection = ProfilingSection()
+    artifact_store: ArtifactStoreSection = ArtifactStoreSection()
+
+
+# -------All stages -----
+NUMERIC_DTYPES = {'int64', 'float64'}
+INGESTED_DATA_FILE = 'hotel_reservations.parquet'
+PREPROCESSOR_FILE = 'preprocessor.joblib'
+
+
+def _same_path(left: str, right: str) -> bool:
+    return PurePosixPath(left) == PurePosixPath(right)
+
+
+class PipelineSettings(FrozenModel):
+    """
+    Every stage's configuration in one model, with the checks that span files:
+    column names agree with `all_schema`, and each stage reads the artifacts
+    the previous stage writes. All problems are reported together.
+    """
+    ingestion: DataIngestionFile
+    validation: DataValidationFile
+    transformation: DataTransformationFile
+    prediction: PredictionFile
+    bulk_scoring: BulkScoringFile
+    discount_engine: DiscountEngineFile
+    drift_monitor: Optional[DriftMonitorFile] = None
+    data_profiling: Optional[DataProfilingFile] = None
+    feature_store: Optional[FeatureStoreFile] = None
+    model_trainer: Optional[ModelTrainerFile] = None
+    model_params: Optional[ModelParamsFile] = None
+    model_evaluation: Optional[ModelEvaluationFile] = None
+    model_optimization: Optional[ModelOptimizationFile] = None
+    feature_selection: Optional[FeatureSelectionFile] = None
+    dashboard: Optional[DashboardFile] = None
+    environment: EnvironmentFile = EnvironmentFile()
+
+    @model_validator(mode='after')
+    def _check_consistency(self) -> 'PipelineSettings':
+        problems = []
+        schema = self.validation.data_validation.all_schema
+        transformation = self.transformation.data_transformation
+
+        # Columns
+        for kind, columns in (('numerical_cols', transformation.numerical_cols),
+                              ('categorical_cols', transformation.categorical_cols)):
+            missing = [col for col in columns if col not in schema]
+            if missing:
+                problems.append(f"data_transformation.{kind} not in all_schema: {missing}")
+        overlap = set(transformation.numerical_cols) & set(transformation.categorical_cols)
+        if overlap:
+            problems.append(f"Columns listed as both numerical and categorical: {sorted(overlap)}")
+        non_numeric = [col for col in transformation.numerical_cols if schema.get(col, 'int64') not in NUMERIC_DTYPES]
+        if non_numeric:
+            problems.append(f"data_transformation.numerical_cols have non-numeric schema dtypes: {non_numeric}")
+        if transformation.target_col not in schema:
+            problems.append(f"target_col '{transformation.target_col}' not in all_schema")
+        if transformation.target_col in set(transformation.numerical_cols) | set(transformation.categorical_cols):
+            problems.append(f"target_col '{transformation.target_col}' is also listed as a feature")
+
+        bulk_scoring = self.bulk_scoring.bulk_scoring
+        for kind, columns in (('exclude_columns', bulk_scoring.exclude_columns),
+                              ('query', list(bulk_scoring.query))):
+            missing = [col for col in columns if col not in schema]
+            if missing:
+                problems.append(f"bulk_scoring.{kind} not in all_schema: {missing}")
+
+        engine = self.discount_engine.discount_engine
+        table = self.discount_engine.discount_table
+        for kind, columns in (('discount_engine.segment_response', list(engine.segment_response)),
+                              ('discount_table.categories', list(table.categories))):
+            missing = [col for col in columns if col not in schema]
+            if missing:
+                problems.append(f"{kind} not in all_schema: {missing}")
+        if engine.grid.min >= engine.grid.max:
+            problems.append(f"discount_engine.grid.min ({engine.grid.min}) must be below grid.max ({engine.grid.max})")
+
+        if self.drift_monitor is not None:
+            drift = self.drift_monitor.drift_monitor
+            for kind, columns in (('numerical_cols', drift.numerical_cols),
+                                  ('categorical_cols', drift.categorical_cols)):
+                missing = [col for col in columns if col not in schema]
+                if missing:
+                    problems.append(f"drift_monitor.{kind} not in all_schema: {missing}")
+            non_numeric = [col for col in drift.numerical_cols if schema.get(col, 'int64') not in NUMERIC_DTYPES]
+            if non_numeric:
+                problems.append(f"drift_monitor.numerical_cols have non-numeric schema dtypes: {non_numeric}")
+            excluded = set(drift.numerical_cols + drift.categorical_cols) & set(bulk_scoring.exclude_columns)
+            if excluded:
+                problems.append(f"drift_monitor columns are not scoring features: {sorted(excluded)}")
+            if drift.psi_warning >= drift.psi_alert:
+                problems.append(f"drift_monitor.psi_warning ({drift.psi_warning}) must be below psi_alert ({drift.psi_alert})")
+
+        id_column = self.ingestion.data_ingestion.id_column
+        if id_column and id_column in schema:
+            problems.append(f"data_ingestion.id_column '{id_column}' must not be a schema column")
+
+        # Artifact hand-offs between stages
+        ingested = str(PurePosixPath(self.ingestion.data_ingestion.root_dir) / INGESTED_DATA_FILE)
+        validation = self.validation.data_validation
+        if not _same_path(validation.data_dir, ingested):
+            problems.append(f"data_validation.data_dir ({validation.data_dir}) is not the ingestion output ({ingested})")
+        if not _same_path(transformation.data_path, validation.validated_data):
+            problems.append(f"data_transformation.data_path ({transformation.data_path}) "
+                            f"is not data_validation.validated_data ({validation.validated_data})")
+        preprocessor = str(PurePosixPath(transformation.root_dir) / PREPROCESSOR_FILE)
+        if not _same_path(self.prediction.prediction.preprocessor_path, preprocessor):
+            problems.append(f"prediction.preprocessor_path ({self.prediction.prediction.preprocessor_path}) "
+                            f"is not the transformation output ({preprocessor})")
+
+        if self.drift_monitor is not None:
+            drift = self.drift_monitor.drift_monitor
+            if not _same_path(drift.reference_data_path, validation.validated_data):
+                problems.append(f"drift_monitor.reference_data_path ({drift.reference_data_path}) "
+                                f"is not data_validation.validated_data ({validation.validated_data})")
+            if not _same_path(drift.current_data_path, ingested):
+                problems.append(f"drift_monitor.current_data_path ({drift.current_data_path}) "
+                                f"is not the ingestion output ({ingested})")
+
+        if self.data_profiling is not None:
+            profiled = self.data_profiling.data_profiling.data_path
+            if not _same_path(profiled, ingested):
+                problems.append(f"data_profiling.data_path ({profiled}) is not the ingestion output ({ingested})")
+
+        if self.feature_store is not None:
+            store = self.feature_store.feature_store
+            if store.entity_key != id_column:
+                problems.append(f"feature_store.entity_key ({store.entity_key}) is not "
+                                f"data_ingestion.id_column ({id_column})")
+            missing = [col for col in store.feature_columns if col not in schema]
+            if missing:
+                problems.append(f"feature_store.feature_columns not in all_schema: {missing}")
+            if not _same_path(store.data_path, validation.validated_data):
+                problems.append(f"feature_store.data_path ({store.data_path}) "
+                                f"is not data_validation.validated_data ({validation.validated_data})")
+
+        if self.model_trainer is not None:
+            trainer = self.model_trainer.model_trainer
+            outputs = PurePosixPath(transformation.root_dir)
+            for kind, path, name in (('x_train_path', trainer.x_train_path, 'X_train_transformed.npy'),
+                                     ('y_train_path', trainer.y_train_path, 'y_train.parquet'),
+                                     ('x_test_path', trainer.x_test_path, 'X_test_transformed.npy'),
+                                     ('y_test_path', trainer.y_test_path, 'y_test.parquet'),
+                                     ('train_keys_path', trainer.train_keys_path, 'train_row_keys.npy'),
+                                     ('preprocessor_path', trainer.preprocessor_path, PREPROCESSOR_FILE)):
+                if not _same_path(path, str(outputs / name)):
+                    problems.append(f"model_trainer.{kind} ({path}) is not the transformation output ({outputs / name})")
+            if not _same_path(trainer.model_path, self.prediction.prediction.model_path):
+                problems.append(f"model_trainer.model_path ({trainer.model_path}) "
+                                f"is not prediction.model_path ({self.prediction.prediction.model_path})")
+            compiled = self.prediction.prediction.compiled_model_path
+            if compiled and not (trainer.compiled_model_path and _same_path(trainer.compiled_model_path, compiled)):
+                problems.append(f"model_trainer.compiled_model_path ({trainer.compiled_model_path}) "
+                                f"is not prediction.compiled_model_path ({compiled})")
+            if self.drift_monitor is not None:
+                drift = self.drift_monitor.drift_monitor
+                if drift.trained_keys_path and not _same_path(drift.trained_keys_path, trainer.ledger_path):
+                    problems.append(f"drift_monitor.trained_keys_path ({drift.trained_keys_path}) "
+                                    f"is not model_trainer.ledger_path ({trainer.ledger_path})")
+                if PurePosixPath(trainer.root_dir) not in PurePosixPath(drift.reference_path).parents:
+                    problems.append(f"drift_monitor.reference_path ({drift.reference_path}) must be kept with "
+                                    f"the champion, under model_trainer.root_dir ({trainer.root_dir})")
+
+        if self.model_optimization is not None:
+            optimization = self.model_optimization.model_optimization
+            outputs = PurePosixPath(transformation.root_dir)
+            for kind, path, name in (('x_train_path', optimization.x_train_path, 'X_train_transformed.npy'),
+                                     ('y_train_path', optimization.y_train_path, 'y_train.parquet'),
+                                     ('x_test_path', optimization.x_test_path, 'X_test_transformed.npy'),
+                                     ('y_test_path', optimization.y_test_path, 'y_test.parquet')):
+                if not _same_path(path, str(outputs / name)):
+                    problems.append(f"model_optimization.{kind} ({path}) is not the transformation output ({outputs / name})")
+            if not _same_path(optimization.model_path, self.prediction.prediction.model_path):
+                problems.append(f"model_optimization.model_path ({optimization.model_path}) "
+                                f"is not prediction.model_path ({self.prediction.prediction.model_path})")
+            compact = self.prediction.prediction.compact_model_path
+            if compact and not _same_path(optimization.compact_model_path, compact):
+                problems.append(f"model_optimization.compact_model_path ({optimization.compact_model_path}) "
+                                f"is not prediction.compact_model_path ({compact})")
+        if self.prediction.prediction.serving.use_compact_model and not self.prediction.prediction.compact_model_path:
+            problems.append("prediction.serving.use_compact_model needs prediction.compact_model_path")
+
+        if self.feature_selection is not None:
+            selection = self.feature_selection.feature_selection
+            if transformation.selected_features_path and \
+                    not _same_path(transformation.selected_features_path, selection.selected_features_path):
+                problems.append(f"data_transformation.selected_features_path ({transformation.selected_features_path}) "
+                                f"is not feature_selection.selected_features_path ({selection.selected_features_path})")
+
+        unknown_modes = set(self.environment.profiling.modes) - {'cprofile', 'sampling', 'memory'}
+        if unknown_modes:
+            problems.append(f"Unknown profiling modes: {sorted(unknown_modes)}")
+
+        if problems:
+            raise ValueError("Inconsistent configuration:\n  - " + "\n  - ".join(problems))
+        return self
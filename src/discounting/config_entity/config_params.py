@@ -1,6 +1,7 @@
 
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Dict, Optional
 
 # -------Data Ingestion ------------
 @dataclass
@@ -10,6 +11,11 @@ class DataIngestionConfig:
     collection_name: str
     batch_size: int
     mongo_uri: str
+    all_schema: dict = field(default_factory=dict)
+    compact_dtypes: bool = True
+    categorical_max_unique: int = 256
+    categorical_max_ratio: float = 0.5
+    id_column: Optional[str] = None
 
 
 # -------Data Validation -----
@@ -20,3 +26,257 @@ class DataValidationConfig:
     val_status: str
     all_schema: dict
     validated_data: str  
+    id_column: Optional[str] = None
+
+
+# -------Prediction -----
+@dataclass
+class PredictionConfig:
+    root_dir: str
+    preprocessor_path: str
+    model_path: str
+    num_workers: int
+    shared_artifacts_dir: str
+    mmap_mode: str
+    cache_enabled: bool = True
+    cache_max_entries: int = 100000
+    cache_ttl_seconds: float = 900.0
+    compiled_model_path: Optional[str] = None
+    compiled_max_rows: int = 256
+    compact_model_path: Optional[str] = None
+    use_compact_model: bool = False
+
+
+# -------Bulk Scoring -----
+@dataclass
+class BulkScoringConfig:
+    root_dir: str
+    database_name: str
+    collection_name: str
+    batch_size: int
+    num_partitions: int
+    query: dict
+    feature_columns: list
+    score_field: str
+    discount_field: str
+    model_version_field: str
+    mongo_uri: str
+    summary_path: Optional[str] = None
+    score_bins: int = 20
+
+
+# -------Discount Engine -----
+@dataclass
+class DiscountEngineConfig:
+    root_dir: str
+    grid_min: float
+    grid_max: float
+    grid_step: float
+    elasticity: float
+    lead_time_scale: float
+    lead_time_weight: float
+    deposit_type_response: dict
+    default_deposit_response: float
+    rebook_probability: float
+    chunk_size: int
+    segment_response: dict = field(default_factory=dict)
+
+
+# -------Discount Lookup Table -----
+@dataclass
+class DiscountTableConfig:
+    root_dir: str
+    table_path: str
+    index_path: str
+    score_bins: int
+    adr_edges: list
+    lead_time_edges: list
+    categories: dict
+    preprocessor_path: str
+    model_path: str
+
+
+# -------Data Transformation -----
+@dataclass
+class DataTransformationConfig:
+    root_dir: str
+    data_path: str
+    numerical_cols: list
+    categorical_cols: list
+    target_col: str
+    random_state: int
+    id_column: Optional[str] = None
+    test_size: float = 0.2
+    preprocessor_max_age_days: float = 0
+    selected_features_path: Optional[str] = None
+    # The promoted preprocessor, reused by an isolated run; None: root_dir's
+    champion_preprocessor_path: Optional[str] = None
+
+
+# -------Profiling -----
+@dataclass
+class ProfilingConfig:
+    enabled: bool
+    modes: list
+    sampling_interval_ms: float
+    tracemalloc_frames: int
+
+
+# -------Artifact Store -----
+@dataclass
+class ArtifactStoreConfig:
+    root_dir: str
+    runs_dir: str
+
+
+# -------Drift Monitor -----
+@dataclass
+class DriftMonitorConfig:
+    root_dir: str
+    reference_data_path: str
+    current_data_path: str
+    reference_path: str
+    current_path: str
+    ledger_path: str
+    report_path: str
+    numerical_cols: list
+    categorical_cols: list
+    bins: int
+    max_categories: int
+    reference_sample_rows: int
+    batch_size: int
+    psi_warning: float
+    psi_alert: float
+    ks_alert: float
+    reset_after_check: bool = True
+    trained_keys_path: Optional[str] = None
+    id_column: Optional[str] = None
+    # The promoted champion's reference, read when `reference_path` has none
+    champion_reference_path: Optional[str] = None
+
+
+# -------Data Profiling -----
+@dataclass
+class DataProfilingConfig:
+    root_dir: str
+    data_path: str
+    report_json: str
+    report_html: str
+    all_schema: dict
+    num_workers: int
+    batch_size: int
+    sketch_size: int
+    quantiles: list
+    top_k: int
+    max_tracked_categories: int
+    correlation_sample_rows: int
+    correlation_method: str
+    random_state: int
+
+
+# -------Feature Store -----
+@dataclass
+class FeatureStoreConfig:
+    root_dir: str
+    data_path: str
+    offline_path: str
+    online_path: str
+    entity_key: str
+    feature_columns: list
+    batch_size: int
+    mmap_size: int
+
+
+# -------Model Trainer -----
+@dataclass
+class ModelTrainerConfig:
+    root_dir: str
+    x_train_path: str
+    y_train_path: str
+    x_test_path: str
+    y_test_path: str
+    train_keys_path: str
+    preprocessor_path: str
+    model_path: str
+    ledger_path: str
+    state_path: str
+    estimator: str
+    params: dict
+    metric: str
+    incremental: bool
+    full_refit_every_days: float
+    full_refit_every_runs: int
+    new_estimators_per_update: int
+    max_estimators: int
+    compiled_model_path: Optional[str] = None
+    compiled_parity_tolerance: float = 1e-6
+    # Where the current champion is read from when it differs from where the
+    # new one is written (an isolated run); None: the paths above
+    champion_model_path: Optional[str] = None
+    champion_ledger_path: Optional[str] = None
+    champion_state_path: Optional[str] = None
+
+
+# -------Model Evaluation -----
+@dataclass
+class ModelEvaluationConfig:
+    root_dir: str
+    cache_dir: str
+    results_path: str
+    n_splits: int
+    n_jobs: int
+    metric: str
+    random_state: int
+    candidates: list
+
+
+# -------Model Optimization -----
+@dataclass
+class ModelOptimizationConfig:
+    root_dir: str
+    model_path: str
+    x_train_path: str
+    y_train_path: str
+    x_test_path: str
+    y_test_path: str
+    compact_model_path: str
+    report_path: str
+    metric: str
+    max_metric_drop: float
+    threshold_dtype: str
+    leaf_bits: int
+    keep_trees_fraction: float
+    selection_rows: int
+    random_state: int
+    min_feature_importance: float
+
+
+# -------Feature Selection -----
+@dataclass
+class FeatureSelectionConfig:
+    root_dir: str
+    selected_features_path: str
+    validation_size: float
+    method: str
+    n_repeats: int
+    max_rows: int
+    n_jobs: int
+    metric: str
+    min_importance: float
+    max_metric_drop: float
+    random_state: int
+    estimator: str
+    params: dict
+
+
+# -------Dashboard -----
+@dataclass
+class DashboardConfig:
+    refresh_seconds: float
+    max_history: int
+    # Stage name -> its <stage>-metrics.json
+    stage_metrics: Dict[str, str]
+    # Artifact name -> path of a small JSON summary
+    artifacts: Dict[str, str]
+    # History name -> path of an append-only JSON-lines file
+    histories: Dict[str, str]
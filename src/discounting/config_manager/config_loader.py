@@ -0,0 +1,82 @@
+
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Tuple, Type, TypeVar
+
+import yaml
+from pydantic import BaseModel
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+Model = TypeVar('Model', bound=BaseModel)
+
+# (absolute path, model) -> ((mtime_ns, size), validated model)
+_CONFIG_CACHE: Dict[Tuple[str, type], Tuple[Tuple[int, int], BaseModel]] = {}
+_CREATED_DIRECTORIES: set = set()
+_LOCK = threading.Lock()
+
+
+def load_config(path, model: Type[Model]) -> Model:
+    """
+    Parse the YAML file at `path` into a frozen `model`, once per process.
+
+    Later calls return the cached object after a single `stat`; the file is
+    re-parsed only when its modification time or size changes.
+    """
+    try:
+        resolved = os.path.abspath(path)
+        stat = os.stat(resolved)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        key = (resolved, model)
+
+        cached = _CONFIG_CACHE.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        with open(resolved) as yaml_file:
+            content = yaml.load(yaml_file, Loader=SafeLoader)
+        if content is None:
+            raise ValueError(f"YAML file is empty: {path}")
+
+        config = model.model_validate(content)
+        with _LOCK:
+            _CONFIG_CACHE[key] = (signature, config)
+        logger.info(f"YAML file: {path} loaded and validated as {model.__name__}.")
+        return config
+    except FileNotFoundError:
+        logger.error(f"YAML file not found: {path}.")
+        raise CustomException(f"YAML file not found: {path}", sys)
+    except Exception as e:
+        logger.error(f"Error loading YAML file: {path}, Error: {e}")
+        raise CustomException(f"Error loading YAML file: {path}, Error: {e}", sys)
+
+
+def ensure_directories(paths: Iterable) -> None:
+    """Create each directory the first time it is requested in this process."""
+    for path in paths:
+        resolved = os.path.abspath(path)
+        if resolved in _CREATED_DIRECTORIES:
+            continue
+        try:
+            Path(resolved).mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            logger.error(f"Error creating directory at: {path}, Error: {e}")
+            raise CustomException(f"Error creating directory at: {path}, Error: {e}", sys)
+        with _LOCK:
+            _CREATED_DIRECTORIES.add(resolved)
+        logger.info(f"Created directory at: {path}")
+
+
+def clear_config_cache() -> None:
+    """Forget every loaded config and created directory (e.g. after changing the working directory)."""
+    with _LOCK:
+        _CONFIG_CACHE.clear()
+        _CREATED_DIRECTORIES.clear()
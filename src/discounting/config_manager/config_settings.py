@@ -1,15 +1,26 @@
 
 import sys
 import os
+from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 
 # Custom modules
 from src.discounting.exception import CustomException
 from src.discounting.logger import logger
 from src.discounting.constants import * #(DATA_INGESTION_CONFIG_FILEPATH, DATA_VALIDATION_CONFIG_FILEPATH)
-from src.discounting.utils.commons import read_yaml, create_directories
+from src.discounting.config_manager.config_loader import load_config, ensure_directories
+from src.discounting.config_entity.config_models import (
+    DataIngestionFile, DataValidationFile, DataTransformationFile, PredictionFile,
+    BulkScoringFile, DiscountEngineFile, DriftMonitorFile, DataProfilingFile,
+    FeatureStoreFile, ModelTrainerFile, ModelParamsFile, ModelEvaluationFile, ModelOptimizationFile,
+    FeatureSelectionFile, DashboardFile, EnvironmentFile,
+    PipelineSettings, PREPROCESSOR_FILE,
+)
 
 from src.discounting.config_entity.config_params import *# DataIngestionConfig, DataValidationConfig
+from src.discounting.utils.artifact_io import history_path
+from src.discounting.utils.metrics import metrics_file_name
 load_dotenv()
 
 
@@ -19,6 +30,21 @@ class ConfigurationManager:
             self, 
             data_ingestion_config: str = DATA_INGESTION_CONFIG_FILEPATH,
             config_filepath: str = DATA_VALIDATION_CONFIG_FILEPATH,
+            prediction_config: str = PREDICTION_PIPELINE_CONFIG_FILEPATH,
+            bulk_scoring_config: str = BULK_SCORING_CONFIG_FILEPATH,
+            discount_engine_config: str = DISCOUNT_ENGINE_CONFIG_FILEPATH,
+            data_transformation_config: str = DATA_TRANSFORMATION_CONFIG_FILEPATH,
+            environment_config: str = ENVIRONMENT_CONFIG_FILEPATH,
+            drift_monitor_config: str = DRIFT_MONITOR_CONFIG_FILEPATH,
+            data_profiling_config: str = DATA_PROFILING_CONFIG_FILEPATH,
+            feature_store_config: str = FEATURE_STORE_CONFIG_FILEPATH,
+            model_trainer_config: str = MODEL_TRAINER_CONFIG_FILEPATH,
+            model_params_config: str = PARAMS_CONFIG_FILEPATH,
+            model_evaluation_config: str = MODEL_EVALUATION_CONFIG_FILEPATH,
+            model_optimization_config: str = MODEL_OPTIMIZATION_CONFIG_FILEPATH,
+            feature_selection_config: str = FEATURE_SELECTION_CONFIG_FILEPATH,
+            dashboard_config: str = DASHBOARD_CONFIG_FILEPATH,
+            run_dir: Optional[str] = None,
             ):
         
         
@@ -27,14 +53,52 @@ class ConfigurationManager:
         
         try:
             logger.info(f"Initializing ConfigurationManager with config file")
+
+            # Working directory of an isolated run (see main.py --run); the batch
+            # stages then read and write there instead of the shared artifacts/
+            self.run_dir = run_dir or os.environ.get('DISCOUNTING_RUN_DIR')
             
-            self.ingestion_config = read_yaml(data_ingestion_config)
-            self.config = read_yaml(config_filepath)
+            # Parsed and validated once per process, see config_loader
+            self.ingestion_config = load_config(data_ingestion_config, DataIngestionFile)
+            self.config = load_config(config_filepath, DataValidationFile)
+            self.prediction_config = load_config(prediction_config, PredictionFile)
+            self.bulk_scoring_config = load_config(bulk_scoring_config, BulkScoringFile)
+            self.discount_engine_config = load_config(discount_engine_config, DiscountEngineFile)
+            self.transformation_config = load_config(data_transformation_config, DataTransformationFile)
+            self.environment_config = load_config(environment_config, EnvironmentFile)
+            self.drift_monitor_config = load_config(drift_monitor_config, DriftMonitorFile)
+            self.data_profiling_config = load_config(data_profiling_config, DataProfilingFile)
+            self.feature_store_config = load_config(feature_store_config, FeatureStoreFile)
+            self.model_trainer_config = load_config(model_trainer_config, ModelTrainerFile)
+            self.model_params_config = load_config(model_params_config, ModelParamsFile)
+            self.model_evaluation_config = load_config(model_evaluation_config, ModelEvaluationFile)
+            self.model_optimization_config = load_config(model_optimization_config, ModelOptimizationFile)
+            self.feature_selection_config = load_config(feature_selection_config, FeatureSelectionFile)
+            self.dashboard_config = load_config(dashboard_config, DashboardFile)
+
+            # Cross-file checks, so a misconfiguration fails here rather than mid-run
+            self.settings = PipelineSettings(
+                ingestion=self.ingestion_config,
+                validation=self.config,
+                transformation=self.transformation_config,
+                prediction=self.prediction_config,
+                bulk_scoring=self.bulk_scoring_config,
+                discount_engine=self.discount_engine_config,
+                drift_monitor=self.drift_monitor_config,
+                data_profiling=self.data_profiling_config,
+                feature_store=self.feature_store_config,
+                model_trainer=self.model_trainer_config,
+                model_params=self.model_params_config,
+                model_evaluation=self.model_evaluation_config,
+                model_optimization=self.model_optimization_config,
+                feature_selection=self.feature_selection_config,
+                dashboard=self.dashboard_config,
+                environment=self.environment_config,
+            )
             
             
             
-            create_directories([self.ingestion_config['artifacts_root']])
-            create_directories([self.config['artifact_root']])
+            ensure_directories([self.ingestion_config.artifacts_root, self.config.artifact_root])
             
             
             
@@ -45,20 +109,42 @@ class ConfigurationManager:
         except Exception as e:
             logger.error(f"Error initializing ConfigurationManager: {e}")
             raise CustomException(e, sys)
+
+    def _run_path(self, path: str) -> str:
+        " Rebase a path under artifacts_root into the current run's directory, if any"
+        if not self.run_dir:
+            return path
+        try:
+            relative = Path(path).relative_to(self.ingestion_config.artifacts_root)
+        except ValueError:
+            return path
+        return str(Path(self.run_dir) / relative)
+
+    def _champion_path(self, path: str) -> str:
+        " The current run's copy of a champion artifact if it has written one, else the promoted one"
+        run_path = self._run_path(path)
+        return run_path if Path(run_path).exists() else path
     
     def get_data_ingestion_config(self) -> DataIngestionConfig:
         try:
-            data_config = self.ingestion_config['data_ingestion']
-            create_directories([data_config['root_dir']])
+            data_config = self.ingestion_config.data_ingestion
+            root_dir = self._run_path(data_config.root_dir)
+            ensure_directories([root_dir])
             logger.info(f"Data ingestion configuration loaded from: {DATA_INGESTION_CONFIG_FILEPATH}")
             mongo_uri = os.environ.get('MONGO_URI')
+            dtype_plan = data_config.dtype_plan
             
             return DataIngestionConfig(
-                root_dir=data_config['root_dir'],
-                database_name=data_config['database_name'],
-                collection_name=data_config['collection_name'],
-                batch_size=data_config['batch_size'],
-                mongo_uri=mongo_uri
+                root_dir=root_dir,
+                database_name=data_config.database_name,
+                collection_name=data_config.collection_name,
+                batch_size=data_config.batch_size,
+                mongo_uri=mongo_uri,
+                all_schema=dict(self.config.data_validation.all_schema),
+                compact_dtypes=dtype_plan.enabled,
+                categorical_max_unique=dtype_plan.categorical_max_unique,
+                categorical_max_ratio=dtype_plan.categorical_max_ratio,
+                id_column=data_config.id_column
             )
         except Exception as e:
             logger.error(f"Error loading data ingestion configuration: {e}")
@@ -67,17 +153,431 @@ class ConfigurationManager:
 ## Data Validation object 
     def get_data_validation_config(self) -> DataValidationConfig:
         try:
-            config = self.config['data_validation']
-            create_directories([config['root_dir']])
+            config = self.config.data_validation
+            ensure_directories([self._run_path(config.root_dir)])
 
             data_validation_config = DataValidationConfig(
-                root_dir=config['root_dir'],
-                data_dir=config['data_dir'],
-                val_status=config['val_status'],
-                all_schema=config['all_schema'],
-                validated_data=config['validated_data']
+                root_dir=self._run_path(config.root_dir),
+                data_dir=self._run_path(config.data_dir),
+                val_status=self._run_path(config.val_status),
+                all_schema=dict(config.all_schema),
+                validated_data=self._run_path(config.validated_data),
+                id_column=self.ingestion_config.data_ingestion.id_column
             )
             return data_validation_config
         except Exception as e:
             logger.exception(f"Error getting Data Validation config: {e}")
             raise CustomException(e, sys)
+
+## Data Transformation object
+    def get_data_transformation_config(self) -> DataTransformationConfig:
+        try:
+            config = self.transformation_config.data_transformation
+            ensure_directories([self._run_path(config.root_dir)])
+
+            data_transformation_config = DataTransformationConfig(
+                root_dir=self._run_path(config.root_dir),
+                data_path=self._run_path(config.data_path),
+                numerical_cols=list(config.numerical_cols),
+                categorical_cols=list(config.categorical_cols),
+                target_col=config.target_col,
+                random_state=config.random_state,
+                id_column=self.ingestion_config.data_ingestion.id_column,
+                test_size=config.test_size,
+                preprocessor_max_age_days=config.preprocessor_max_age_days,
+                selected_features_path=self._champion_path(config.selected_features_path) if config.selected_features_path else None,
+                champion_preprocessor_path=str(Path(config.root_dir) / PREPROCESSOR_FILE)
+            )
+            return data_transformation_config
+        except Exception as e:
+            logger.exception(f"Error getting Data Transformation config: {e}")
+            raise CustomException(e, sys)
+
+## Prediction object
+    def get_prediction_config(self) -> PredictionConfig:
+        try:
+            config = self.prediction_config.prediction
+            serving = config.serving
+            cache = config.cache
+            ensure_directories([config.root_dir])
+
+            prediction_config = PredictionConfig(
+                root_dir=config.root_dir,
+                preprocessor_path=config.preprocessor_path,
+                model_path=config.model_path,
+                num_workers=serving.num_workers,
+                shared_artifacts_dir=serving.shared_artifacts_dir,
+                mmap_mode=serving.mmap_mode,
+                cache_enabled=cache.enabled,
+                cache_max_entries=cache.max_entries,
+                cache_ttl_seconds=cache.ttl_seconds,
+                compiled_model_path=config.compiled_model_path,
+                compiled_max_rows=serving.compiled_max_rows,
+                compact_model_path=config.compact_model_path,
+                use_compact_model=serving.use_compact_model
+            )
+            return prediction_config
+        except Exception as e:
+            logger.exception(f"Error getting Prediction config: {e}")
+            raise CustomException(e, sys)
+
+## Bulk scoring object
+    def get_bulk_scoring_config(self) -> BulkScoringConfig:
+        try:
+            config = self.bulk_scoring_config.bulk_scoring
+            ensure_directories([config.root_dir])
+            all_schema = self.config.data_validation.all_schema
+            exclude_columns = set(config.exclude_columns)
+
+            bulk_scoring_config = BulkScoringConfig(
+                root_dir=config.root_dir,
+                database_name=config.database_name,
+                collection_name=config.collection_name,
+                batch_size=config.batch_size,
+                num_partitions=config.num_partitions,
+                query=dict(config.query),
+                feature_columns=[col for col in all_schema if col not in exclude_columns],
+                score_field=config.score_field,
+                discount_field=config.discount_field,
+                model_version_field=config.model_version_field,
+                mongo_uri=os.environ.get('MONGO_URI'),
+                summary_path=config.summary_path,
+                score_bins=config.score_bins
+            )
+            return bulk_scoring_config
+        except Exception as e:
+            logger.exception(f"Error getting Bulk Scoring config: {e}")
+            raise CustomException(e, sys)
+
+## Discount engine object
+    def get_discount_engine_config(self) -> DiscountEngineConfig:
+        try:
+            config = self.discount_engine_config.discount_engine
+            ensure_directories([config.root_dir])
+
+            discount_engine_config = DiscountEngineConfig(
+                root_dir=config.root_dir,
+                grid_min=config.grid.min,
+                grid_max=config.grid.max,
+                grid_step=config.grid.step,
+                elasticity=config.elasticity,
+                lead_time_scale=config.lead_time_scale,
+                lead_time_weight=config.lead_time_weight,
+                deposit_type_response=dict(config.deposit_type_response),
+                default_deposit_response=config.default_deposit_response,
+                rebook_probability=config.rebook_probability,
+                chunk_size=config.chunk_size,
+                segment_response={
+                    column: dict(mapping)
+                    for column, mapping in config.segment_response.items()
+                }
+            )
+            return discount_engine_config
+        except Exception as e:
+            logger.exception(f"Error getting Discount Engine config: {e}")
+            raise CustomException(e, sys)
+
+## Discount lookup table object
+    def get_discount_table_config(self) -> DiscountTableConfig:
+        try:
+            config = self.discount_engine_config.discount_table
+            prediction = self.prediction_config.prediction
+            ensure_directories([config.root_dir])
+
+            discount_table_config = DiscountTableConfig(
+                root_dir=config.root_dir,
+                table_path=config.table_path,
+                index_path=config.index_path,
+                score_bins=config.score_bins,
+                adr_edges=list(config.adr_edges),
+                lead_time_edges=list(config.lead_time_edges),
+                categories={column: list(values) for column, values in config.categories.items()},
+                preprocessor_path=prediction.preprocessor_path,
+                model_path=prediction.model_path
+            )
+            return discount_table_config
+        except Exception as e:
+            logger.exception(f"Error getting Discount Table config: {e}")
+            raise CustomException(e, sys)
+
+## Profiling object
+    def get_profiling_config(self) -> ProfilingConfig:
+        try:
+            config = self.environment_config.profiling
+
+            profiling_config = ProfilingConfig(
+                enabled=config.enabled,
+                modes=list(config.modes),
+                sampling_interval_ms=config.sampling_interval_ms,
+                tracemalloc_frames=config.tracemalloc_frames
+            )
+            return profiling_config
+        except Exception as e:
+            logger.exception(f"Error getting Profiling config: {e}")
+            raise CustomException(e, sys)
+
+## Artifact store object
+    def get_artifact_store_config(self) -> ArtifactStoreConfig:
+        try:
+            config = self.environment_config.artifact_store
+
+            artifact_store_config = ArtifactStoreConfig(
+                root_dir=config.root_dir,
+                runs_dir=config.runs_dir
+            )
+            return artifact_store_config
+        except Exception as e:
+            logger.exception(f"Error getting Artifact Store config: {e}")
+            raise CustomException(e, sys)
+
+
+## Drift monitor object
+    def get_drift_monitor_config(self) -> DriftMonitorConfig:
+        try:
+            config = self.drift_monitor_config.drift_monitor
+            ensure_directories([config.root_dir, self._run_path(config.root_dir)])
+
+            # The reference sketch belongs with the champion model it summarises;
+            # the current sketch, its ledger and the report are shared monitoring state
+            drift_monitor_config = DriftMonitorConfig(
+                root_dir=config.root_dir,
+                reference_data_path=self._run_path(config.reference_data_path),
+                current_data_path=self._run_path(config.current_data_path),
+                reference_path=self._run_path(config.reference_path),
+                trained_keys_path=self._champion_path(config.trained_keys_path) if config.trained_keys_path else None,
+                current_path=config.current_path,
+                ledger_path=config.ledger_path,
+                report_path=config.report_path,
+                numerical_cols=list(config.numerical_cols),
+                categorical_cols=list(config.categorical_cols),
+                bins=config.bins,
+                max_categories=config.max_categories,
+                reference_sample_rows=config.reference_sample_rows,
+                batch_size=config.batch_size,
+                psi_warning=config.psi_warning,
+                psi_alert=config.psi_alert,
+                ks_alert=config.ks_alert,
+                reset_after_check=config.reset_after_check,
+                id_column=self.ingestion_config.data_ingestion.id_column,
+                champion_reference_path=config.reference_path
+            )
+            return drift_monitor_config
+        except Exception as e:
+            logger.exception(f"Error getting Drift Monitor config: {e}")
+            raise CustomException(e, sys)
+
+## Data profiling object
+    def get_data_profiling_config(self) -> DataProfilingConfig:
+        try:
+            config = self.data_profiling_config.data_profiling
+            ensure_directories([self._run_path(config.root_dir)])
+
+            data_profiling_config = DataProfilingConfig(
+                root_dir=self._run_path(config.root_dir),
+                data_path=self._run_path(config.data_path),
+                report_json=self._run_path(config.report_json),
+                report_html=self._run_path(config.report_html),
+                all_schema=dict(self.config.data_validation.all_schema),
+                num_workers=config.num_workers,
+                batch_size=config.batch_size,
+                sketch_size=config.sketch_size,
+                quantiles=list(config.quantiles),
+                top_k=config.top_k,
+                max_tracked_categories=config.max_tracked_categories,
+                correlation_sample_rows=config.correlation_sample_rows,
+                correlation_method=config.correlation_method,
+                random_state=config.random_state
+            )
+            return data_profiling_config
+        except Exception as e:
+            logger.exception(f"Error getting Data Profiling config: {e}")
+            raise CustomException(e, sys)
+
+## Feature store object
+    def get_feature_store_config(self) -> FeatureStoreConfig:
+        try:
+            config = self.feature_store_config.feature_store
+            target_col = self.transformation_config.data_transformation.target_col
+            ensure_directories([self._run_path(config.root_dir)])
+
+            feature_store_config = FeatureStoreConfig(
+                root_dir=self._run_path(config.root_dir),
+                data_path=self._run_path(config.data_path),
+                offline_path=self._run_path(config.offline_path),
+                online_path=self._run_path(config.online_path),
+                entity_key=config.entity_key,
+                feature_columns=list(config.feature_columns) or [
+                    col for col in self.config.data_validation.all_schema if col != target_col
+                ],
+                batch_size=config.batch_size,
+                mmap_size=config.mmap_size
+            )
+            return feature_store_config
+        except Exception as e:
+            logger.exception(f"Error getting Feature Store config: {e}")
+            raise CustomException(e, sys)
+
+## Model trainer object
+    def get_model_trainer_config(self) -> ModelTrainerConfig:
+        try:
+            config = self.model_trainer_config.model_trainer
+            incremental = config.incremental
+            estimator = self.model_params_config.estimator
+            ensure_directories([self._run_path(config.root_dir)])
+
+            model_trainer_config = ModelTrainerConfig(
+                root_dir=self._run_path(config.root_dir),
+                x_train_path=self._run_path(config.x_train_path),
+                y_train_path=self._run_path(config.y_train_path),
+                x_test_path=self._run_path(config.x_test_path),
+                y_test_path=self._run_path(config.y_test_path),
+                train_keys_path=self._run_path(config.train_keys_path),
+                preprocessor_path=self._run_path(config.preprocessor_path),
+                model_path=self._run_path(config.model_path),
+                ledger_path=self._run_path(config.ledger_path),
+                state_path=self._run_path(config.state_path),
+                estimator=estimator,
+                params=dict(self.model_params_config.params.get(estimator, {})),
+                metric=config.metric,
+                incremental=incremental.enabled,
+                full_refit_every_days=incremental.full_refit_every_days,
+                full_refit_every_runs=incremental.full_refit_every_runs,
+                new_estimators_per_update=incremental.new_estimators_per_update,
+                max_estimators=incremental.max_estimators,
+                compiled_model_path=self._run_path(config.compiled_model_path) if config.compiled_model_path else None,
+                compiled_parity_tolerance=config.compiled_parity_tolerance,
+                # An isolated run starts from the promoted champion
+                champion_model_path=config.model_path,
+                champion_ledger_path=config.ledger_path,
+                champion_state_path=config.state_path
+            )
+            return model_trainer_config
+        except Exception as e:
+            logger.exception(f"Error getting Model Trainer config: {e}")
+            raise CustomException(e, sys)
+
+## Model evaluation object
+    def get_model_evaluation_config(self) -> ModelEvaluationConfig:
+        try:
+            config = self.model_evaluation_config.model_evaluation
+            ensure_directories([self._run_path(config.root_dir)])
+
+            model_evaluation_config = ModelEvaluationConfig(
+                root_dir=self._run_path(config.root_dir),
+                # Shared by every run: isolated runs over the same data reuse the folds
+                cache_dir=config.cache_dir,
+                results_path=self._run_path(config.results_path),
+                n_splits=config.n_splits,
+                n_jobs=config.n_jobs,
+                metric=config.metric,
+                random_state=config.random_state,
+                candidates=[candidate.model_dump() for candidate in config.candidates]
+            )
+            return model_evaluation_config
+        except Exception as e:
+            logger.exception(f"Error getting Model Evaluation config: {e}")
+            raise CustomException(e, sys)
+
+## Model optimization object
+    def get_model_optimization_config(self) -> ModelOptimizationConfig:
+        try:
+            config = self.model_optimization_config.model_optimization
+            ensure_directories([self._run_path(config.root_dir)])
+
+            model_optimization_config = ModelOptimizationConfig(
+                root_dir=self._run_path(config.root_dir),
+                model_path=self._run_path(config.model_path),
+                x_train_path=self._run_path(config.x_train_path),
+                y_train_path=self._run_path(config.y_train_path),
+                x_test_path=self._run_path(config.x_test_path),
+                y_test_path=self._run_path(config.y_test_path),
+                compact_model_path=self._run_path(config.compact_model_path),
+                report_path=self._run_path(config.report_path),
+                metric=config.metric,
+                max_metric_drop=config.max_metric_drop,
+                threshold_dtype=config.threshold_dtype,
+                leaf_bits=config.leaf_bits,
+                keep_trees_fraction=config.keep_trees_fraction,
+                selection_rows=config.selection_rows,
+                random_state=config.random_state,
+                min_feature_importance=config.min_feature_importance
+            )
+            return model_optimization_config
+        except Exception as e:
+            logger.exception(f"Error getting Model Optimization config: {e}")
+            raise CustomException(e, sys)
+
+## Feature selection object
+    def get_feature_selection_config(self) -> FeatureSelectionConfig:
+        try:
+            config = self.feature_selection_config.feature_selection
+            estimator = self.model_params_config.estimator
+            ensure_directories([self._run_path(config.root_dir)])
+
+            feature_selection_config = FeatureSelectionConfig(
+                root_dir=self._run_path(config.root_dir),
+                selected_features_path=self._run_path(config.selected_features_path),
+                validation_size=config.validation_size,
+                method=config.method,
+                n_repeats=config.n_repeats,
+                max_rows=config.max_rows,
+                n_jobs=config.n_jobs,
+                metric=config.metric,
+                min_importance=config.min_importance,
+                max_metric_drop=config.max_metric_drop,
+                random_state=config.random_state,
+                estimator=estimator,
+                params=dict(self.model_params_config.params.get(estimator, {}))
+            )
+            return feature_selection_config
+        except Exception as e:
+            logger.exception(f"Error getting Feature Selection config: {e}")
+            raise CustomException(e, sys)
+
+## Dashboard object
+    def get_dashboard_config(self) -> DashboardConfig:
+        try:
+            config = self.dashboard_config.dashboard
+            # The same paths the stages write to, including an isolated run's
+            stage_roots = {
+                'data_ingestion': self.get_data_ingestion_config().root_dir,
+                'data_validation': self.get_data_validation_config().root_dir,
+                'data_profiling': self.get_data_profiling_config().root_dir,
+                'feature_selection': self.get_feature_selection_config().root_dir,
+                'data_transformation': self.get_data_transformation_config().root_dir,
+                'model_evaluation': self.get_model_evaluation_config().root_dir,
+                'model_trainer': self.get_model_trainer_config().root_dir,
+                'model_optimization': self.get_model_optimization_config().root_dir,
+                'feature_store': self.get_feature_store_config().root_dir,
+                'drift_monitor': self.get_drift_monitor_config().root_dir,
+                'prediction': self.get_prediction_config().root_dir,
+            }
+            validation = self.get_data_validation_config()
+            drift_monitor = self.get_drift_monitor_config()
+            bulk_scoring = self.get_bulk_scoring_config()
+            artifacts = {
+                'validation': validation.val_status,
+                'profile': self.get_data_profiling_config().report_json,
+                'drift': drift_monitor.report_path,
+                'bulk_scoring': str(Path(bulk_scoring.root_dir) / 'bulk-scoring-metadata.json'),
+                'cv_results': self.get_model_evaluation_config().results_path,
+                'trainer_state': self.get_model_trainer_config().state_path,
+                'optimization': self.get_model_optimization_config().report_path,
+                'feature_selection': self.get_feature_selection_config().selected_features_path,
+            }
+            if bulk_scoring.summary_path:
+                artifacts['discounts'] = bulk_scoring.summary_path
+
+            dashboard_config = DashboardConfig(
+                refresh_seconds=config.refresh_seconds,
+                max_history=config.max_history,
+                stage_metrics={stage: str(Path(root_dir) / metrics_file_name(stage))
+                               for stage, root_dir in stage_roots.items()},
+                artifacts=artifacts,
+                histories={name: str(history_path(artifacts[name]))
+                           for name in ('validation', 'drift', 'discounts') if name in artifacts}
+            )
+            return dashboard_config
+        except Exception as e:
+            logger.exception(f"Error getting Dashboard config: {e}")
+            raise CustomException(e, sys)
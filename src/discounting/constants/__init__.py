@@ -10,4 +10,13 @@ PARAMS_CONFIG_FILEPATH = Path("config/model-params.yaml")
 MODEL_EVALUATION_CONFIG_FILEPATH = Path("config/model-evaluation.yaml")
 MODEL_VALIDATION_CONFIG_FILEPATH = Path("config/model-validation.yaml")
 PREDICTION_PIPELINE_CONFIG_FILEPATH = Path("config/prediction.yaml")
-HYPERPARAMETER_SEARCH_CONFIG_FILEPATH = Path("config/wandb.yaml")
\ No newline at end of file
+HYPERPARAMETER_SEARCH_CONFIG_FILEPATH = Path("config/wandb.yaml")
+BULK_SCORING_CONFIG_FILEPATH = Path("config/bulk-scoring.yaml")
+DISCOUNT_ENGINE_CONFIG_FILEPATH = Path("config/discount-engine.yaml")
+ENVIRONMENT_CONFIG_FILEPATH = Path("config/environment.yaml")
+DRIFT_MONITOR_CONFIG_FILEPATH = Path("config/drift-monitor.yaml")
+DATA_PROFILING_CONFIG_FILEPATH = Path("config/data-profiling.yaml")
+FEATURE_STORE_CONFIG_FILEPATH = Path("config/feature-store.yaml")
+MODEL_OPTIMIZATION_CONFIG_FILEPATH = Path("config/model-optimization.yaml")
+FEATURE_SELECTION_CONFIG_FILEPATH = Path("config/feature-selection.yaml")
+DASHBOARD_CONFIG_FILEPATH = Path("config/dashboard.yaml")
@@ -0,0 +1,177 @@
+
+import os
+import sys
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_entity.config_params import FeatureStoreConfig
+from src.discounting.utils.artifact_io import save_artifact
+from src.discounting.utils.metrics import StageMetrics, file_size
+
+# SQLite limits the number of bound parameters per statement
+LOOKUP_CHUNK_SIZE = 500
+
+
+def _sql_type(dtype) -> str:
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class FeatureStore:
+    """
+    Precomputed reservation features, keyed by reservation ID.
+
+    - Offline: a Parquet snapshot of the features, materialized from the
+      validated data and sorted by key (for batch jobs and training).
+    - Online: an embedded SQLite table with the key as its primary key
+      (WITHOUT ROWID, so a lookup is a single B-tree search), opened
+      read-only and memory-mapped, for point lookups on the prediction path.
+
+    Materialization builds a new database beside the old one and renames it
+    into place; readers notice the new file and reopen. Connections are per
+    thread and per process, so the store can be shared by threaded and
+    pre-forked servers.
+    """
+    def __init__(self, config: FeatureStoreConfig):
+        self.config = config
+        self.metrics = StageMetrics("feature_store")
+        self._local = threading.local()
+        self._columns: Optional[List[str]] = None
+
+    # ----- Offline -----
+    def materialize(self) -> Dict[str, int]:
+        """Build the offline snapshot and the online index from the validated data."""
+        try:
+            key = self.config.entity_key
+            columns = [key] + [col for col in self.config.feature_columns if col != key]
+            with self.metrics.track("read") as step:
+                features = pd.read_parquet(self.config.data_path, columns=columns)
+                step.rows_out = len(features)
+                step.bytes_read = file_size(self.config.data_path)
+
+            with self.metrics.track("offline", rows_in=len(features)) as step:
+                duplicated = features[key].duplicated(keep='last')
+                if duplicated.any():
+                    logger.warning(f"{int(duplicated.sum())} duplicate {key} values, keeping the last occurrence")
+                    features = features[~duplicated]
+                features = features.sort_values(key, ignore_index=True)
+                # Categories are stored as their values; the online store keeps plain types
+                features = features.astype({
+                    col: features[col].cat.categories.dtype
+                    for col in features.columns if isinstance(features[col].dtype, pd.CategoricalDtype)
+                })
+                save_artifact(features, self.config.offline_path)
+                step.rows_out = len(features)
+                step.bytes_written = file_size(self.config.offline_path)
+
+            with self.metrics.track("online", rows_in=len(features)) as step:
+                self._build_online(features)
+                step.bytes_written = file_size(self.config.online_path)
+
+            self.metrics.save(self.config.root_dir)
+            logger.info(f"Feature store materialized: {len(features)} reservations, "
+                        f"{len(columns) - 1} features, online index at {self.config.online_path}")
+            return {'rows': len(features), 'features': len(columns) - 1}
+        except Exception as e:
+            logger.error(f"Error materializing the feature store: {e}")
+            raise CustomException(e, sys)
+
+    def _build_online(self, features: pd.DataFrame) -> None:
+        key = self.config.entity_key
+        online_path = Path(self.config.online_path)
+        tmp_path = online_path.with_name(f".{online_path.name}.{os.getpid()}.tmp")
+        if tmp_path.exists():
+            tmp_path.unlink()
+        column_defs = ", ".join(
+            f"{_quote(col)} {_sql_type(features[col].dtype)}" + (" PRIMARY KEY" if col == key else "")
+            for col in features.columns
+        )
+        placeholders = ", ".join("?" for _ in features.columns)
+        insert = f"INSERT INTO features VALUES ({placeholders})"
+
+        connection = sqlite3.connect(tmp_path)
+        try:
+            # A fresh file that is renamed into place when complete: no journal needed
+            connection.execute("PRAGMA journal_mode = OFF")
+            connection.execute("PRAGMA synchronous = OFF")
+            connection.execute(f"CREATE TABLE features ({column_defs}) WITHOUT ROWID")
+            # Rows are sorted by key, so the B-tree is filled in order
+            for start in range(0, len(features), self.config.batch_size):
+                chunk = features.iloc[start:start + self.config.batch_size]
+                chunk = chunk.astype(object).where(chunk.notna(), None)
+                connection.executemany(insert, chunk.itertuples(index=False, name=None))
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(tmp_path, online_path)
+
+    # ----- Online -----
+    def _connection(self) -> sqlite3.Connection:
+        local = self._local
+        try:
+            stat = os.stat(self.config.online_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Online feature store not materialized: {self.config.online_path}")
+        version = (os.getpid(), stat.st_ino, stat.st_mtime_ns)
+        if getattr(local, 'version', None) != version:
+            if getattr(local, 'connection', None) is not None and local.version[0] == os.getpid():
+                local.connection.close()
+            uri = Path(self.config.online_path).resolve().as_uri() + "?mode=ro"
+            connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            connection.execute(f"PRAGMA mmap_size = {self.config.mmap_size}")
+            local.connection, local.version = connection, version
+            self._columns = [row[1] for row in connection.execute("PRAGMA table_info(features)")]
+        return local.connection
+
+    @property
+    def feature_names(self) -> List[str]:
+        self._connection()
+        return [col for col in self._columns if col != self.config.entity_key]
+
+    def get(self, entity_key: str) -> Optional[dict]:
+        """Features of one reservation, or None if it is not in the store."""
+        connection = self._connection()
+        row = connection.execute(
+            f"SELECT * FROM features WHERE {_quote(self.config.entity_key)} = ?", (str(entity_key),)
+        ).fetchone()
+        if row is None:
+            return None
+        return {col: value for col, value in zip(self._columns, row) if col != self.config.entity_key}
+
+    def get_many(self, entity_keys: Iterable[str]) -> pd.DataFrame:
+        """
+        Features of several reservations as a DataFrame indexed by key, in the
+        order requested. Unknown keys come back as rows of NaN.
+        """
+        try:
+            keys = [str(key) for key in entity_keys]
+            connection = self._connection()
+            key_column = _quote(self.config.entity_key)
+            rows = []
+            with self.metrics.track("lookup", rows_in=len(keys)) as step:
+                unique_keys = list(dict.fromkeys(keys))
+                for start in range(0, len(unique_keys), LOOKUP_CHUNK_SIZE):
+                    chunk = unique_keys[start:start + LOOKUP_CHUNK_SIZE]
+                    placeholders = ", ".join("?" for _ in chunk)
+                    rows.extend(connection.execute(
+                        f"SELECT * FROM features WHERE {key_column} IN ({placeholders})", chunk
+                    ).fetchall())
+                found = pd.DataFrame.from_records(rows, columns=self._columns).set_index(self.config.entity_key)
+                step.rows_out = len(found)
+            return found.reindex(keys)
+        except Exception as e:
+            logger.error(f"Error reading from the feature store: {e}")
+            raise CustomException(e, sys)
@@ -1,18 +1,22 @@
 
+import os
 import sys
+import time
 import logging
-from typing import Any, Dict, Optional
+import threading
+from types import ModuleType
+from typing import Any, Dict, Optional, Tuple
 from dataclasses import dataclass
 
-# Initialize the logger
-logger = logging.getLogger('LeadScoring')
-logging.basicConfig(level=logging.ERROR)
+# The package logger, looked up by name so this module does not import (or
+# configure) logging itself.
+logger = logging.getLogger('discounting')
 
 @dataclass(frozen=True)
 class ErrorDetails:
     """
     A dataclass to hold error details.
-    
+
     Attributes:
         exc_type (type): The type of the exception.
         exc_value (BaseException): The exception instance.
@@ -26,6 +30,11 @@ class CustomException(Exception):
     """
     Custom exception class for the Lead Scoring application.
 
+    Construction only records references (the error, the exception being
+    handled and its traceback); the formatted message is built the first time
+    it is needed and then cached, so wrapping an error at every layer stays
+    cheap.
+
     Attributes:
         message (str): A detailed, formatted error message
         error (Exception): The original exception instance.
@@ -34,84 +43,210 @@ class CustomException(Exception):
         error_type (str): A string indicating the type of error
     """
     def __init__(
-        self, 
-        error: Exception, 
-        error_type: Optional[str] = None, 
+        self,
+        error: Exception,
+        error_type: Optional[str] = None,
         context: Optional[Dict] = None,
         log_immediately: bool = False
     ):
         self.error = error
         self.context = context or {}  # Initialize as empty dict if None
-        self.error_type = error_type if error_type else type(error).__name__
 
-        # Capture traceback details
-        error_details = sys.exc_info()
-        self.error_details = ErrorDetails(*error_details)
+        # Most call sites pass the `sys` module as the second argument; it is
+        # not an error type, so fall back to the root cause's type name.
+        self._error_type = None if isinstance(error_type, ModuleType) else error_type
 
-        # Format the error message
-        self.message = self._format_error_message()
-        
-        super().__init__(self.message)
+        # Capture traceback details (references only, nothing is walked here)
+        self.error_details = ErrorDetails(*sys.exc_info())
+        self._message: Optional[str] = None
+
+        super().__init__(error)
 
         # Optionally log the error immediately
         if log_immediately:
             self.log_error()
-    
+
+    @property
+    def error_type(self) -> str:
+        if self._error_type:
+            return self._error_type
+        root = root_cause(self)
+        return type(root).__name__ if root is not self else type(self.error).__name__
+
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            self._message = self._format_error_message()
+        return self._message
+
+    def _location(self) -> Tuple[Optional[str], Optional[int]]:
+        traceback = self.error_details.exc_traceback
+        if traceback is None:
+            return None, None
+        return traceback.tb_frame.f_code.co_filename, traceback.tb_lineno
+
     def _format_error_message(self) -> str:
         """
         Format detailed error information.
-        
+
         Returns:
             str: Formatted error message with file, line number, and context details.
         """
-        try:
-            file_name = self.error_details.exc_traceback.tb_frame.f_code.co_filename
-            line_number = self.error_details.exc_traceback.tb_lineno
-
-            formatted_error_message = (
-                f"Error Type: [{self.error_type}]\n"
-                f"File: {file_name}\n"
-                f"Line Number: [{line_number}]\n"
-                f"Error message: [{self.error}]"
-            )
-
-            if self.context:
-                context_str = '\n'.join(f"  {k}: {v}" for k, v in self.context.items())
-                formatted_error_message += f"\nContext:\n{context_str}"
-
-            return formatted_error_message
-            
-        except AttributeError:
+        file_name, line_number = self._location()
+        if file_name is None:
             return f"Error: {self.error} (Stack trace details unavailable)"
 
+        formatted_error_message = (
+            f"Error Type: [{self.error_type}]\n"
+            f"File: {file_name}\n"
+            f"Line Number: [{line_number}]\n"
+            f"Error message: [{self.error}]"
+        )
+
+        if self.context:
+            context_str = '\n'.join(f"  {k}: {v}" for k, v in self.context.items())
+            formatted_error_message += f"\nContext:\n{context_str}"
+
+        return formatted_error_message
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Structured error details, attached to the JSON log record."""
+        root = root_cause(self)
+        file_name, line_number = self._location()
+        details = {
+            'error_type': self.error_type,
+            'file': file_name,
+            'line': line_number,
+            'root_cause': type(root).__name__,
+            'root_message': str(root.error if isinstance(root, CustomException) else root),
+        }
+        if self.context:
+            details['context'] = {k: str(v) for k, v in self.context.items()}
+        return details
+
     def log_error(self, level: int = logging.ERROR) -> None:
         """
         Log the formatted error message at the specified level.
-        
+
         Args:
             level (int): The logging level to use (default: logging.ERROR)
         """
-        logger.log(level, self.message)
+        logger.log(level, self.message, extra={'error_info': self.to_dict()})
 
     def __str__(self) -> str:
         """Return the formatted error message."""
         return self.message
 
+
+def root_cause(exc: BaseException) -> BaseException:
+    """Follow CustomException wrapping and `raise ... from` / implicit chaining to the original error."""
+    seen = set()
+    while id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, CustomException):
+            inner = exc.error if isinstance(exc.error, BaseException) else exc.error_details.exc_value
+        else:
+            inner = exc.__cause__ or exc.__context__
+        if inner is None:
+            break
+        exc = inner
+    return exc
+
+
+def _origin(exc: BaseException) -> Tuple[str, Optional[str], Optional[int]]:
+    """Type and raising location of `exc`, used to recognise repeats of the same failure."""
+    traceback = exc.__traceback__
+    if traceback is None and isinstance(exc, CustomException):
+        traceback = exc.error_details.exc_traceback
+    while traceback is not None and traceback.tb_next is not None:
+        traceback = traceback.tb_next
+    if traceback is None:
+        return type(exc).__name__, None, None
+    return type(exc).__name__, traceback.tb_frame.f_code.co_filename, traceback.tb_lineno
+
+
+class ErrorLogFilter(logging.Filter):
+    """
+    Keeps error logging proportional to failures rather than to wrapping layers.
+
+    - Once per chain: components log and wrap an error, then each caller logs
+      and re-wraps it. Only the first ERROR record emitted while handling a
+      given root cause is kept; the rest of the chain is dropped.
+    - Repeats: a failure with the same type and origin as one logged less than
+      `repeat_window` seconds ago (e.g. a flapping Mongo connection) is counted
+      instead of logged; the count is reported on the next record that passes.
+    - Structure: kept records get an `error_info` dict (type, location, root
+      cause, context), which the JSON formatter writes as a field.
+    """
+
+    def __init__(self, repeat_window: float = float(os.getenv('LOG_ERROR_REPEAT_WINDOW', 10))):
+        super().__init__()
+        self.repeat_window = repeat_window
+        self._last_logged: Dict[tuple, float] = {}
+        self._suppressed: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.ERROR:
+            return True
+        # A record can pass the logger's filters twice (see _LazyConfigHandler)
+        decision = getattr(record, '_error_filter_decision', None)
+        if decision is None:
+            decision = self._decide(record)
+            record._error_filter_decision = decision
+        return decision
+
+    def _decide(self, record: logging.LogRecord) -> bool:
+        exc = record.exc_info[1] if record.exc_info else sys.exc_info()[1]
+        if exc is None:
+            return True
+
+        root = root_cause(exc)
+        if getattr(root, '_discounting_logged', False):
+            return False
+        try:
+            root._discounting_logged = True
+        except AttributeError:  # exceptions without a __dict__
+            pass
+
+        suppressed = 0
+        if self.repeat_window > 0:
+            key = _origin(root)
+            now = time.monotonic()
+            with self._lock:
+                last = self._last_logged.get(key)
+                if last is not None and now - last < self.repeat_window:
+                    self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                    return False
+                self._last_logged[key] = now
+                suppressed = self._suppressed.pop(key, 0)
+
+        if not hasattr(record, 'error_info'):
+            record.error_info = exc.to_dict() if isinstance(exc, CustomException) else {
+                'error_type': type(root).__name__,
+                'root_cause': type(root).__name__,
+                'root_message': str(root),
+            }
+        if suppressed:
+            record.error_info = dict(record.error_info, suppressed_repeats=suppressed)
+        return True
+
+
 def example_function():
     try:
         # Simulating an error
-        1 / 1
+        1 / 0
     except Exception as e:
         raise CustomException(
-            e, 
-            error_type="Mathematical",  
+            e,
+            error_type="Mathematical",
             context={"operation": "division", "status": "failed"}
         )
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.ERROR)
     try:
         logger.info("Starting the example function.")
         example_function()
     except CustomException as e:
-        # The error is already logged by default, but you can log it again if needed
-        logger.error(f"Additional error logging: {e}")
\ No newline at end of file
+        e.log_error()
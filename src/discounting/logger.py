@@ -1,20 +1,51 @@
 
+import atexit
 import logging
-import logging.config
 import os
+import queue
 import sys
+import threading
 from datetime import datetime
-from pythonjsonlogger import jsonlogger
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+from src.discounting.exception import ErrorLogFilter
+
 # Constants
 FORMATTER_JSON = 'json'
 FORMATTER_DETAILED = 'detailed'
 DEFAULT_MAX_BYTES = 10 * 1024 * 1024  # 10MB
 DEFAULT_BACKUP_COUNT = 20
 DEFAULT_LOGGER_NAME = 'discounting'
+DEFAULT_QUEUE_SIZE = 10_000
+QUEUE_POLICY_BLOCK = 'block'
+QUEUE_POLICY_DROP = 'drop'
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler over a bounded queue. When the queue is full the record is
+    either dropped (and counted) or the caller blocks until there is room,
+    depending on `policy`.
+    """
+
+    def __init__(self, log_queue: queue.Queue, policy: str = QUEUE_POLICY_DROP, block_timeout: Optional[float] = None):
+        super().__init__(log_queue)
+        if policy not in (QUEUE_POLICY_BLOCK, QUEUE_POLICY_DROP):
+            raise ValueError(f"Unknown queue policy: {policy}")
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.policy == QUEUE_POLICY_BLOCK:
+                self.queue.put(record, block=True, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
 
 
 class LoggerConfigurator:
@@ -32,7 +63,10 @@ class LoggerConfigurator:
         formatters: Optional[Dict] = None,
         handlers: Optional[Dict] = None,
         loggers: Optional[Dict] = None,
-        log_level: str = 'DEBUG',
+        log_level: str = os.getenv('LOG_LEVEL', 'DEBUG'),
+        use_queue: bool = os.getenv('LOG_QUEUE', '0').lower() in ('1', 'true', 'yes'),
+        queue_size: int = int(os.getenv('LOG_QUEUE_SIZE', DEFAULT_QUEUE_SIZE)),
+        queue_policy: str = os.getenv('LOG_QUEUE_POLICY', QUEUE_POLICY_DROP),
     ):
         """
         Initialize the logger configurator.
@@ -46,12 +80,23 @@ class LoggerConfigurator:
             handlers: Custom handlers configuration
             loggers: Custom loggers configuration
             log_level: Default logging level
+            use_queue: Hand records to a background thread through a bounded queue,
+                so formatting and file I/O happen off the calling thread
+            queue_size: Maximum number of records waiting in the queue
+            queue_policy: 'drop' to discard records when the queue is full,
+                'block' to make the caller wait for room
         """
         self.log_dir = log_dir
         self.log_file_name_pattern = log_file_name_pattern
         self.max_bytes = max_bytes
         self.backup_count = backup_count
         self.log_level = log_level
+        self.use_queue = use_queue
+        self.queue_size = queue_size
+        self.queue_policy = queue_policy
+        self.queue_handler: Optional[BoundedQueueHandler] = None
+        self.queue_listener: Optional[QueueListener] = None
+        self._target_handlers: list = []
         
         # Initialize configurations
         self.formatters = formatters if formatters else self._default_formatters()
@@ -59,6 +104,8 @@ class LoggerConfigurator:
         self.loggers = loggers if loggers else self._default_loggers()
         
         self._configure_logging()
+        if self.use_queue:
+            self._start_queue_listener()
 
     def _default_formatters(self) -> Dict[str, Dict[str, Any]]:
         """Define default formatters for different logging outputs."""
@@ -70,7 +117,8 @@ class LoggerConfigurator:
                 'format': '[%(asctime)s] [%(levelname)s] %(name)s - %(module)s:%(lineno)d - %(message)s'
             },
             FORMATTER_JSON: {
-                '()': jsonlogger.JsonFormatter,
+                # Resolved by dictConfig, so python-json-logger is only imported once logging is configured
+                '()': 'pythonjsonlogger.jsonlogger.JsonFormatter',
                 'format': '%(asctime)s %(name)s %(levelname)s %(module)s %(lineno)d %(message)s'
             },
         }
@@ -115,6 +163,7 @@ class LoggerConfigurator:
 
     def _configure_logging(self) -> None:
         """Apply the logging configuration."""
+        import logging.config  # deferred: only needed once logging is actually configured
         try:
             logging_config = {
                 'version': 1,
@@ -128,6 +177,45 @@ class LoggerConfigurator:
             print(f"Failed to configure logging: {e}")
             raise
             
+    def _start_queue_listener(self) -> None:
+        """Move the configured handlers behind a bounded queue and a listener thread."""
+        target_logger = logging.getLogger(DEFAULT_LOGGER_NAME)
+        self._target_handlers = list(target_logger.handlers)
+        for handler in self._target_handlers:
+            target_logger.removeHandler(handler)
+
+        self.queue_handler = BoundedQueueHandler(queue.Queue(maxsize=self.queue_size), policy=self.queue_policy)
+        target_logger.addHandler(self.queue_handler)
+        self._start_listener()
+
+        atexit.register(self.stop)
+        if hasattr(os, 'register_at_fork'):
+            # The listener thread does not survive fork(); give each child its own
+            os.register_at_fork(after_in_child=self._restart_in_child)
+
+    def _start_listener(self) -> None:
+        self.queue_listener = QueueListener(self.queue_handler.queue, *self._target_handlers, respect_handler_level=True)
+        self.queue_listener.start()
+
+    def _restart_in_child(self) -> None:
+        if self.queue_handler is not None and self.queue_listener is not None:
+            self.queue_handler.queue = queue.Queue(maxsize=self.queue_size)
+            self._start_listener()
+
+    def stop(self) -> None:
+        """Flush queued records, stop the listener and fall back to synchronous handlers."""
+        if self.queue_listener is None:
+            return
+        self.queue_listener.stop()
+        self.queue_listener = None
+
+        target_logger = logging.getLogger(DEFAULT_LOGGER_NAME)
+        target_logger.removeHandler(self.queue_handler)
+        for handler in self._target_handlers:
+            target_logger.addHandler(handler)
+        if self.queue_handler.dropped:
+            target_logger.warning(f"{self.queue_handler.dropped} log records were dropped because the log queue was full")
+
     def get_logger(self, name:str = DEFAULT_LOGGER_NAME) -> logging.Logger:
        """
         Get a configured logger instance.
@@ -141,9 +229,63 @@ class LoggerConfigurator:
        return logging.getLogger(name)
 
 
-# Create and configure the logger (once)
-logger_configurator = LoggerConfigurator()
-logger = logger_configurator.get_logger()
+_configurator: Optional[LoggerConfigurator] = None
+_configure_lock = threading.Lock()
+
+
+def get_logger_configurator() -> LoggerConfigurator:
+    """Return the process-wide LoggerConfigurator, creating it on first use."""
+    global _configurator
+    if _configurator is None:
+        with _configure_lock:
+            if _configurator is None:
+                _configurator = LoggerConfigurator()
+    return _configurator
+
+
+class _LazyConfigHandler(logging.Handler):
+    """
+    Placeholder handler installed at import time. The first record that reaches
+    it configures logging (log directory, file handler, dictConfig), which
+    replaces this handler, and is then re-dispatched to the real handlers.
+    Importing the package therefore costs nothing and creates no log file
+    until something is actually logged.
+    """
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        target_logger = logging.getLogger(DEFAULT_LOGGER_NAME)
+        # The calling Logger is still iterating the current handler list, so
+        # let dictConfig install the real handlers on a fresh one.
+        target_logger.handlers = list(target_logger.handlers)
+        try:
+            get_logger_configurator()
+        except Exception:
+            self.handleError(record)
+            return False
+        if self not in target_logger.handlers:
+            target_logger.handle(record)
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:  # pragma: no cover - handle() does the work
+        pass
+
+
+def __getattr__(name: str) -> Any:
+    # Backwards compatible access to the module-level configurator
+    if name == 'logger_configurator':
+        return get_logger_configurator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# The logger object exists immediately; its configuration is deferred to first use
+logger = logging.getLogger(DEFAULT_LOGGER_NAME)
+if not logger.handlers:
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.addHandler(_LazyConfigHandler())
+if not any(isinstance(existing, ErrorLogFilter) for existing in logger.filters):
+    # One ERROR record per failure, with structured details for the JSON log
+    logger.addFilter(ErrorLogFilter())
 
 
 if __name__ == "__main__":
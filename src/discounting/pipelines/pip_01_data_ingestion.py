@@ -8,6 +8,7 @@ import time
 from src.discounting.exception import CustomException
 from src.discounting.logger import logger
 from src.discounting.config_manager.config_settings import ConfigurationManager
+from src.discounting.utils.profiling import profile_stage
 from src.discounting.components.c_01_data_ingestion import DataIngestion
 from src.discounting.data_source.mongo import MongoDBConnection
 
@@ -25,7 +26,7 @@ class PipelineData():
 class DataIngestionPipeline:
     " Will orchestrate the data ingestion pipeline"
     def __init__(self):
-        self.config_manager = ConfigurationManager
+        self.config_manager = ConfigurationManager()
 
     def run(self):
         " Execute the data ingestion pipeline"
@@ -36,7 +37,9 @@ class DataIngestionPipeline:
             data_ingestion_config = self.config_manager.get_data_ingestion_config()
 
             # Creates a DataIngestion object with the fetched config details
-            ingested_data  = self.ingested_data(data_ingestion_config)
+            with profile_stage("data_ingestion", data_ingestion_config.root_dir,
+                               self.config_manager.get_profiling_config()):
+                ingested_data  = self.ingested_data(data_ingestion_config)
 
             logger.info(f"======== {PIPELINE_NAME} completed successfully =================")
 
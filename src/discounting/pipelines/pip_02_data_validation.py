@@ -1,90 +1,47 @@
 
-
-
-from dataclasses import dataclass
-from typing import Any
-import pandas as pd
-import sys 
-import time
+import sys
 
 from src.discounting.exception import CustomException
 from src.discounting.logger import logger
 from src.discounting.config_manager.config_settings import ConfigurationManager
-from src.discounting.components.c_01_data_ingestion import DataIngestion
-from src.discounting.data_source.mongo import MongoDBConnection
-
-PIPELINE_NAME= "DATA INGESTION PIPELINE"
+from src.discounting.utils.profiling import profile_stage
+from src.discounting.components.c_02_data_validation import DataValidation
 
+PIPELINE_NAME = "DATA VALIDATION PIPELINE"
 
-@dataclass 
-class PipelineData():
-    "Represent data passed between pipeline "
-    data_ingestion_config: Any
-    ingested_data: pd.DataFrame = None 
 
-
-
-class DataIngestionPipeline:
-    " Will orchestrate the data ingestion pipeline"
+class DataValidationPipeline:
+    " Will orchestrate the data validation pipeline"
     def __init__(self):
-        self.config_manager = ConfigurationManager
+        self.config_manager = ConfigurationManager()
 
     def run(self):
-        " Execute the data ingestion pipeline"
+        " Execute the data validation pipeline"
         try:
             logger.info(f"======== Starting {PIPELINE_NAME} =================")
 
-            # Fetches the config details 
-            data_ingestion_config = self.config_manager.get_data_ingestion_config()
+            data_validation_config = self.config_manager.get_data_validation_config()
+            data_validation = DataValidation(config=data_validation_config)
+            with profile_stage("data_validation", data_validation_config.root_dir,
+                               self.config_manager.get_profiling_config()):
+                validation_status = data_validation.validate_all_columns()
 
-            # Creates a DataIngestion object with the fetched config details
-            ingested_data  = self.ingested_data(data_ingestion_config)
+            if not validation_status:
+                raise ValueError(f"Data validation failed, see {data_validation_config.val_status}")
 
             logger.info(f"======== {PIPELINE_NAME} completed successfully =================")
-
+            return validation_status
 
         except Exception as e:
             logger.error(f"Error during {PIPELINE_NAME}: {e}")
             raise CustomException(f"Error during {PIPELINE_NAME}: {e}", sys)
-        
 
-    def ingested_data(self, config):
-        " Method to perform data ingestion and return the ingested data"
 
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                logger.info(f"Attempt {attempt + 1}/ {max_retries}")
-                
-                # Creates a DataIngestion object with the fetched config details
-                data_ingestion = DataIngestion(config=config)
-                data_ingestion.import_data_from_mongodb()
-
-                logger.info(f"DataIngestion completed successfully")
-                
-                # Returns the ingested data
-                return data_ingestion
-
-            except Exception as e:
-                logger.error(f"Error during data ingestion attempt {attempt+1}/{max_retries}: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(2)
-                    logger.info(f"Retrying data ingestion in {10**(attempt+1)} seconds...")
-                    time.sleep(10**(attempt+1))
-
-                else:
-                    raise CustomException(f"Unable to complete data ingestion after {max_retries} attempts", sys)
-
-        return None
-    
 if __name__ == "__main__":
     try:
-        data_ingestion_pipeline = DataIngestionPipeline()
-        data_ingestion_pipeline.run()
+        data_validation_pipeline = DataValidationPipeline()
+        data_validation_pipeline.run()
 
     except CustomException as e:
-        logger.error(f"Error during data ingestion pipeline: {e}")
+        logger.error(f"Error during data validation pipeline: {e}")
         sys.exit(1)
-        
-
-    
@@ -0,0 +1,43 @@
+
+import sys
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_manager.config_settings import ConfigurationManager
+from src.discounting.utils.profiling import profile_stage
+from src.discounting.components.c_03_data_transformation import DataTransformation
+
+PIPELINE_NAME = "DATA TRANSFORMATION PIPELINE"
+
+
+class DataTransformationPipeline:
+    " Will orchestrate the data transformation pipeline"
+    def __init__(self):
+        self.config_manager = ConfigurationManager()
+
+    def run(self):
+        " Execute the data transformation pipeline"
+        try:
+            logger.info(f"======== Starting {PIPELINE_NAME} =================")
+
+            data_transformation_config = self.config_manager.get_data_transformation_config()
+            data_transformation = DataTransformation(config=data_transformation_config)
+            with profile_stage("data_transformation", data_transformation_config.root_dir,
+                               self.config_manager.get_profiling_config()):
+                data_transformation.train_test_split_data()
+
+            logger.info(f"======== {PIPELINE_NAME} completed successfully =================")
+
+        except Exception as e:
+            logger.error(f"Error during {PIPELINE_NAME}: {e}")
+            raise CustomException(f"Error during {PIPELINE_NAME}: {e}", sys)
+
+
+if __name__ == "__main__":
+    try:
+        data_transformation_pipeline = DataTransformationPipeline()
+        data_transformation_pipeline.run()
+
+    except CustomException as e:
+        logger.error(f"Error during data transformation pipeline: {e}")
+        sys.exit(1)
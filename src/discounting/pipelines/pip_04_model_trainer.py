@@ -0,0 +1,50 @@
+
+import sys
+from pathlib import Path
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_manager.config_settings import ConfigurationManager
+from src.discounting.utils.profiling import profile_stage
+from src.discounting.components.c_04_model_trainer import ModelTrainer
+from src.discounting.components.c_10_drift_monitor import DriftMonitor
+
+PIPELINE_NAME = "MODEL TRAINER PIPELINE"
+
+
+class ModelTrainerPipeline:
+    " Will orchestrate the model training pipeline"
+    def __init__(self):
+        self.config_manager = ConfigurationManager()
+
+    def run(self):
+        " Execute the model trainer pipeline"
+        try:
+            logger.info(f"======== Starting {PIPELINE_NAME} =================")
+
+            model_trainer_config = self.config_manager.get_model_trainer_config()
+            model_trainer = ModelTrainer(config=model_trainer_config)
+            with profile_stage("model_trainer", model_trainer_config.root_dir,
+                               self.config_manager.get_profiling_config()):
+                result = model_trainer.train()
+                # The drift reference summarises what the champion learned from
+                drift_monitor = DriftMonitor(config=self.config_manager.get_drift_monitor_config())
+                if result['mode'] != 'unchanged' or not Path(drift_monitor.config.reference_path).exists():
+                    drift_monitor.build_reference(keep_bins=result['mode'] != 'full')
+
+            logger.info(f"======== {PIPELINE_NAME} completed successfully =================")
+            return result
+
+        except Exception as e:
+            logger.error(f"Error during {PIPELINE_NAME}: {e}")
+            raise CustomException(f"Error during {PIPELINE_NAME}: {e}", sys)
+
+
+if __name__ == "__main__":
+    try:
+        model_trainer_pipeline = ModelTrainerPipeline()
+        model_trainer_pipeline.run()
+
+    except CustomException as e:
+        logger.error(f"Error during model trainer pipeline: {e}")
+        sys.exit(1)
@@ -0,0 +1,46 @@
+import sys
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_manager.config_settings import ConfigurationManager
+from src.discounting.utils.profiling import profile_stage
+from src.discounting.components.c_05_model_evaluation import CrossValidator
+
+PIPELINE_NAME = "MODEL EVALUATION PIPELINE"
+
+
+class ModelEvaluationPipeline:
+    " Will orchestrate the cross-validation of the candidate models"
+    def __init__(self):
+        self.config_manager = ConfigurationManager()
+
+    def run(self):
+        " Execute the model evaluation pipeline"
+        try:
+            logger.info(f"======== Starting {PIPELINE_NAME} =================")
+
+            model_evaluation_config = self.config_manager.get_model_evaluation_config()
+            cross_validator = CrossValidator(
+                config=model_evaluation_config,
+                transformation_config=self.config_manager.get_data_transformation_config(),
+            )
+            with profile_stage("model_evaluation", model_evaluation_config.root_dir,
+                               self.config_manager.get_profiling_config()):
+                report = cross_validator.evaluate()
+
+            logger.info(f"======== {PIPELINE_NAME} completed successfully =================")
+            return report
+
+        except Exception as e:
+            logger.error(f"Error during {PIPELINE_NAME}: {e}")
+            raise CustomException(f"Error during {PIPELINE_NAME}: {e}", sys)
+
+
+if __name__ == "__main__":
+    try:
+        model_evaluation_pipeline = ModelEvaluationPipeline()
+        model_evaluation_pipeline.run()
+
+    except CustomException as e:
+        logger.error(f"Error during model evaluation pipeline: {e}")
+        sys.exit(1)
@@ -0,0 +1,252 @@
+
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional
+import numpy as np
+import pandas as pd
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_manager.config_settings import ConfigurationManager
+from src.discounting.config_entity.config_params import PredictionConfig
+from src.discounting.utils.commons import load_object
+from src.discounting.serving.cache import PredictionCache, feature_hashes, model_version
+from src.discounting.serving.compiled_trees import artifact_stamp
+from src.discounting.utils.metrics import StageMetrics
+
+PIPELINE_NAME = "PREDICTION PIPELINE"
+
+
+class PredictionPipeline:
+    " Scores reservations with the trained preprocessor and model"
+    def __init__(self, config: PredictionConfig):
+        self.config = config
+        self.preprocessor = None
+        self.model = None
+        self.compiled_model = None
+        self.model_version = None
+        self._mmap_mode = None
+        # Set by SharedArtifactStore.load_artifacts; reloads then go through the store
+        self.artifact_store = None
+        self.promotion_hooks: List[Callable[[str], None]] = []
+        self.drift_monitor = None
+        self.feature_store = None
+        self.discount_lookup = None
+        self.metrics = StageMetrics("prediction")
+        # Serialises reloads between threads sharing the pipeline
+        self._reload_lock = threading.RLock()
+        self.cache = PredictionCache(
+            max_entries=config.cache_max_entries,
+            ttl_seconds=config.cache_ttl_seconds
+        ) if config.cache_enabled else None
+
+    def load_artifacts(
+            self,
+            preprocessor_path: Optional[str] = None,
+            model_path: Optional[str] = None,
+            mmap_mode: Optional[str] = None,
+            ) -> "PredictionPipeline":
+        " Load the preprocessor and model, optionally memory-mapping their arrays"
+        try:
+            preprocessor_path = preprocessor_path or self.config.preprocessor_path
+            model_path = model_path or self.config.model_path
+
+            preprocessor = load_object(preprocessor_path, mmap_mode=mmap_mode)
+            # The compact model replaces the sklearn one, which is then never loaded
+            compact = self._load_array_model(self.config.compact_model_path, mmap_mode) \
+                if self.config.use_compact_model else None
+            if compact is not None:
+                model, compiled_model = compact, None
+            else:
+                model = load_object(model_path, mmap_mode=mmap_mode)
+                compiled_model = self._load_array_model(self.config.compiled_model_path, mmap_mode) \
+                    if self.config.compiled_max_rows > 0 else None
+            # Swapped in together once everything is loaded
+            self.preprocessor, self.model, self.compiled_model = preprocessor, model, compiled_model
+            self._mmap_mode = mmap_mode
+            self.model_version = self._current_version()
+            if self.cache is not None:
+                self.cache.clear()
+            logger.info(f"{PIPELINE_NAME}: artifacts loaded from {preprocessor_path} and {model_path}")
+            return self
+        except Exception as e:
+            logger.error(f"Error loading prediction artifacts: {e}")
+            raise CustomException(e, sys)
+
+    def _load_array_model(self, path: Optional[str], mmap_mode: Optional[str] = None):
+        " A compiled or compact model at `path`, if one was exported from the promoted model file"
+        if not path or not Path(path).exists():
+            return None
+        array_model = load_object(path, mmap_mode=mmap_mode)
+        if array_model.source != artifact_stamp(self.config.model_path):
+            logger.warning(f"{path} was not exported from {self.config.model_path}, ignoring it")
+            return None
+        return array_model
+
+    def _current_version(self) -> str:
+        # Versioned from the promoted artifacts, not the shared copies they may be mapped from
+        paths = [self.config.preprocessor_path, self.config.model_path]
+        if self.config.use_compact_model and self.config.compact_model_path and Path(self.config.compact_model_path).exists():
+            paths.append(self.config.compact_model_path)
+        return model_version(*paths)
+
+    def refresh_if_promoted(self) -> bool:
+        " Reload the artifacts (and drop cached scores) when a new model has been promoted"
+        try:
+            if self.model is not None and self.preprocessor is not None and \
+                    self._current_version() == self.model_version:
+                return False
+            with self._reload_lock:
+                # Another thread may have reloaded while this one waited
+                if self.model is None or self.preprocessor is None:
+                    self._reload()
+                    return True
+                if self._current_version() == self.model_version:
+                    return False
+
+                logger.info(f"{PIPELINE_NAME}: new model version detected, reloading artifacts")
+                self._reload()
+
+                for hook in self.promotion_hooks:
+                    hook(self.model_version)
+            return True
+        except Exception as e:
+            logger.error(f"Error refreshing prediction artifacts: {e}")
+            raise CustomException(e, sys)
+
+    def _reload(self) -> None:
+        if self.artifact_store is not None:
+            # Republished so every worker keeps mapping one shared copy
+            self.artifact_store.load_artifacts(self)
+        else:
+            self.load_artifacts(mmap_mode=self._mmap_mode)
+
+    def on_promotion(self, hook: Callable[[str], None]) -> None:
+        " Register a callable run with the new model version after a promoted model is loaded"
+        self.promotion_hooks.append(hook)
+
+    def attach_drift_monitor(self, drift_monitor) -> None:
+        " Add every scored batch to `drift_monitor`'s current sketch; flushed by save_metrics"
+        self.drift_monitor = drift_monitor
+
+    def attach_feature_store(self, feature_store) -> None:
+        " Use `feature_store` to look up reservations' features in predict_by_key"
+        self.feature_store = feature_store
+
+    def attach_discount_lookup(self, discount_lookup) -> None:
+        " Answer `recommend` from `discount_lookup`, loaded now and rebuilt whenever a new model is promoted"
+        self.discount_lookup = discount_lookup.load()
+        self.on_promotion(discount_lookup.rebuild)
+
+    def _score(self, features: pd.DataFrame) -> np.ndarray:
+        with self.metrics.track("preprocess", rows_in=len(features)):
+            transformed = self.preprocessor.transform(features)
+        # Small batches skip sklearn's per-call overhead
+        if self.compiled_model is not None and len(features) <= self.config.compiled_max_rows:
+            with self.metrics.track("inference_compiled", rows_in=len(features)) as step:
+                scores = self.compiled_model.predict_proba(transformed)[:, 1]
+                step.rows_out = len(scores)
+            return scores
+        with self.metrics.track("inference", rows_in=len(features)) as step:
+            scores = self.model.predict_proba(transformed)[:, 1]
+            step.rows_out = len(scores)
+        return scores
+
+    def predict(self, features: pd.DataFrame, use_cache: bool = True, refresh: bool = True) -> np.ndarray:
+        """
+        Return the cancellation probability for each reservation in `features`.
+
+        Rows already scored by the current model version are answered from the
+        cache and skip preprocessing and inference; only the misses are scored.
+        With `refresh=False` a newly promoted model is not picked up, so a job
+        that called refresh_if_promoted once keeps one model version throughout.
+        """
+        try:
+            if refresh or self.model is None:
+                self.refresh_if_promoted()
+            if self.drift_monitor is not None:
+                with self.metrics.track("drift_sketch", rows_in=len(features)):
+                    self.drift_monitor.update(features)
+            if self.cache is None or not use_cache:
+                return self._score(features)
+
+            with self.metrics.track("cache_lookup", rows_in=len(features)) as step:
+                keys = [(self.model_version, int(h)) for h in feature_hashes(features)]
+                scores = np.empty(len(keys), dtype=np.float64)
+                missing = []
+                for position, key in enumerate(keys):
+                    cached = self.cache.get(key)
+                    if cached is None:
+                        missing.append(position)
+                    else:
+                        scores[position] = cached
+                step.rows_out = len(keys) - len(missing)
+
+            if missing:
+                fresh = self._score(features.iloc[missing])
+                scores[missing] = fresh
+                self.cache.put_many((keys[position] for position in missing), fresh)
+            return scores
+        except Exception as e:
+            logger.error(f"Error during {PIPELINE_NAME}: {e}")
+            raise CustomException(e, sys)
+
+    def recommend(self, features: pd.DataFrame, use_cache: bool = True) -> pd.DataFrame:
+        """
+        Cancellation score and recommended discount for each reservation in
+        `features`, the discount read from the attached lookup table.
+        """
+        try:
+            if self.discount_lookup is None:
+                raise ValueError("No discount lookup attached, see attach_discount_lookup")
+            scores = self.predict(features, use_cache=use_cache)
+            with self.metrics.track("discount_lookup", rows_in=len(features)):
+                discounts = self.discount_lookup.recommend(scores, features)
+            return pd.DataFrame({'cancellation_score': scores, 'recommended_discount': discounts},
+                                index=features.index)
+        except Exception as e:
+            logger.error(f"Error during {PIPELINE_NAME}: {e}")
+            raise CustomException(e, sys)
+
+    def predict_by_key(self, entity_keys: List[str], use_cache: bool = True) -> np.ndarray:
+        """
+        Score reservations by ID, with their features read from the attached
+        feature store. Reservations not in the store score NaN.
+        """
+        try:
+            if self.feature_store is None:
+                raise ValueError("No feature store attached, see attach_feature_store")
+            features = self.feature_store.get_many(entity_keys)
+            found = features.notna().any(axis=1).to_numpy()
+            scores = np.full(len(features), np.nan)
+            if found.any():
+                scores[found] = self.predict(features[found].reset_index(drop=True), use_cache=use_cache)
+            if not found.all():
+                logger.warning(f"{int((~found).sum())} of {len(found)} reservations not in the feature store")
+            return scores
+        except Exception as e:
+            logger.error(f"Error during {PIPELINE_NAME}: {e}")
+            raise CustomException(e, sys)
+
+    def cache_stats(self) -> dict:
+        return self.cache.stats() if self.cache is not None else {}
+
+    def save_metrics(self) -> None:
+        " Write the cumulative prediction metrics (and cache counters) to the stage's root_dir"
+        self.metrics.annotate('cache_lookup', **self.cache_stats())
+        self.metrics.save(self.config.root_dir)
+        if self.drift_monitor is not None:
+            self.drift_monitor.flush()
+
+
+if __name__ == "__main__":
+    try:
+        config_manager = ConfigurationManager()
+        prediction_pipeline = PredictionPipeline(config_manager.get_prediction_config())
+        prediction_pipeline.load_artifacts()
+        logger.info(f"{PIPELINE_NAME} artifacts loaded successfully")
+
+    except CustomException as e:
+        logger.error(f"Error during prediction pipeline: {e}")
+        sys.exit(1)
@@ -0,0 +1,64 @@
+
+import sys
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_manager.config_settings import ConfigurationManager
+from src.discounting.utils.profiling import profile_stage
+from src.discounting.components.c_07_bulk_scoring import BulkScoring
+from src.discounting.components.c_08_discount_engine import DiscountEngine
+from src.discounting.components.c_09_discount_table import DiscountLookup, DiscountTableBuilder
+from src.discounting.components.c_10_drift_monitor import DriftMonitor
+from src.discounting.pipelines.pip_07_prediction_pipeline import PredictionPipeline
+
+PIPELINE_NAME = "BULK SCORING PIPELINE"
+
+
+class BulkScoringPipeline:
+    " Will orchestrate the nightly scoring of every open reservation"
+    def __init__(self):
+        self.config_manager = ConfigurationManager()
+
+    def run(self):
+        " Execute the bulk scoring pipeline"
+        try:
+            logger.info(f"======== Starting {PIPELINE_NAME} =================")
+
+            bulk_scoring_config = self.config_manager.get_bulk_scoring_config()
+            prediction_pipeline = PredictionPipeline(self.config_manager.get_prediction_config())
+            discount_engine = DiscountEngine(self.config_manager.get_discount_engine_config())
+            # Scoring uses the engine itself; the lookup table for online quotes
+            # is brought up to date with the model and engine settings
+            discount_table_config = self.config_manager.get_discount_table_config()
+            prediction_pipeline.attach_discount_lookup(
+                DiscountLookup(discount_table_config, DiscountTableBuilder(discount_table_config, discount_engine))
+            )
+            drift_monitor = DriftMonitor(self.config_manager.get_drift_monitor_config())
+            if drift_monitor.has_reference:
+                prediction_pipeline.attach_drift_monitor(drift_monitor)
+
+            bulk_scoring = BulkScoring(
+                config=bulk_scoring_config,
+                prediction_pipeline=prediction_pipeline,
+                discount_engine=discount_engine
+            )
+            with profile_stage("bulk_scoring", bulk_scoring_config.root_dir,
+                               self.config_manager.get_profiling_config()):
+                totals = bulk_scoring.score_collection()
+
+            logger.info(f"======== {PIPELINE_NAME} completed successfully =================")
+            return totals
+
+        except Exception as e:
+            logger.error(f"Error during {PIPELINE_NAME}: {e}")
+            raise CustomException(f"Error during {PIPELINE_NAME}: {e}", sys)
+
+
+if __name__ == "__main__":
+    try:
+        bulk_scoring_pipeline = BulkScoringPipeline()
+        bulk_scoring_pipeline.run()
+
+    except CustomException as e:
+        logger.error(f"Error during bulk scoring pipeline: {e}")
+        sys.exit(1)
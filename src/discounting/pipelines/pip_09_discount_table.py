@@ -0,0 +1,49 @@
+
+import sys
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_manager.config_settings import ConfigurationManager
+from src.discounting.utils.profiling import profile_stage
+from src.discounting.components.c_08_discount_engine import DiscountEngine
+from src.discounting.components.c_09_discount_table import DiscountTableBuilder
+
+PIPELINE_NAME = "DISCOUNT TABLE PIPELINE"
+
+
+class DiscountTablePipeline:
+    " Will orchestrate the offline build of the discount lookup table"
+    def __init__(self):
+        self.config_manager = ConfigurationManager()
+
+    def run(self):
+        " Execute the discount table pipeline"
+        try:
+            logger.info(f"======== Starting {PIPELINE_NAME} =================")
+
+            discount_engine = DiscountEngine(self.config_manager.get_discount_engine_config())
+            discount_table_config = self.config_manager.get_discount_table_config()
+            builder = DiscountTableBuilder(
+                config=discount_table_config,
+                discount_engine=discount_engine
+            )
+            with profile_stage("discount_table", discount_table_config.root_dir,
+                               self.config_manager.get_profiling_config()):
+                table_path = builder.build()
+
+            logger.info(f"======== {PIPELINE_NAME} completed successfully =================")
+            return table_path
+
+        except Exception as e:
+            logger.error(f"Error during {PIPELINE_NAME}: {e}")
+            raise CustomException(f"Error during {PIPELINE_NAME}: {e}", sys)
+
+
+if __name__ == "__main__":
+    try:
+        discount_table_pipeline = DiscountTablePipeline()
+        discount_table_pipeline.run()
+
+    except CustomException as e:
+        logger.error(f"Error during discount table pipeline: {e}")
+        sys.exit(1)
@@ -0,0 +1,51 @@
+
+import sys
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_manager.config_settings import ConfigurationManager
+from src.discounting.utils.profiling import profile_stage
+from src.discounting.components.c_10_drift_monitor import DriftMonitor
+
+PIPELINE_NAME = "DRIFT MONITOR PIPELINE"
+
+
+class DriftMonitorPipeline:
+    " Will orchestrate the data drift check of the latest ingestion batch"
+    def __init__(self):
+        self.config_manager = ConfigurationManager()
+
+    def run(self):
+        " Execute the drift monitor pipeline"
+        try:
+            logger.info(f"======== Starting {PIPELINE_NAME} =================")
+
+            drift_monitor_config = self.config_manager.get_drift_monitor_config()
+            drift_monitor = DriftMonitor(config=drift_monitor_config)
+            if not drift_monitor.has_reference:
+                # Built with the champion by the model trainer
+                logger.warning(f"No drift reference at {drift_monitor_config.reference_path}, "
+                               f"run the model trainer first; skipping the drift check")
+                return None
+            with profile_stage("drift_monitor", drift_monitor_config.root_dir,
+                               self.config_manager.get_profiling_config()):
+                drift_monitor.update_from_parquet(drift_monitor_config.current_data_path)
+                report = drift_monitor.check(reset=drift_monitor_config.reset_after_check)
+            drift_monitor.metrics.save(drift_monitor_config.root_dir)
+
+            logger.info(f"======== {PIPELINE_NAME} completed successfully =================")
+            return report
+
+        except Exception as e:
+            logger.error(f"Error during {PIPELINE_NAME}: {e}")
+            raise CustomException(f"Error during {PIPELINE_NAME}: {e}", sys)
+
+
+if __name__ == "__main__":
+    try:
+        drift_monitor_pipeline = DriftMonitorPipeline()
+        drift_monitor_pipeline.run()
+
+    except CustomException as e:
+        logger.error(f"Error during drift monitor pipeline: {e}")
+        sys.exit(1)
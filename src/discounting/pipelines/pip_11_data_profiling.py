@@ -0,0 +1,44 @@
+
+import sys
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_manager.config_settings import ConfigurationManager
+from src.discounting.utils.profiling import profile_stage
+from src.discounting.components.c_11_data_profiling import DataProfiler
+
+PIPELINE_NAME = "DATA PROFILING PIPELINE"
+
+
+class DataProfilingPipeline:
+    " Will orchestrate the profiling report of the ingested data"
+    def __init__(self):
+        self.config_manager = ConfigurationManager()
+
+    def run(self):
+        " Execute the data profiling pipeline"
+        try:
+            logger.info(f"======== Starting {PIPELINE_NAME} =================")
+
+            data_profiling_config = self.config_manager.get_data_profiling_config()
+            data_profiler = DataProfiler(config=data_profiling_config)
+            with profile_stage("data_profiling", data_profiling_config.root_dir,
+                               self.config_manager.get_profiling_config()):
+                report = data_profiler.profile()
+
+            logger.info(f"======== {PIPELINE_NAME} completed successfully =================")
+            return report
+
+        except Exception as e:
+            logger.error(f"Error during {PIPELINE_NAME}: {e}")
+            raise CustomException(f"Error during {PIPELINE_NAME}: {e}", sys)
+
+
+if __name__ == "__main__":
+    try:
+        data_profiling_pipeline = DataProfilingPipeline()
+        data_profiling_pipeline.run()
+
+    except CustomException as e:
+        logger.error(f"Error during data profiling pipeline: {e}")
+        sys.exit(1)
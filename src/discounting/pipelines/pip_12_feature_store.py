@@ -0,0 +1,44 @@
+
+import sys
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_manager.config_settings import ConfigurationManager
+from src.discounting.utils.profiling import profile_stage
+from src.discounting.data_source.feature_store import FeatureStore
+
+PIPELINE_NAME = "FEATURE STORE PIPELINE"
+
+
+class FeatureStorePipeline:
+    " Will orchestrate the materialization of the reservation feature store"
+    def __init__(self):
+        self.config_manager = ConfigurationManager()
+
+    def run(self):
+        " Execute the feature store pipeline"
+        try:
+            logger.info(f"======== Starting {PIPELINE_NAME} =================")
+
+            feature_store_config = self.config_manager.get_feature_store_config()
+            feature_store = FeatureStore(config=feature_store_config)
+            with profile_stage("feature_store", feature_store_config.root_dir,
+                               self.config_manager.get_profiling_config()):
+                totals = feature_store.materialize()
+
+            logger.info(f"======== {PIPELINE_NAME} completed successfully =================")
+            return totals
+
+        except Exception as e:
+            logger.error(f"Error during {PIPELINE_NAME}: {e}")
+            raise CustomException(f"Error during {PIPELINE_NAME}: {e}", sys)
+
+
+if __name__ == "__main__":
+    try:
+        feature_store_pipeline = FeatureStorePipeline()
+        feature_store_pipeline.run()
+
+    except CustomException as e:
+        logger.error(f"Error during feature store pipeline: {e}")
+        sys.exit(1)
@@ -0,0 +1,44 @@
+
+import sys
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_manager.config_settings import ConfigurationManager
+from src.discounting.utils.profiling import profile_stage
+from src.discounting.components.c_12_model_optimization import ModelOptimizer
+
+PIPELINE_NAME = "MODEL OPTIMIZATION PIPELINE"
+
+
+class ModelOptimizationPipeline:
+    " Will orchestrate the post-training model compression"
+    def __init__(self):
+        self.config_manager = ConfigurationManager()
+
+    def run(self):
+        " Execute the model optimization pipeline"
+        try:
+            logger.info(f"======== Starting {PIPELINE_NAME} =================")
+
+            model_optimization_config = self.config_manager.get_model_optimization_config()
+            model_optimizer = ModelOptimizer(config=model_optimization_config)
+            with profile_stage("model_optimization", model_optimization_config.root_dir,
+                               self.config_manager.get_profiling_config()):
+                result = model_optimizer.optimize()
+
+            logger.info(f"======== {PIPELINE_NAME} completed successfully =================")
+            return result
+
+        except Exception as e:
+            logger.error(f"Error during {PIPELINE_NAME}: {e}")
+            raise CustomException(f"Error during {PIPELINE_NAME}: {e}", sys)
+
+
+if __name__ == "__main__":
+    try:
+        model_optimization_pipeline = ModelOptimizationPipeline()
+        model_optimization_pipeline.run()
+
+    except CustomException as e:
+        logger.error(f"Error during model optimization pipeline: {e}")
+        sys.exit(1)
@@ -0,0 +1,46 @@
+import sys
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_manager.config_settings import ConfigurationManager
+from src.discounting.utils.profiling import profile_stage
+from src.discounting.components.c_13_feature_selection import FeatureSelector
+
+PIPELINE_NAME = "FEATURE SELECTION PIPELINE"
+
+
+class FeatureSelectionPipeline:
+    " Will orchestrate the importance-driven feature selection"
+    def __init__(self):
+        self.config_manager = ConfigurationManager()
+
+    def run(self):
+        " Execute the feature selection pipeline"
+        try:
+            logger.info(f"======== Starting {PIPELINE_NAME} =================")
+
+            feature_selection_config = self.config_manager.get_feature_selection_config()
+            feature_selector = FeatureSelector(
+                config=feature_selection_config,
+                transformation_config=self.config_manager.get_data_transformation_config(),
+            )
+            with profile_stage("feature_selection", feature_selection_config.root_dir,
+                               self.config_manager.get_profiling_config()):
+                selection = feature_selector.select()
+
+            logger.info(f"======== {PIPELINE_NAME} completed successfully =================")
+            return selection
+
+        except Exception as e:
+            logger.error(f"Error during {PIPELINE_NAME}: {e}")
+            raise CustomException(f"Error during {PIPELINE_NAME}: {e}", sys)
+
+
+if __name__ == "__main__":
+    try:
+        feature_selection_pipeline = FeatureSelectionPipeline()
+        feature_selection_pipeline.run()
+
+    except CustomException as e:
+        logger.error(f"Error during feature selection pipeline: {e}")
+        sys.exit(1)
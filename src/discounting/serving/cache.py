@@ -0,0 +1,101 @@
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, Optional
+import numpy as np
+import pandas as pd
+
+
+def model_version(*artifact_paths) -> str:
+    """
+    Cheap version stamp for a set of artifacts, built from their size and
+    modification time. Promoting a new model rewrites the artifact, which
+    changes the stamp without having to hash the file contents.
+    """
+    parts = []
+    for path in artifact_paths:
+        stat = os.stat(Path(path))
+        parts.append(f"{stat.st_size}-{stat.st_mtime_ns}")
+    return ":".join(parts)
+
+
+def feature_hashes(features: pd.DataFrame) -> np.ndarray:
+    """
+    Hash each reservation's normalized feature vector to a uint64.
+
+    Columns are put in a canonical (sorted) order and integer columns are
+    widened to float64, so the same booking hashes identically whatever the
+    column order or integer/float representation of the incoming request.
+    """
+    normalized = features.reindex(columns=sorted(features.columns))
+    numeric_cols = normalized.select_dtypes(include=['number', 'bool']).columns
+    if len(numeric_cols):
+        normalized = normalized.astype({col: 'float64' for col in numeric_cols})
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache with a per-entry time-to-live.
+
+    Memory is bounded by `max_entries`; the least recently used entry is
+    evicted first. Hit, miss and eviction counters are kept for monitoring.
+    """
+    def __init__(self, max_entries: int = 100_000, ttl_seconds: Optional[float] = 900.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        " Return the cached value for `key`, or None when absent or expired"
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def put_many(self, keys: Iterable[Hashable], values: Iterable[Any]) -> None:
+        for key, value in zip(keys, values):
+            self.put(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,256 @@
+
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Bound on the (rows x trees) node matrix traversed at once
+CHUNK_CELLS = 1 << 20
+
+
+def artifact_stamp(path) -> Tuple[int, int]:
+    """Size and modification time of the model file a compiled model was exported from."""
+    stat = os.stat(Path(path))
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+class CompiledTrees:
+    """
+    A fitted binary tree ensemble flattened into NumPy arrays: for every node
+    of every tree its split feature and threshold, its left and right child
+    (global node indices) and, for leaves, its contribution to the score.
+
+    A batch is scored by moving all (row, tree) positions down one level at a
+    time with array gathers, with no per-row or per-tree Python calls; leaves
+    point to themselves, which is how positions that reached one are found.
+    Forests average their leaves' class 1 probabilities; gradient boosting
+    adds its (learning-rate scaled) leaf values to the initial raw score and
+    applies the logistic function.
+
+    The traversal wins on small batches, where sklearn's per-call overhead
+    dominates; large batches are better left to sklearn.
+    """
+    def __init__(self, kind: str, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray,
+                 right: np.ndarray, missing_left: np.ndarray, value: np.ndarray, roots: np.ndarray,
+                 depth: int, n_features: int, base_score: float = 0.0, source: Optional[Tuple[int, int]] = None):
+        self.kind = kind
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.n_features = n_features
+        self.base_score = base_score
+        self.source = source
+        self.classes_ = np.array([0, 1])
+        # Leaf values stored as integer codes: value = code * value_scale + value_offset
+        self.value_scale: Optional[float] = None
+        self.value_offset = 0.0
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in (self.feature, self.threshold, self.left, self.right,
+                                              self.missing_left, self.value, self.roots))
+
+    def leaf_values(self, X) -> np.ndarray:
+        """Per tree leaf contribution for each row, shape (rows, trees)."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        values = self.value[self._leaves(X)]
+        if self.value_scale is not None:
+            values = values * self.value_scale + self.value_offset
+        return values
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        n_rows, n_trees = len(X), len(self.roots)
+        flat = X.ravel()
+        row_offsets = np.repeat(np.arange(n_rows, dtype=np.int64) * self.n_features, n_trees)
+        nodes = np.tile(self.roots, n_rows)
+        # (row, tree) positions still at a split; leaves drop out as they are reached
+        active = np.arange(len(nodes))
+        while len(active):
+            current = nodes[active]
+            values = flat[row_offsets[active] + self.feature[current]]
+            go_left = (values <= self.threshold[current]) | (np.isnan(values) & self.missing_left[current])
+            current = np.where(go_left, self.left[current], self.right[current])
+            nodes[active] = current
+            active = active[self.left[current] != current]
+        return nodes.reshape(n_rows, n_trees)
+
+    def decision_function(self, X) -> np.ndarray:
+        """Raw score per row: the mean leaf probability (forests) or the log-odds (boosting)."""
+        # Trees compare float32 features, as sklearn does
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got shape {X.shape}")
+        chunk_rows = max(1, CHUNK_CELLS // len(self.roots))
+        scores = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), chunk_rows):
+            leaf_values = self.leaf_values(X[start:start + chunk_rows])
+            if self.kind == 'forest':
+                scores[start:start + chunk_rows] = leaf_values.mean(axis=1)
+            else:
+                scores[start:start + chunk_rows] = self.base_score + leaf_values.sum(axis=1)
+        return scores
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities, laid out like sklearn's predict_proba."""
+        scores = self.decision_function(X)
+        positive = scores if self.kind == 'forest' else 1.0 / (1.0 + np.exp(-scores))
+        return np.column_stack([1.0 - positive, positive])
+
+
+def _flatten(trees, leaf_value) -> dict:
+    """Concatenate sklearn `tree_` structures, turning child indices into global node indices."""
+    parts = {name: [] for name in ('feature', 'threshold', 'left', 'right', 'missing_left', 'value')}
+    roots, offset, depth = [], 0, 0
+    for tree in trees:
+        n_nodes = tree.node_count
+        is_leaf = tree.children_left == -1
+        own = np.arange(offset, offset + n_nodes)
+        parts['feature'].append(np.where(is_leaf, 0, tree.feature))
+        parts['threshold'].append(np.where(is_leaf, np.inf, tree.threshold))
+        parts['left'].append(np.where(is_leaf, own, tree.children_left + offset))
+        parts['right'].append(np.where(is_leaf, own, tree.children_right + offset))
+        missing = getattr(tree, 'missing_go_to_left', None)
+        parts['missing_left'].append(np.zeros(n_nodes, dtype=bool) if missing is None else missing.astype(bool) & ~is_leaf)
+        parts['value'].append(leaf_value(tree))
+        roots.append(offset)
+        offset += n_nodes
+        depth = max(depth, tree.max_depth)
+    return {
+        'feature': np.concatenate(parts['feature']).astype(np.int64),
+        'threshold': np.concatenate(parts['threshold']).astype(np.float64),
+        'left': np.concatenate(parts['left']).astype(np.int64),
+        'right': np.concatenate(parts['right']).astype(np.int64),
+        'missing_left': np.concatenate(parts['missing_left']),
+        'value': np.concatenate(parts['value']).astype(np.float64),
+        'roots': np.asarray(roots, dtype=np.int64),
+        'depth': int(depth),
+    }
+
+
+def ensemble_trees(model) -> Optional[Tuple[str, list]]:
+    """
+    The kind ('forest' or 'boosting') and the sklearn `tree_` structures, in
+    compiled order, of a fitted binary RandomForestClassifier,
+    ExtraTreesClassifier or GradientBoostingClassifier (log-loss); None for
+    any other model.
+    """
+    from sklearn.ensemble import ExtraTreesClassifier, GradientBoostingClassifier, RandomForestClassifier
+
+    if len(getattr(model, 'classes_', ())) != 2:
+        return None
+    if isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)):
+        return 'forest', [estimator.tree_ for estimator in model.estimators_]
+    if isinstance(model, GradientBoostingClassifier) and model.loss == 'log_loss':
+        return 'boosting', [estimator.tree_ for estimator in model.estimators_[:, 0]]
+    return None
+
+
+def compile_model(model) -> Optional[CompiledTrees]:
+    """The compiled form of a tree ensemble (see ensemble_trees); None for other models, served by sklearn."""
+    ensemble = ensemble_trees(model)
+    if ensemble is None:
+        return None
+    kind, trees = ensemble
+    n_features = int(model.n_features_in_)
+
+    if kind == 'forest':
+        def positive_share(tree):
+            counts = tree.value[:, 0, :]
+            totals = counts.sum(axis=1)
+            return np.divide(counts[:, 1], totals, out=np.zeros(len(totals)), where=totals > 0)
+        return CompiledTrees('forest', n_features=n_features, **_flatten(trees, positive_share))
+
+    arrays = _flatten(trees, lambda tree: model.learning_rate * tree.value[:, 0, 0])
+    compiled = CompiledTrees('boosting', n_features=n_features, **arrays)
+    # The initial estimator is a constant: the raw score minus the trees' sum at any row
+    probe = np.zeros((1, n_features), dtype=np.float32)
+    compiled.base_score = float(model.decision_function(probe)[0] - compiled.decision_function(probe)[0])
+    return compiled
+
+
+def prune(compiled: CompiledTrees, keep_trees: np.ndarray, go_left: np.ndarray, go_right: np.ndarray) -> CompiledTrees:
+    """
+    A smaller copy of `compiled` with only the trees `keep_trees` (positions
+    in `roots`), and the split nodes masked by `go_left` / `go_right`
+    replaced by their left / right child. Nodes no longer reachable from a
+    kept root are dropped.
+    """
+    # Each node's replacement, followed through chains of replaced nodes
+    target = np.arange(compiled.n_nodes)
+    target[go_left] = compiled.left[go_left]
+    target[go_right] = compiled.right[go_right]
+    while True:
+        followed = target[target]
+        if np.array_equal(followed, target):
+            break
+        target = followed
+    left, right, roots = target[compiled.left], target[compiled.right], target[compiled.roots[keep_trees]]
+
+    reachable = np.zeros(compiled.n_nodes, dtype=bool)
+    frontier = np.unique(roots)
+    while len(frontier):
+        reachable[frontier] = True
+        children = np.concatenate([left[frontier], right[frontier]])
+        frontier = np.unique(children[~reachable[children]])
+
+    keep = np.flatnonzero(reachable)
+    new_index = np.full(compiled.n_nodes, -1, dtype=np.int64)
+    new_index[keep] = np.arange(len(keep))
+    pruned = CompiledTrees(
+        compiled.kind, feature=compiled.feature[keep], threshold=compiled.threshold[keep],
+        left=new_index[left[keep]], right=new_index[right[keep]], missing_left=compiled.missing_left[keep],
+        value=compiled.value[keep], roots=new_index[roots], depth=compiled.depth,
+        n_features=compiled.n_features, base_score=compiled.base_score, source=compiled.source,
+    )
+    pruned.value_scale, pruned.value_offset = compiled.value_scale, compiled.value_offset
+    return pruned
+
+
+def quantize(compiled: CompiledTrees, threshold_dtype: str = 'float64', leaf_bits: int = 0) -> CompiledTrees:
+    """
+    A compact copy of `compiled`: node indices in the smallest integer types
+    that hold them, thresholds as `threshold_dtype` and, with `leaf_bits` (8
+    or 16), leaf values as integer codes on a uniform grid over their range.
+    """
+    is_leaf = compiled.left == np.arange(compiled.n_nodes)
+    index_dtype = np.int32 if compiled.n_nodes < 2 ** 31 else np.int64
+    value, value_scale, value_offset = compiled.value, compiled.value_scale, compiled.value_offset
+    if leaf_bits and value_scale is None:
+        leaves = value[is_leaf]
+        low, high = float(leaves.min()), float(leaves.max())
+        levels = 2 ** leaf_bits - 1
+        value_scale = (high - low) / levels if high > low else 1.0
+        codes = np.where(is_leaf, np.rint((value - low) / value_scale), 0)
+        value, value_offset = codes.astype(np.uint8 if leaf_bits <= 8 else np.uint16), low
+
+    quantized = CompiledTrees(
+        compiled.kind, feature=compiled.feature.astype(np.min_scalar_type(max(compiled.n_features - 1, 0))),
+        threshold=compiled.threshold.astype(threshold_dtype), left=compiled.left.astype(index_dtype),
+        right=compiled.right.astype(index_dtype), missing_left=compiled.missing_left, value=value,
+        roots=compiled.roots.astype(index_dtype), depth=compiled.depth, n_features=compiled.n_features,
+        base_score=compiled.base_score, source=compiled.source,
+    )
+    quantized.value_scale, quantized.value_offset = value_scale, value_offset
+    return quantized
+
+
+def parity_error(compiled: CompiledTrees, model, X) -> float:
+    """Largest absolute difference between the compiled and sklearn class 1 probabilities on `X`."""
+    X = np.asarray(X)
+    if not len(X):
+        return 0.0
+    return float(np.max(np.abs(compiled.predict_proba(X)[:, 1] - model.predict_proba(X)[:, 1])))
@@ -0,0 +1,218 @@
+
+import gc
+import sys
+import multiprocessing
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_entity.config_params import (
+    DiscountEngineConfig, DiscountTableConfig, FeatureStoreConfig, PredictionConfig,
+)
+from src.discounting.config_manager.config_settings import ConfigurationManager
+from src.discounting.pipelines.pip_07_prediction_pipeline import PredictionPipeline
+from src.discounting.serving.compiled_trees import artifact_stamp
+from src.discounting.utils.commons import load_object
+from src.discounting.utils.artifact_io import FORMAT_JSON, load_artifact, save_artifact
+from src.discounting.utils.artifact_store import file_lock
+
+WorkerFn = Callable[[PredictionPipeline, int], None]
+
+
+class SharedArtifactStore:
+    """
+    Re-writes joblib artifacts as uncompressed files so their NumPy arrays can be
+    memory-mapped. Every process that loads from the store maps the same file
+    pages, so the arrays are held once in the page cache instead of once per worker.
+    """
+    def __init__(self, shared_dir: str, mmap_mode: str = 'r'):
+        self.shared_dir = Path(shared_dir)
+        self.mmap_mode = mmap_mode
+
+    def shared_path(self, source_path: str) -> Path:
+        return self.shared_dir / Path(source_path).name
+
+    def _stamp_path(self, target_path: Path) -> Path:
+        return target_path.with_name(f"{target_path.name}.source.json")
+
+    def publish(self, source_path: str) -> Path:
+        """
+        Materialize `source_path` into the store, skipping it when the shared copy
+        was published from the same file. Promotion and rollback hard-link older
+        blobs into place, so the source's stamp is compared for equality, not age.
+        """
+        try:
+            source_path = Path(source_path)
+            target_path = self.shared_path(source_path)
+            stamp_path = self._stamp_path(target_path)
+            with file_lock(self.shared_dir / f"{target_path.name}.lock"):
+                stamp = list(artifact_stamp(source_path))
+                if target_path.exists() and stamp_path.exists() and load_artifact(stamp_path) == stamp:
+                    return target_path
+
+                obj = load_object(source_path)
+                # compress=0 keeps arrays as raw buffers, which is what mmap needs
+                save_artifact(obj, target_path, compress=0)
+                save_artifact(stamp, stamp_path, fmt=FORMAT_JSON)
+            logger.info(f"Published {source_path} to shared store at {target_path}")
+            return target_path
+        except Exception as e:
+            logger.error(f"Error publishing {source_path} to shared store: {e}")
+            raise CustomException(e, sys)
+
+    def load_artifacts(self, pipeline: PredictionPipeline) -> PredictionPipeline:
+        " (Re)load `pipeline`'s artifacts from the store, publishing any that changed"
+        pipeline.artifact_store = self
+        return pipeline.load_artifacts(
+            preprocessor_path=self.publish(pipeline.config.preprocessor_path),
+            model_path=self.publish(pipeline.config.model_path),
+            mmap_mode=self.mmap_mode,
+        )
+
+    def load_pipeline(
+            self,
+            config: PredictionConfig,
+            discount_table_config: Optional[DiscountTableConfig] = None,
+            discount_engine_config: Optional[DiscountEngineConfig] = None,
+            feature_store_config: Optional[FeatureStoreConfig] = None,
+            ) -> PredictionPipeline:
+        """
+        Build a PredictionPipeline whose artifacts are mapped from the store.
+        Given the discount table and engine configs, the discount lookup table
+        is attached too, and rebuilt whenever a new model is promoted. Given
+        the feature store config, `predict_by_key` looks reservations up in
+        the online feature store.
+        """
+        pipeline = self.load_artifacts(PredictionPipeline(config))
+        if discount_table_config is not None and discount_engine_config is not None:
+            # Imported here: serving without discounts does not need the engine
+            from src.discounting.components.c_08_discount_engine import DiscountEngine
+            from src.discounting.components.c_09_discount_table import DiscountLookup, DiscountTableBuilder
+            builder = DiscountTableBuilder(discount_table_config, DiscountEngine(discount_engine_config))
+            pipeline.attach_discount_lookup(DiscountLookup(discount_table_config, builder))
+        if feature_store_config is not None:
+            from src.discounting.data_source.feature_store import FeatureStore
+            if not Path(feature_store_config.online_path).exists():
+                # Opened on first lookup, so a later materialization is picked up
+                logger.warning(f"Online feature store not materialized yet: {feature_store_config.online_path}")
+            pipeline.attach_feature_store(FeatureStore(feature_store_config))
+        return pipeline
+
+
+def _run_forked_worker(worker_fn: WorkerFn, pipeline: PredictionPipeline, worker_id: int) -> None:
+    # The pipeline was inherited from the parent at fork time: nothing to load.
+    worker_fn(pipeline, worker_id)
+
+
+def _run_spawned_worker(worker_fn: WorkerFn, configs: tuple, worker_id: int) -> None:
+    # Without fork the worker maps the already-published files, which is still
+    # far cheaper than unpickling a private copy.
+    config = configs[0]
+    store = SharedArtifactStore(config.shared_artifacts_dir, config.mmap_mode)
+    worker_fn(store.load_pipeline(*configs), worker_id)
+
+
+class PreforkPredictionServer:
+    """
+    Loads the prediction artifacts once in the parent process and then starts
+    N workers that share them.
+
+    On platforms with `fork` the workers inherit the loaded pipeline
+    copy-on-write; the parent calls `gc.freeze()` before forking so the cyclic
+    garbage collector does not touch (and thereby copy) the inherited objects.
+    Large arrays are memory-mapped from the shared store in both modes.
+
+    With `discount_table_config` and `discount_engine_config`, workers also
+    answer `pipeline.recommend` from the discount lookup table; with
+    `feature_store_config`, `pipeline.predict_by_key` from the feature store.
+    `from_config_manager` wires all of them from the configuration files.
+    """
+    def __init__(
+            self,
+            config: PredictionConfig,
+            discount_table_config: Optional[DiscountTableConfig] = None,
+            discount_engine_config: Optional[DiscountEngineConfig] = None,
+            feature_store_config: Optional[FeatureStoreConfig] = None,
+            ):
+        self.config = config
+        self.discount_table_config = discount_table_config
+        self.discount_engine_config = discount_engine_config
+        self.feature_store_config = feature_store_config
+        self.store = SharedArtifactStore(config.shared_artifacts_dir, config.mmap_mode)
+        self.pipeline: Optional[PredictionPipeline] = None
+        self.processes: List[multiprocessing.Process] = []
+
+    @classmethod
+    def from_config_manager(cls, config_manager: ConfigurationManager) -> "PreforkPredictionServer":
+        " Server for the configured model, discount lookup and feature store"
+        return cls(
+            config_manager.get_prediction_config(),
+            discount_table_config=config_manager.get_discount_table_config(),
+            discount_engine_config=config_manager.get_discount_engine_config(),
+            feature_store_config=config_manager.get_feature_store_config(),
+        )
+
+    def preload(self) -> PredictionPipeline:
+        try:
+            self.pipeline = self.store.load_pipeline(*self._configs())
+            gc.collect()
+            if hasattr(gc, 'freeze'):
+                gc.freeze()
+            logger.info("Prediction artifacts preloaded for serving")
+            return self.pipeline
+        except Exception as e:
+            logger.error(f"Error preloading prediction artifacts: {e}")
+            raise CustomException(e, sys)
+
+    def _configs(self) -> tuple:
+        return (self.config, self.discount_table_config, self.discount_engine_config, self.feature_store_config)
+
+    def serve(self, worker_fn: WorkerFn, num_workers: Optional[int] = None) -> List[int]:
+        """
+        Start the workers, block until they exit and return their exit codes.
+
+        Args:
+            worker_fn: Callable run in every worker as `worker_fn(pipeline, worker_id)`.
+            num_workers: Number of workers, defaults to the configured value.
+        """
+        num_workers = num_workers or self.config.num_workers
+        use_fork = 'fork' in multiprocessing.get_all_start_methods()
+        try:
+            if self.pipeline is None:
+                self.preload()
+
+            if use_fork:
+                context = multiprocessing.get_context('fork')
+                target, payload = _run_forked_worker, self.pipeline
+            else:
+                context = multiprocessing.get_context('spawn')
+                target, payload = _run_spawned_worker, self._configs()
+
+            self.processes = [
+                context.Process(target=target, args=(worker_fn, payload, worker_id), daemon=False)
+                for worker_id in range(num_workers)
+            ]
+            for process in self.processes:
+                process.start()
+            logger.info(f"Started {num_workers} prediction workers ({context.get_start_method()})")
+
+            for process in self.processes:
+                process.join()
+            return [process.exitcode for process in self.processes]
+
+        except KeyboardInterrupt:
+            logger.info("Stopping prediction workers...")
+            self.shutdown()
+            return [process.exitcode for process in self.processes]
+        except Exception as e:
+            logger.error(f"Error serving predictions: {e}")
+            self.shutdown()
+            raise CustomException(e, sys)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            process.join(timeout)
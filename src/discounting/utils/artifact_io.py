@@ -0,0 +1,244 @@
+
+import os
+import sys
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+
+try:
+    import orjson
+except ImportError:  # optional: the standard library encoder is used instead
+    orjson = None
+
+# Artifact formats, chosen from the file suffix alone so that saving and
+# loading always agree; an unknown suffix means joblib:
+#   npy      NumPy arrays; loadable with mmap_mode
+#   arrow    DataFrames as Arrow IPC (Feather v2) with zstd compression
+#   parquet  DataFrames exchanged between stages
+#   json     Metrics and metadata, through orjson when installed
+#   text     Small plain-text files (counters, markers)
+#   joblib   Everything else (estimators, preprocessors), compressed
+FORMAT_NPY = 'npy'
+FORMAT_ARROW = 'arrow'
+FORMAT_PARQUET = 'parquet'
+FORMAT_JSON = 'json'
+FORMAT_JOBLIB = 'joblib'
+FORMAT_TEXT = 'text'
+
+SUFFIX_FORMATS = {
+    '.npy': FORMAT_NPY,
+    '.arrow': FORMAT_ARROW,
+    '.feather': FORMAT_ARROW,
+    '.parquet': FORMAT_PARQUET,
+    '.json': FORMAT_JSON,
+    '.joblib': FORMAT_JOBLIB,
+    '.pkl': FORMAT_JOBLIB,
+    '.txt': FORMAT_TEXT,
+}
+
+
+def _default_compression() -> Union[int, Tuple[str, int]]:
+    """joblib codec from ARTIFACT_COMPRESSION, e.g. 'zlib:3', 'lz4:1' or 'none'."""
+    value = os.getenv('ARTIFACT_COMPRESSION', 'zlib:3').strip().lower()
+    if value in ('', '0', 'none'):
+        return 0
+    codec, _, level = value.partition(':')
+    return (codec, int(level or 3))
+
+
+JOBLIB_COMPRESSION = _default_compression()
+
+HISTORY_SUFFIX = '-history.jsonl'
+
+_STATS: Dict[str, Dict[str, Any]] = {}
+_STATS_LOCK = threading.Lock()
+
+
+def resolve_format(path: Path) -> str:
+    """Format for `path` from its suffix; joblib when the suffix is not a known one."""
+    return SUFFIX_FORMATS.get(Path(path).suffix.lower(), FORMAT_JOBLIB)
+
+
+def _record(path: Path, fmt: str, **values: Any) -> None:
+    with _STATS_LOCK:
+        entry = _STATS.setdefault(str(path), {'format': fmt})
+        entry.update(values)
+
+
+def artifact_stats() -> Dict[str, Dict[str, Any]]:
+    """Size, write and read timings of every artifact saved or loaded by this process."""
+    with _STATS_LOCK:
+        return {path: dict(entry) for path, entry in _STATS.items()}
+
+
+def _json_default(obj: Any) -> Any:
+    # numpy scalars and arrays, Paths, datetimes, ...
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dumps_json(data: Any, indent: bool = False) -> bytes:
+    """Encode `data` as JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_json_default, option=option)
+    return json.dumps(data, indent=4 if indent else None, default=_json_default).encode()
+
+
+def loads_json(raw: bytes) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _write(obj: Any, tmp_path: Path, fmt: str, compress, indent: bool) -> None:
+    if fmt == FORMAT_NPY:
+        import numpy as np
+        with open(tmp_path, 'wb') as f:  # a file object stops np.save appending '.npy'
+            np.save(f, obj, allow_pickle=False)
+    elif fmt == FORMAT_ARROW:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        table = obj if isinstance(obj, pa.Table) else pa.Table.from_pandas(obj, preserve_index=False)
+        feather.write_feather(table, str(tmp_path), compression='zstd')
+    elif fmt == FORMAT_PARQUET:
+        obj.to_parquet(tmp_path, index=False)
+    elif fmt == FORMAT_JSON:
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps_json(obj, indent=indent))
+    elif fmt == FORMAT_TEXT:
+        with open(tmp_path, 'w') as f:
+            f.write(str(obj))
+    else:
+        import joblib
+        joblib.dump(obj, str(tmp_path), compress=JOBLIB_COMPRESSION if compress is None else compress)
+
+
+def save_artifact(obj: Any, path, fmt: Optional[str] = None, compress=None, indent: bool = False) -> Path:
+    """
+    Write `obj` to `path` atomically: it is written to a temporary file in the
+    same directory and renamed into place, so readers never see a partial file.
+
+    Args:
+        obj: Object to save.
+        path: Destination; its suffix selects the format unless `fmt` is given.
+        fmt: Force one of the FORMAT_* formats.
+        compress: joblib compression for this call (0 for none, which keeps
+            arrays memory-mappable); defaults to ARTIFACT_COMPRESSION.
+        indent: Pretty-print JSON.
+    """
+    path = Path(path)
+    fmt = fmt or resolve_format(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        _write(obj, tmp_path, fmt, compress, indent)
+        os.replace(tmp_path, path)
+        seconds = time.perf_counter() - start
+        size = os.path.getsize(path)
+        _record(path, fmt, bytes=size, write_seconds=seconds)
+        logger.debug(f"Artifact saved to {path} ({fmt}, {size} bytes, {seconds * 1000:.1f} ms)")
+        return path
+    except Exception as e:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        logger.error(f"Error saving artifact at: {path}, Error: {e}")
+        raise CustomException(f"Error saving artifact at: {path}, Error: {e}", sys)
+
+
+def history_path(path) -> Path:
+    """The append-only history kept next to the artifact at `path`: x.json -> x-history.jsonl."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}{HISTORY_SUFFIX}")
+
+
+def append_record(path, record: Dict[str, Any]) -> Path:
+    """
+    Append `record` to the JSON-lines file at `path`. The line goes out in a
+    single append-mode write, so a reader tailing the file (see
+    utils/dashboard_data.py) sees whole records, or a last line still without
+    its newline.
+
+    A file with other hard links (a promoted artifact shares its inode with a
+    read-only blob of the artifact store) is never written in place: it is
+    copied, appended to and renamed over, which leaves the blob untouched.
+    """
+    path = Path(path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        line = dumps_json(record) + b'\n'
+        if path.exists() and os.stat(path).st_nlink > 1:
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                with open(path, 'rb') as source, open(tmp_path, 'wb') as f:
+                    f.write(source.read())
+                    f.write(line)
+                os.replace(tmp_path, path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+            return path
+        with open(path, 'ab') as f:
+            f.write(line)
+        return path
+    except Exception as e:
+        logger.error(f"Error appending to: {path}, Error: {e}")
+        raise CustomException(f"Error appending to: {path}, Error: {e}", sys)
+
+
+def _is_compressed_joblib(path: Path) -> bool:
+    # Uncompressed joblib files are plain pickles, which start with the PROTO opcode
+    with open(path, 'rb') as f:
+        return f.read(1) != b'\x80'
+
+
+def load_artifact(path, fmt: Optional[str] = None, mmap_mode: Optional[str] = None) -> Any:
+    """
+    Read an artifact written by `save_artifact` (or a plain joblib file).
+
+    `mmap_mode` memory-maps .npy files and uncompressed joblib files; for
+    compressed files it is ignored and the data is read into memory.
+    """
+    path = Path(path)
+    fmt = fmt or resolve_format(path)
+    try:
+        start = time.perf_counter()
+        if fmt == FORMAT_NPY:
+            import numpy as np
+            obj = np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
+        elif fmt == FORMAT_ARROW:
+            import pyarrow.feather as feather
+            obj = feather.read_table(str(path), memory_map=True).to_pandas()
+        elif fmt == FORMAT_PARQUET:
+            import pandas as pd
+            obj = pd.read_parquet(path)
+        elif fmt == FORMAT_JSON:
+            with open(path, 'rb') as f:
+                obj = loads_json(f.read())
+        elif fmt == FORMAT_TEXT:
+            with open(path) as f:
+                obj = f.read()
+        else:
+            import joblib
+            if mmap_mode and not _is_compressed_joblib(path):
+                # joblib can only memory-map when it is given a filename
+                obj = joblib.load(str(path), mmap_mode=mmap_mode)
+            else:
+                with open(path, 'rb') as f:
+                    obj = joblib.load(f)
+        seconds = time.perf_counter() - start
+        _record(path, fmt, bytes=os.path.getsize(path), read_seconds=seconds)
+        logger.debug(f"Artifact loaded from {path} ({fmt}, {seconds * 1000:.1f} ms)")
+        return obj
+    except Exception as e:
+        logger.error(f"Error loading artifact from: {path}, Error: {e}")
+        raise CustomException(f"Error loading artifact from: {path}, Error: {e}", sys)
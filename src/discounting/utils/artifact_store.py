@@ -0,0 +1,195 @@
+
+import os
+import sys
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.utils.artifact_io import FORMAT_JSON, FORMAT_TEXT, HISTORY_SUFFIX, load_artifact, save_artifact
+
+try:
+    import fcntl
+except ImportError:  # Windows: runs are not protected against each other
+    fcntl = None
+
+
+HASH_CHUNK_SIZE = 1024 * 1024
+RUN_COUNTER_FILE = 'run_count.txt'
+
+
+@contextmanager
+def file_lock(lock_path, shared: bool = False, blocking: bool = True) -> Iterator[None]:
+    """
+    Advisory lock held on `lock_path` for the duration of the block, across
+    processes: exclusive, or `shared` with other shared holders. Without
+    `blocking`, BlockingIOError is raised if the lock is held elsewhere.
+    """
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'a') as lock_file:
+        if fcntl is not None:
+            mode = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+            fcntl.flock(lock_file.fileno(), mode if blocking else mode | fcntl.LOCK_NB)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def increment_run_count(root_dir: str, filename: str = RUN_COUNTER_FILE) -> int:
+    """Read, increment and write the run counter in `root_dir` under a lock; returns the new count."""
+    counter_path = Path(root_dir) / filename
+    with file_lock(counter_path.with_name(f"{filename}.lock")):
+        try:
+            count = int(counter_path.read_text().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            count = 0
+        count += 1
+        save_artifact(count, counter_path, fmt=FORMAT_TEXT)
+    return count
+
+
+def hash_file(path) -> str:
+    """SHA-256 of the file contents, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def link_file(source, destination) -> bool:
+    """
+    Make `destination` refer to the contents of `source` without copying:
+    a hard link, swapped in atomically. Falls back to a copy when the paths
+    are on different filesystems. Returns True if a link was made.
+
+    Files shared this way must only ever be replaced (write + rename, as
+    utils.artifact_io does), never rewritten in place.
+    """
+    source, destination = Path(source), Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = destination.with_name(f".{destination.name}.{os.getpid()}.{threading.get_ident()}.link")
+    try:
+        os.link(source, tmp_path)
+        linked = True
+    except OSError:
+        shutil.copy2(source, tmp_path)
+        linked = False
+    os.replace(tmp_path, destination)
+    # rename() is a no-op when both names already link the same file
+    if tmp_path.exists():
+        tmp_path.unlink()
+    return linked
+
+
+class ArtifactStore:
+    """
+    Content-addressed store for pipeline outputs.
+
+        <root_dir>/blobs/ab/abcdef...   file contents, named by SHA-256, read-only
+        <root_dir>/manifests/<run>.json  relative path -> digest for each run
+        <runs_dir>/<run>/                the working directory of a run
+
+    Each run writes its stages' outputs into its own working directory, so
+    concurrent runs do not overwrite each other. When a run is recorded, every
+    output is hashed and replaced by a hard link to its blob, so identical
+    files (the same extract in two runs, or validated data that equals the
+    ingested data) are stored once.
+    """
+    def __init__(self, root_dir: str, runs_dir: str):
+        self.root_dir = Path(root_dir)
+        self.runs_dir = Path(runs_dir)
+        self.blobs_dir = self.root_dir / 'blobs'
+        self.manifests_dir = self.root_dir / 'manifests'
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blobs_dir / digest[:2] / digest
+
+    def run_dir(self, run_id: str) -> Path:
+        return self.runs_dir / run_id
+
+    def new_run(self) -> str:
+        """Allocate the next run id under a lock and create its working directory."""
+        try:
+            count = increment_run_count(str(self.root_dir), RUN_COUNTER_FILE)
+            run_id = f"run-{count:05d}"
+            self.run_dir(run_id).mkdir(parents=True, exist_ok=True)
+            logger.info(f"Started {run_id} in {self.run_dir(run_id)}")
+            return run_id
+        except Exception as e:
+            logger.error(f"Error allocating a new run: {e}")
+            raise CustomException(e, sys)
+
+    def put(self, path) -> str:
+        """
+        Add the file at `path` to the store and return its digest. The file is
+        replaced by a hard link to the blob, so duplicates share one copy.
+        """
+        try:
+            path = Path(path)
+            digest = hash_file(path)
+            blob = self.blob_path(digest)
+            with file_lock(self.root_dir / 'blobs.lock'):
+                if not blob.exists():
+                    blob.parent.mkdir(parents=True, exist_ok=True)
+                    if not link_file(path, blob):
+                        logger.debug(f"Copied {path} into the store (different filesystem)")
+                    os.chmod(blob, 0o444)
+            link_file(blob, path)
+            return digest
+        except Exception as e:
+            logger.error(f"Error adding {path} to the artifact store: {e}")
+            raise CustomException(e, sys)
+
+    def record_run(self, run_id: str, metadata: Optional[dict] = None) -> Path:
+        """
+        Store every file of the run's working directory and write its manifest.
+        Append-only histories (*-history.jsonl) are left out: they stay
+        writable in the run, and promotion does not replace the shared ones.
+        """
+        try:
+            run_dir = self.run_dir(run_id)
+            files = {}
+            for path in sorted(p for p in run_dir.rglob('*') if p.is_file() and not p.name.startswith('.')
+                               and not p.name.endswith(HISTORY_SUFFIX)):
+                files[path.relative_to(run_dir).as_posix()] = {
+                    'digest': self.put(path),
+                    'bytes': path.stat().st_size,
+                }
+            manifest = {
+                'run_id': run_id,
+                'recorded_at': datetime.now().isoformat(),
+                'metadata': metadata or {},
+                'files': files,
+            }
+            manifest_path = self.manifests_dir / f"{run_id}.json"
+            save_artifact(manifest, manifest_path, fmt=FORMAT_JSON, indent=True)
+            unique = len({entry['digest'] for entry in files.values()})
+            logger.info(f"Recorded {run_id}: {len(files)} files, {unique} unique blobs")
+            return manifest_path
+        except Exception as e:
+            logger.error(f"Error recording {run_id}: {e}")
+            raise CustomException(e, sys)
+
+    def manifest(self, run_id: str) -> Dict:
+        return load_artifact(self.manifests_dir / f"{run_id}.json", fmt=FORMAT_JSON)
+
+    def promote(self, run_id: str, artifacts_root: str) -> None:
+        """Link a recorded run's outputs to the fixed paths under `artifacts_root` used for serving."""
+        try:
+            files = self.manifest(run_id)['files']
+            with file_lock(self.root_dir / 'promote.lock'):
+                for relative_path, entry in files.items():
+                    link_file(self.blob_path(entry['digest']), Path(artifacts_root) / relative_path)
+            logger.info(f"Promoted {run_id} ({len(files)} files) to {artifacts_root}")
+        except Exception as e:
+            logger.error(f"Error promoting {run_id}: {e}")
+            raise CustomException(e, sys)
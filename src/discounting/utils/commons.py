@@ -1,20 +1,43 @@
 
 import os
-from box.exceptions import BoxValueError
 import yaml
-import json
-import joblib
 import sys
-from ensure import ensure_annotations
-from box import ConfigBox
+import functools
+import typing
 from pathlib import Path
-from typing import Any, List
-from pythonjsonlogger import jsonlogger
+from typing import Any, Optional, TYPE_CHECKING
 from src.discounting.exception import CustomException
 from src.discounting.logger import logger as logging  # Renamed to avoid conflict
+from src.discounting.utils.artifact_io import FORMAT_JSON, load_artifact, save_artifact
+from src.discounting.utils.artifact_store import file_lock
 
-@ensure_annotations
-def read_yaml(path_to_yaml: Path) -> ConfigBox:
+# joblib, python-box and ensure are imported on first use rather than at
+# import time, so short-lived processes that never touch them start faster.
+if TYPE_CHECKING:
+    from box import ConfigBox
+
+
+def _lazy_ensure_annotations(func):
+    """
+    Same contract as `ensure.ensure_annotations`, but `ensure` is only imported
+    (and the annotations resolved) the first time the function is called.
+    """
+    checked = None
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal checked
+        if checked is None:
+            from ensure import ensure_annotations
+            from box import ConfigBox
+            func.__annotations__ = typing.get_type_hints(func, localns={'ConfigBox': ConfigBox})
+            checked = ensure_annotations(func)
+        return checked(*args, **kwargs)
+    return wrapper
+
+
+@_lazy_ensure_annotations
+def read_yaml(path_to_yaml: Path) -> "ConfigBox":
     """
     Reads a YAML file and returns its contents as a ConfigBox object.
 
@@ -27,6 +50,8 @@ def read_yaml(path_to_yaml: Path) -> ConfigBox:
     Raises:
         CustomException: If the file is empty, not found, or an error occurs during reading.
     """
+    from box import ConfigBox
+    from box.exceptions import BoxValueError
     try:
         with open(path_to_yaml) as yaml_file:
             content = yaml.safe_load(yaml_file)
@@ -42,7 +67,7 @@ def read_yaml(path_to_yaml: Path) -> ConfigBox:
         logging.error(f"Error loading YAML file: {path_to_yaml}, Error: {str(e)}")
         raise CustomException(f"Error loading YAML file: {path_to_yaml}, Error: {str(e)}", sys)  # Added sys
 
-@ensure_annotations
+@_lazy_ensure_annotations
 def create_directories(path_to_directories: list, verbose=True):
     """
     Creates directories specified in the list if they do not exist.
@@ -66,7 +91,8 @@ def create_directories(path_to_directories: list, verbose=True):
 
 def save_object(obj, file_path):
     """
-    Saves a Python object to a file using joblib.
+    Saves a Python object to a file, atomically, in the format selected by
+    its suffix (compressed joblib for .joblib, see utils.artifact_io).
 
     Args:
         obj: The Python object to save.
@@ -76,10 +102,7 @@ def save_object(obj, file_path):
         CustomException: If an error occurs during saving.
     """
     try:
-        file_path = Path(file_path)  # Added: Convert the path to Path object
-        dir_path = file_path.parent
-        os.makedirs(str(dir_path), exist_ok=True)  # Modified: Pass a string in makedirs
-        joblib.dump(obj, str(file_path))  # Modified: Pass a string in joblib
+        file_path = save_artifact(obj, file_path)
         logging.info(f"Object saved to {file_path}")
     except Exception as e:
         logging.error(f"Error saving object at: {file_path} exception: {str(e)}")
@@ -87,12 +110,16 @@ def save_object(obj, file_path):
         
 
 
-def load_object(file_path: Path) -> Any:
+def load_object(file_path: Path, mmap_mode: Optional[str] = None) -> Any:
     """
-    Loads a Python object from a file using joblib.
+    Loads a Python object saved with `save_object` (or a plain joblib file).
 
     Args:
         file_path (Path): Path of the file to load the object from.
+        mmap_mode (Optional[str]): If set (e.g. 'r'), NumPy arrays stored in an
+            uncompressed joblib or .npy file are memory-mapped instead of copied
+            into process memory, so several processes can share the same pages.
+            Ignored for compressed files.
 
     Returns:
         Any: The loaded Python object.
@@ -101,10 +128,9 @@ def load_object(file_path: Path) -> Any:
         CustomException: If an error occurs during loading.
     """
     try:
-        with open(file_path, 'rb') as file_obj:
-            obj = joblib.load(file_obj)
-            logging.info(f"Object loaded from: {file_path}")
-            return obj
+        obj = load_artifact(file_path, mmap_mode=mmap_mode)
+        logging.info(f"Object loaded from: {file_path}" + (f" (mmap_mode={mmap_mode})" if mmap_mode else ""))
+        return obj
     except Exception as e:
         logging.error(f"Error loading object from: {file_path}, Error: {str(e)}")
         raise CustomException(f"Error loading object from: {file_path}, Error: {str(e)}", sys)  # Added sys
@@ -122,15 +148,14 @@ def save_json(path: Path, data: dict):
         CustomException: If an error occurs during saving.
     """
     try:
-        with open(path, "w") as f:
-            json.dump(data, f, indent=4)
+        save_artifact(data, path, fmt=FORMAT_JSON, indent=True)
         logging.info(f"JSON file saved at: {path}")
     except Exception as e:
         logging.error(f"Error saving JSON file at: {path}, Error: {str(e)}")
         raise CustomException(f"Error saving JSON file at: {path}, Error: {str(e)}", sys)  # Added sys
 
 
-def load_json(path: Path) -> ConfigBox:
+def load_json(path: Path) -> "ConfigBox":
     """
     Loads a JSON file and returns its contents as a ConfigBox object.
 
@@ -143,9 +168,9 @@ def load_json(path: Path) -> ConfigBox:
     Raises:
         CustomException: If an error occurs during loading.
     """
+    from box import ConfigBox
     try:
-        with open(path) as f:
-            content = json.load(f)
+        content = load_artifact(path, fmt=FORMAT_JSON)
         logging.info(f"JSON file loaded successfully from: {path}")
         return ConfigBox(content)
     except Exception as e:
@@ -155,7 +180,8 @@ def load_json(path: Path) -> ConfigBox:
 
 def save_bin(data: Any, path: Path):
     """
-    Saves data to a binary file using joblib.
+    Saves data to a binary file, atomically. The suffix selects the format:
+    .npy for arrays, .arrow for DataFrames, compressed joblib otherwise.
 
     Args:
         data (Any): Data to save.
@@ -165,7 +191,7 @@ def save_bin(data: Any, path: Path):
         CustomException: If an error occurs during saving.
     """
     try:
-        joblib.dump(value=data, filename=path)
+        save_artifact(data, path)
         logging.info(f"Binary file saved at: {path}")
     except Exception as e:
         logging.error(f"Error saving binary file at: {path}, Error: {str(e)}")
@@ -174,7 +200,7 @@ def save_bin(data: Any, path: Path):
 
 def load_bin(path: Path) -> Any:
     """
-    Loads data from a binary file using joblib.
+    Loads data saved with `save_bin`.
 
     Args:
         path (Path): Path of the binary file to load.
@@ -186,7 +212,7 @@ def load_bin(path: Path) -> Any:
         CustomException: If an error occurs during loading.
     """
     try:
-        data = joblib.load(path)
+        data = load_artifact(path)
         logging.info(f"Binary file loaded from: {path}")
         return data
     except Exception as e:
@@ -234,12 +260,15 @@ def get_run_count_from_file(root_dir: str, filename="run_count.txt") -> int:
 
 def write_run_count_to_file(root_dir: str, count: int, filename="run_count.txt") -> None:
     """
-    Writes the new run count to the single tracking file. 
+    Writes the new run count to the single tracking file, atomically and
+    under the counter's lock. To allocate a run number, prefer
+    `utils.artifact_store.increment_run_count`, which does the read and the
+    write under one lock.
     """
     filepath = os.path.join(root_dir, filename)
     try:
-        with open(filepath, 'w') as f:
-            f.write(str(count))
+        with file_lock(f"{filepath}.lock"):
+            save_artifact(count, filepath)
     except Exception as e:
         logging.error(f"Error writing run count to file: {str(e)}")
         raise CustomException(f"Error writing run count to file: {str(e)}", sys)
\ No newline at end of file
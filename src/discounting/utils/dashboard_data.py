@@ -0,0 +1,148 @@
+
+import os
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.config_entity.config_params import DashboardConfig
+from src.discounting.utils.artifact_io import history_path, loads_json
+
+# A history is read from at most this many bytes per kept record before its end
+# the first time, so its full length is never read
+MAX_RECORD_BYTES = 4096
+
+
+def _stamp(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class _History:
+    """The last `max_records` lines of a JSON-lines file, read incrementally."""
+    def __init__(self, path: str, max_records: int):
+        self.path = path
+        self.records: deque = deque(maxlen=max_records)
+        self._inode = None
+        self._offset = 0
+        self._mid_line = False
+
+    def refresh(self) -> bool:
+        stamp = _stamp(self.path)
+        if stamp is None:
+            changed = bool(self.records)
+            self.records.clear()
+            self._inode, self._offset = None, 0
+            return changed
+        inode, size, _ = stamp
+        if inode != self._inode or size < self._offset:
+            # New or rewritten file
+            self.records.clear()
+            self._inode = inode
+            self._offset = max(0, size - self.records.maxlen * MAX_RECORD_BYTES)
+            self._mid_line = self._offset > 0
+        if size == self._offset:
+            return False
+
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            chunk = f.read(size - self._offset)
+        start = 0
+        if self._mid_line:
+            # Started mid-file: skip to the first whole line
+            start = chunk.find(b'\n') + 1
+        end = chunk.rfind(b'\n') + 1
+        if end <= start:
+            return False
+        self._mid_line = False
+        for line in chunk[start:end].splitlines():
+            if line.strip():
+                self.records.append(loads_json(line))
+        # A last line without its newline is still being written
+        self._offset += end
+        return True
+
+
+class ArtifactSnapshot:
+    """
+    The monitoring dashboard's view of the pipeline: the stages' metrics, the
+    JSON summaries (validation, profile, drift, discount outcomes, model
+    reports) and the append-only histories next to them.
+
+    `refresh` costs one `stat` per file when nothing changed: a JSON file is
+    read again only when its size or modification time moved, and a history
+    only from where the previous refresh stopped. Everything held is the
+    size of those summaries, independent of how much data the stages process.
+    """
+    def __init__(self, config: DashboardConfig):
+        self.config = config
+        self.refreshed_at: Optional[datetime] = None
+        self._sources = {('metrics', stage): path for stage, path in config.stage_metrics.items()}
+        self._sources.update({('artifact', name): path for name, path in config.artifacts.items()})
+        self._values: Dict[Tuple[str, str], Any] = {}
+        self._stamps: Dict[Tuple[str, str], Any] = {}
+        self._histories = {('runs', stage): _History(str(history_path(path)), config.max_history)
+                           for stage, path in config.stage_metrics.items()}
+        self._histories.update({('history', name): _History(path, config.max_history)
+                                for name, path in config.histories.items()})
+        self._lock = threading.Lock()
+
+    def refresh(self) -> List[str]:
+        """Re-read what changed since the last call; returns the changed sources."""
+        changed = []
+        try:
+            with self._lock:
+                for key, path in self._sources.items():
+                    stamp = _stamp(path)
+                    if stamp == self._stamps.get(key):
+                        continue
+                    try:
+                        with open(path, 'rb') as f:
+                            self._values[key] = loads_json(f.read())
+                    except FileNotFoundError:
+                        self._values.pop(key, None)
+                    except ValueError:
+                        # Not every writer is atomic; retried on the next refresh
+                        logger.warning(f"Could not parse {path}, keeping the previous version")
+                        continue
+                    self._stamps[key] = stamp
+                    changed.append(':'.join(key))
+                for key, history in self._histories.items():
+                    if history.refresh():
+                        changed.append(':'.join(key))
+                self.refreshed_at = datetime.now()
+            if changed:
+                logger.info(f"Dashboard data refreshed: {changed}")
+            return changed
+        except Exception as e:
+            logger.error(f"Error refreshing dashboard data: {e}")
+            raise CustomException(e, sys)
+
+    def artifact(self, name: str) -> Optional[dict]:
+        """The latest version of a summary in `config.artifacts`, or None if it was never written."""
+        with self._lock:
+            return self._values.get(('artifact', name))
+
+    def stage_metrics(self) -> Dict[str, dict]:
+        """The latest metrics of every stage that has run."""
+        with self._lock:
+            return {stage: value for (kind, stage), value in self._values.items() if kind == 'metrics'}
+
+    def history(self, name: str) -> List[dict]:
+        """Records of a history in `config.histories`, oldest first."""
+        with self._lock:
+            history = self._histories.get(('history', name))
+            return list(history.records) if history is not None else []
+
+    def runs(self) -> List[dict]:
+        """Run summaries of all stages, oldest first."""
+        with self._lock:
+            records = [record for (kind, _), history in self._histories.items() if kind == 'runs'
+                       for record in history.records]
+        return sorted(records, key=lambda record: record.get('finished_at') or '')
@@ -0,0 +1,84 @@
+
+import sys
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+
+# Compact dtypes accepted in place of each schema dtype
+EQUIVALENT_DTYPES = {
+    'int64': {'int8', 'int16', 'int32', 'int64', 'uint8', 'uint16', 'uint32'},
+    'float64': {'float32', 'float64'},
+    'object': {'object', 'str', 'string', 'category'},
+}
+
+
+def dtype_matches(expected: str, actual: str) -> bool:
+    """True if `actual` is the schema dtype `expected` or a compact equivalent of it."""
+    expected, actual = str(expected).strip(), str(actual).strip()
+    return actual == expected or actual in EQUIVALENT_DTYPES.get(expected, ())
+
+
+def build_dtype_plan(
+        df: pd.DataFrame,
+        schema: Dict[str, str],
+        categorical_max_unique: int = 256,
+        categorical_max_ratio: float = 0.5,
+        ) -> Dict[str, str]:
+    """
+    Derive the compact dtype of every schema column present in `df`:
+
+    - int64 columns become the smallest signed integer holding their range,
+    - float64 columns become float32 only if the round trip is lossless,
+    - object columns become `category` when they have at most
+      `categorical_max_unique` distinct values and those make up no more than
+      `categorical_max_ratio` of the rows.
+
+    Columns outside the schema, or that cannot be narrowed, keep their dtype.
+    """
+    try:
+        plan = {}
+        for column, expected in schema.items():
+            if column not in df.columns:
+                continue
+            expected = str(expected).strip()
+            series = df[column]
+
+            if expected == 'int64' and pd.api.types.is_integer_dtype(series) and len(series):
+                low, high = series.min(), series.max()
+                for candidate in (np.int8, np.int16, np.int32):
+                    info = np.iinfo(candidate)
+                    if info.min <= low and high <= info.max:
+                        plan[column] = np.dtype(candidate).name
+                        break
+
+            elif expected == 'float64' and pd.api.types.is_float_dtype(series):
+                values = series.to_numpy(dtype=np.float64)
+                narrowed = values.astype(np.float32).astype(np.float64)
+                if np.array_equal(values, narrowed, equal_nan=True):
+                    plan[column] = 'float32'
+
+            elif expected == 'object':
+                unique = series.nunique(dropna=True)
+                if unique <= categorical_max_unique and unique <= categorical_max_ratio * len(series):
+                    plan[column] = 'category'
+
+        return plan
+    except Exception as e:
+        logger.error(f"Error building dtype plan: {e}")
+        raise CustomException(e, sys)
+
+
+def apply_dtype_plan(df: pd.DataFrame, plan: Dict[str, str]) -> pd.DataFrame:
+    """Cast the columns of `df` listed in `plan`, in place, and return it."""
+    try:
+        for column, dtype in plan.items():
+            if column in df.columns:
+                df[column] = df[column].astype(dtype)
+        return df
+    except Exception as e:
+        logger.error(f"Error applying dtype plan: {e}")
+        raise CustomException(e, sys)
@@ -0,0 +1,164 @@
+
+import os
+import sys
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from src.discounting.exception import CustomException
+from src.discounting.logger import logger
+from src.discounting.utils.artifact_io import append_record, history_path, save_artifact
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+_statm_fd = _statm_pid = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size of the current process in MB, if the platform
+    reports it. This is the high-water mark since the process started, not
+    the memory of whatever ran last.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size of the current process in MB right now, where /proc reports it (Linux)."""
+    global _statm_fd, _statm_pid
+    try:
+        if _statm_pid != os.getpid():
+            # /proc/self is resolved when opened, so a forked worker opens its own
+            _statm_fd, _statm_pid = os.open('/proc/self/statm', os.O_RDONLY), os.getpid()
+        # One pread on the open file keeps this cheap enough for per-request steps
+        return int(os.pread(_statm_fd, 64, 0).split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, AttributeError, ValueError, IndexError):
+        return None
+
+
+def file_size(path) -> Optional[int]:
+    """Size of `path` in bytes, or None if it does not exist."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def metrics_file_name(stage: str) -> str:
+    """File name of a stage's metrics, e.g. data-ingestion-metrics.json."""
+    return f"{stage.replace('_', '-')}-metrics.json"
+
+
+class StepRecord:
+    """Mutable record yielded by `StageMetrics.track` for the step to fill in."""
+    __slots__ = ('rows_in', 'rows_out', 'bytes_read', 'bytes_written', 'extra')
+
+    def __init__(self, rows_in: Optional[int] = None):
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.bytes_read = None
+        self.bytes_written = None
+        self.extra: Dict[str, Any] = {}
+
+
+class StageMetrics:
+    """
+    Collects wall time, CPU time, RSS, rows in/out and bytes read/written for
+    each sub-step of a pipeline stage. A step records the largest RSS seen when
+    it exits (`rss_mb`); the process's peak RSS (`peak_rss_mb`) is a lifetime
+    high-water mark and is kept for the stage as a whole only.
+
+    Steps are aggregated by name, so a step that runs many times (e.g. one
+    prediction call per request) keeps a bounded, cumulative record.
+
+    Example:
+        metrics = StageMetrics("data_ingestion")
+        with metrics.track("clean", rows_in=len(df)) as step:
+            df = clean(df)
+            step.rows_out = len(df)
+        metrics.save(root_dir)
+    """
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.started_at = datetime.now()
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self, step: str, rows_in: Optional[int] = None) -> Iterator[StepRecord]:
+        record = StepRecord(rows_in)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            self._add(step, record, time.perf_counter() - wall_start, time.process_time() - cpu_start)
+
+    def _add(self, step: str, record: StepRecord, wall_seconds: float, cpu_seconds: float) -> None:
+        with self._lock:
+            entry = self.steps.setdefault(step, {
+                'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'rss_mb': None,
+                'rows_in': None, 'rows_out': None, 'bytes_read': None, 'bytes_written': None,
+            })
+            entry['calls'] += 1
+            entry['wall_seconds'] += wall_seconds
+            entry['cpu_seconds'] += cpu_seconds
+            rss = current_rss_mb()
+            if rss is not None:
+                entry['rss_mb'] = max(entry['rss_mb'] or 0.0, rss)
+            for key in ('rows_in', 'rows_out', 'bytes_read', 'bytes_written'):
+                value = getattr(record, key)
+                if value is not None:
+                    entry[key] = (entry[key] or 0) + int(value)
+            if record.extra:
+                entry.setdefault('extra', {}).update(record.extra)
+
+    def annotate(self, step: str, **values: Any) -> None:
+        """Attach extra values (e.g. counters) to a step's record."""
+        with self._lock:
+            if step in self.steps:
+                self.steps[step].setdefault('extra', {}).update(values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            steps = {name: dict(entry) for name, entry in self.steps.items()}
+        return {
+            'stage': self.stage,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': datetime.now().isoformat(),
+            'wall_seconds': sum(entry['wall_seconds'] for entry in steps.values()),
+            'cpu_seconds': sum(entry['cpu_seconds'] for entry in steps.values()),
+            'peak_rss_mb': peak_rss_mb(),
+            'steps': steps,
+        }
+
+    def save(self, output_dir, file_name: Optional[str] = None) -> Path:
+        """
+        Write the metrics as `<stage>-metrics.json` in `output_dir`, and add a
+        one-line summary of the run to `<stage>-metrics-history.jsonl` next to it.
+        """
+        try:
+            file_name = file_name or metrics_file_name(self.stage)
+            metrics_path = Path(output_dir) / file_name
+            metrics = self.to_dict()
+            save_artifact(metrics, metrics_path, indent=True)
+            summary = {key: metrics[key] for key in ('stage', 'started_at', 'finished_at', 'wall_seconds',
+                                                     'cpu_seconds', 'peak_rss_mb')}
+            summary['steps'] = {name: step['wall_seconds'] for name, step in metrics['steps'].items()}
+            append_record(history_path(metrics_path), summary)
+            logger.info(f"Stage metrics saved to {metrics_path}")
+            return metrics_path
+        except Exception as e:
+            logger.error(f"Error saving stage metrics: {e}")
+            raise CustomException(e, sys)
@@ -0,0 +1,170 @@
+
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from src.discounting.logger import logger
+from src.discounting.config_entity.config_params import ProfilingConfig
+from src.discounting.utils.artifact_io import FORMAT_TEXT, save_artifact
+
+PROFILE_ENV_VAR = 'DISCOUNTING_PROFILE'
+MODE_CPROFILE = 'cprofile'
+MODE_SAMPLING = 'sampling'
+MODE_MEMORY = 'memory'
+ALL_MODES = [MODE_CPROFILE, MODE_SAMPLING, MODE_MEMORY]
+
+
+def resolve_modes(config: Optional[ProfilingConfig] = None) -> List[str]:
+    """
+    Profiling modes for this run. The DISCOUNTING_PROFILE environment variable
+    wins over the config key: '1'/'all' enables every mode, '0' disables
+    profiling, and a comma-separated list (e.g. 'sampling,memory') picks modes.
+    """
+    value = os.getenv(PROFILE_ENV_VAR)
+    if value is not None:
+        value = value.strip().lower()
+        if value in ('', '0', 'false', 'no'):
+            return []
+        if value in ('1', 'true', 'yes', 'all'):
+            return list(ALL_MODES)
+        return [mode.strip() for mode in value.split(',') if mode.strip() in ALL_MODES]
+    if config is not None and config.enabled:
+        return [mode for mode in config.modes if mode in ALL_MODES]
+    return []
+
+
+class StackSampler:
+    """
+    Statistical profiler: a daemon thread samples the Python stack of every
+    other thread at a fixed interval and counts identical stacks. The counts
+    are written in the 'folded' format read by flamegraph.pl and speedscope.
+    """
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def write_folded(self, path: Path) -> None:
+        folded = ''.join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+        save_artifact(folded, path, fmt=FORMAT_TEXT)
+
+
+@contextmanager
+def profile_stage(stage: str, root_dir, config: Optional[ProfilingConfig] = None) -> Iterator[List[str]]:
+    """
+    Profile the enclosed block when profiling is enabled for this run, writing
+    the output to `<root_dir>/profiling/`:
+
+        <stage>.prof              cProfile stats (snakeviz, flameprof, pstats)
+        <stage>.folded            sampled stacks (flamegraph.pl, speedscope)
+        <stage>-memory.txt        top allocation sites from tracemalloc
+        <stage>.tracemalloc       full tracemalloc snapshot
+
+    With profiling disabled this is a no-op.
+    """
+    modes = resolve_modes(config)
+    if not modes:
+        yield modes
+        return
+
+    output_dir = Path(root_dir) / 'profiling'
+    os.makedirs(output_dir, exist_ok=True)
+    interval = (config.sampling_interval_ms if config else 5) / 1000
+    frames = config.tracemalloc_frames if config else 25
+
+    profiler = sampler = None
+    started_tracemalloc = False
+    if MODE_MEMORY in modes:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            started_tracemalloc = True
+    if MODE_SAMPLING in modes:
+        sampler = StackSampler(interval)
+        sampler.start()
+    if MODE_CPROFILE in modes:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    logger.info(f"Profiling {stage} with {modes}, output in {output_dir}")
+    start = time.perf_counter()
+    try:
+        yield modes
+    finally:
+        # Profiling output is best effort: an error here is logged, never raised,
+        # so it cannot replace the exception of a failed stage
+        if profiler is not None:
+            profiler.disable()
+            _write_output(stage, "cProfile stats", _dump_replacing, profiler.dump_stats, output_dir / f"{stage}.prof")
+        if sampler is not None:
+            sampler.stop()
+            _write_output(stage, "sampled stacks", sampler.write_folded, output_dir / f"{stage}.folded")
+        if MODE_MEMORY in modes:
+            _write_output(stage, "memory report", _write_memory_report, stage, output_dir, started_tracemalloc)
+        logger.info(f"Profiling of {stage} finished after {time.perf_counter() - start:.2f}s")
+
+
+def _write_output(stage: str, what: str, write, *args) -> None:
+    try:
+        write(*args)
+    except Exception as e:
+        logger.error(f"Error writing the {what} of {stage}: {e}")
+
+
+def _dump_replacing(dump, path: Path) -> None:
+    # The output may be hard-linked into the artifact store: write a new file and
+    # rename it over, never truncate the existing one
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        dump(str(tmp_path))
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _write_memory_report(stage: str, output_dir: Path, stop_tracing: bool, top_n: int = 50) -> None:
+    import tracemalloc
+    try:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        if stop_tracing:
+            tracemalloc.stop()
+
+    _dump_replacing(snapshot.dump, output_dir / f"{stage}.tracemalloc")
+    lines = [f"current: {current / 1024 / 1024:.1f} MB, peak: {peak / 1024 / 1024:.1f} MB", ""]
+    for statistic in snapshot.statistics('traceback')[:top_n]:
+        lines.append(f"{statistic.size / 1024:.1f} KiB in {statistic.count} blocks")
+        lines.extend(statistic.traceback.format())
+        lines.append("")
+    save_artifact('\n'.join(lines) + '\n', output_dir / f"{stage}-memory.txt", fmt=FORMAT_TEXT)
@@ -0,0 +1,46 @@
+
+import numpy as np
+import pytest
+from sklearn.ensemble import ExtraTreesClassifier, GradientBoostingClassifier, RandomForestClassifier
+
+ESTIMATORS = {
+    'random_forest': lambda **params: RandomForestClassifier(n_estimators=15, max_depth=6, random_state=0, **params),
+    'extra_trees': lambda **params: ExtraTreesClassifier(n_estimators=15, max_depth=6, random_state=0, **params),
+    'gradient_boosting': lambda **params: GradientBoostingClassifier(n_estimators=15, max_depth=3, random_state=0,
+                                                                     **params),
+}
+# GradientBoostingClassifier does not accept NaN
+ACCEPT_NAN = ['random_forest', 'extra_trees']
+
+
+def _make_data(n_rows=600, n_features=6, nan_share=0.0, seed=0):
+    rng = np.random.RandomState(seed)
+    X = rng.normal(size=(n_rows, n_features)).astype(np.float32)
+    y = ((X[:, 0] + 0.5 * X[:, 1] - 0.25 * X[:, 2] + rng.normal(scale=0.5, size=n_rows)) > 0).astype(int)
+    if nan_share:
+        X[rng.rand(n_rows, n_features) < nan_share] = np.nan
+    return X, y
+
+
+@pytest.fixture
+def make_data():
+    """Factory of a float32 binary classification set: make_data(n_rows, n_features, nan_share, seed)."""
+    return _make_data
+
+
+@pytest.fixture
+def estimators():
+    """Factories of the small tree ensembles, by name; keyword arguments are passed to the estimator."""
+    return ESTIMATORS
+
+
+@pytest.fixture(params=sorted(ESTIMATORS))
+def make_estimator(request):
+    """Each tree ensemble factory in turn."""
+    return ESTIMATORS[request.param]
+
+
+@pytest.fixture(params=ACCEPT_NAN)
+def make_nan_estimator(request):
+    """Each factory of a tree ensemble that is fitted with missing values."""
+    return ESTIMATORS[request.param]
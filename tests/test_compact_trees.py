@@ -0,0 +1,84 @@
+
+import numpy as np
+import pytest
+
+from src.discounting.serving.compiled_trees import compile_model, parity_error, prune, quantize
+
+# Lossless transformations differ from sklearn only by floating point summation order
+TOLERANCE = 1e-9
+
+
+def no_splits(compiled):
+    return np.zeros(compiled.n_nodes, dtype=bool)
+
+
+def test_prune_keeping_everything_is_lossless(make_estimator, make_data):
+    X, y = make_data()
+    model = make_estimator().fit(X, y)
+    compiled = compile_model(model)
+    pruned = prune(compiled, np.arange(compiled.n_trees), no_splits(compiled), no_splits(compiled))
+    assert pruned.n_nodes == compiled.n_nodes
+    assert parity_error(pruned, model, X) <= TOLERANCE
+
+
+def test_prune_trees_matches_the_kept_estimators(estimators, make_data):
+    X, y = make_data()
+    model = estimators['random_forest']().fit(X, y)
+    compiled = compile_model(model)
+    keep = np.array([0, 3, 7, 11])
+    pruned = prune(compiled, keep, no_splits(compiled), no_splits(compiled))
+    assert pruned.n_trees == len(keep)
+    assert pruned.n_nodes < compiled.n_nodes
+    expected = np.mean([model.estimators_[i].predict_proba(X)[:, 1] for i in keep], axis=0)
+    assert np.max(np.abs(pruned.predict_proba(X)[:, 1] - expected)) <= TOLERANCE
+
+
+def test_prune_collapsed_split_follows_its_child(estimators, make_data):
+    X, y = make_data()
+    model = estimators['random_forest'](n_jobs=1).fit(X, y)
+    compiled = compile_model(model)
+    root = compiled.roots[0]
+    go_left = no_splits(compiled)
+    go_left[root] = True
+    pruned = prune(compiled, np.array([0]), go_left, no_splits(compiled))
+    # Rows that took the root's left branch score as before; the right subtree is gone
+    went_left = X[:, compiled.feature[root]] <= compiled.threshold[root]
+    assert went_left.any() and not went_left.all()
+    before = compiled.leaf_values(X)[:, 0]
+    assert np.allclose(pruned.predict_proba(X[went_left])[:, 1], before[went_left], rtol=0, atol=TOLERANCE)
+    single_tree = prune(compiled, np.array([0]), no_splits(compiled), no_splits(compiled))
+    assert pruned.n_nodes < single_tree.n_nodes
+
+
+def test_quantize_indices_is_lossless(make_estimator, make_data):
+    X, y = make_data()
+    model = make_estimator().fit(X, y)
+    compiled = compile_model(model)
+    quantized = quantize(compiled)
+    assert quantized.left.dtype == np.int32
+    assert quantized.nbytes < compiled.nbytes
+    assert parity_error(quantized, model, X) <= TOLERANCE
+
+
+@pytest.mark.parametrize('leaf_bits', [8, 16])
+def test_quantize_leaves_error_is_bounded(leaf_bits, estimators, make_data):
+    X, y = make_data()
+    model = estimators['random_forest']().fit(X, y)
+    compiled = compile_model(model)
+    quantized = quantize(compiled, leaf_bits=leaf_bits)
+    assert quantized.value.dtype == (np.uint8 if leaf_bits == 8 else np.uint16)
+    # A forest averages its leaves, each rounded by at most half a grid step
+    is_leaf = compiled.left == np.arange(compiled.n_nodes)
+    leaves = compiled.value[is_leaf]
+    half_step = (leaves.max() - leaves.min()) / (2 ** leaf_bits - 1) / 2
+    assert parity_error(quantized, model, X) <= half_step + TOLERANCE
+
+
+def test_prune_then_quantize_keeps_leaf_scale(estimators, make_data):
+    X, y = make_data()
+    model = estimators['gradient_boosting']().fit(X, y)
+    compiled = compile_model(model)
+    quantized = quantize(compiled, leaf_bits=16)
+    pruned = prune(quantized, np.arange(quantized.n_trees), no_splits(quantized), no_splits(quantized))
+    assert pruned.value_scale == quantized.value_scale
+    assert np.allclose(pruned.predict_proba(X), quantized.predict_proba(X), rtol=0, atol=TOLERANCE)
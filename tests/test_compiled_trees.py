@@ -0,0 +1,64 @@
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from src.discounting.serving.compiled_trees import compile_model, parity_error
+
+# Compiled and sklearn probabilities differ only by floating point summation order
+TOLERANCE = 1e-9
+
+
+def test_parity(make_estimator, make_data):
+    X, y = make_data()
+    model = make_estimator().fit(X, y)
+    compiled = compile_model(model)
+    assert compiled is not None
+    assert compiled.n_trees == len(model.estimators_)
+    X_test, _ = make_data(seed=1)
+    assert parity_error(compiled, model, X_test) <= TOLERANCE
+
+
+def test_parity_with_missing_values(make_nan_estimator, make_data):
+    X, y = make_data(nan_share=0.2)
+    model = make_nan_estimator().fit(X, y)
+    compiled = compile_model(model)
+    assert compiled.missing_left.any()
+    X_test, _ = make_data(nan_share=0.3, seed=1)
+    # Rows missing every feature, and rows missing none
+    X_test[:5] = np.nan
+    X_test[5:10] = make_data(n_rows=5, seed=2)[0]
+    assert parity_error(compiled, model, X_test) <= TOLERANCE
+
+
+def test_parity_single_leaf_trees(make_estimator, make_data):
+    X, y = make_data()
+    # No node can be split: every tree is a single leaf
+    model = make_estimator(min_samples_split=len(y) + 1).fit(X, y)
+    compiled = compile_model(model)
+    assert compiled.n_nodes == compiled.n_trees
+    X_test, _ = make_data(n_rows=50, seed=1)
+    assert parity_error(compiled, model, X_test) <= TOLERANCE
+
+
+def test_parity_single_row_and_empty_batch(estimators, make_data):
+    X, y = make_data()
+    model = estimators['random_forest']().fit(X, y)
+    compiled = compile_model(model)
+    assert parity_error(compiled, model, X[:1]) <= TOLERANCE
+    assert parity_error(compiled, model, X[:0]) == 0.0
+
+
+def test_unsupported_models_are_not_compiled(make_data):
+    X, y = make_data()
+    assert compile_model(LogisticRegression().fit(X, y)) is None
+    multiclass = RandomForestClassifier(n_estimators=3, random_state=0).fit(X, np.arange(len(y)) % 3)
+    assert compile_model(multiclass) is None
+
+
+def test_wrong_feature_count_is_rejected(estimators, make_data):
+    X, y = make_data()
+    compiled = compile_model(estimators['random_forest']().fit(X, y))
+    with pytest.raises(ValueError):
+        compiled.predict_proba(X[:, :-1])